@@ -0,0 +1,140 @@
+"""
+BENCHMARK_MEMORIA.PY - Memoria usada por los tubulares
+Sistema de Gestión de Producción de Orellanas
+
+Construye muchas estanterías y reporta los bytes por tubular de:
+- antes: el modelo original (un objeto Tubular con __dict__ y su propia
+  lista de observaciones por cada tubular)
+- inactivas: el modelo actual recién construido; como los pisos, los
+  tubulares y los arreglos del almacén se crean en el primer uso, mide
+  solo lo que ocupa una estantería sin tocar
+- materializadas: el modelo actual después de pedir los tubulares de
+  todos los pisos (get_pisos() y get_tubulares()), es decir, el
+  AlmacenTubulares con sus arreglos más una vista Tubular con __slots__
+  por tubular; es la comparación justa con el modelo original
+
+Uso:
+    python benchmarks/benchmark_memoria.py [--estanterias 10000] [--materializadas 2000] [--muestra 500]
+
+Fecha: Noviembre 2025
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from clases.estanteria import Estanteria
+from clases.eventos import bus_eventos
+
+
+class _TubularOriginal:
+    """Réplica del Tubular original (atributos en __dict__), solo para comparar."""
+
+    _contador_id = 0
+
+    def __init__(self, numero: int):
+        _TubularOriginal._contador_id += 1
+        self.__id = _TubularOriginal._contador_id
+        self.__numero = numero
+        self.__estado = "vacío"
+        self.__fecha_inoculacion = None
+        self.__observaciones = []
+        self.__defectuoso = False
+
+
+def _construir_original(numero_estanterias: int) -> list:
+    """Construye el grafo original: estantería -> 4 pisos -> 80 tubulares."""
+    return [[[_TubularOriginal(i + 1) for i in range(Estanteria.TUBULARES_POR_PISO)]
+             for _ in range(Estanteria.NUMERO_PISOS)]
+            for _ in range(numero_estanterias)]
+
+
+def _construir_actual(numero_estanterias: int) -> list:
+    """Construye estanterías con las clases actuales, sin usarlas."""
+    return [Estanteria(f"{i:05d}") for i in range(numero_estanterias)]
+
+
+def _construir_materializado(numero_estanterias: int) -> list:
+    """Construye estanterías actuales y crea todos sus pisos y tubulares."""
+    estanterias = _construir_actual(numero_estanterias)
+    for estanteria in estanterias:
+        for piso in estanteria.get_pisos():
+            piso.get_tubulares()
+        # Un cambio de estado crea los arreglos del almacén
+        estanteria.get_piso(1).get_tubular_por_numero(1).set_estado("inoculado")
+    return estanterias
+
+
+def medir(funcion, numero_estanterias: int) -> dict:
+    """
+    Mide memoria y tiempo de construcción.
+
+    Args:
+        funcion: Función que construye las estanterías
+        numero_estanterias: Número de estanterías a construir
+
+    Returns:
+        Diccionario con bytes totales, bytes por tubular y segundos
+    """
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion(numero_estanterias)
+    segundos = time.perf_counter() - inicio
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    gc.collect()
+
+    tubulares = numero_estanterias * Estanteria.TUBULARES_TOTALES
+    return {
+        "estanterias": numero_estanterias,
+        "tubulares": tubulares,
+        "bytes": actual,
+        "bytes_por_tubular": actual / tubulares,
+        "segundos": segundos
+    }
+
+
+def imprimir(titulo: str, medicion: dict) -> None:
+    """Imprime una medición."""
+    print(f"{titulo:<15} estanterías={medicion['estanterias']:>6}  "
+          f"tubulares={medicion['tubulares']:>9}  "
+          f"memoria={medicion['bytes'] / 1e6:>9.1f} MB  "
+          f"bytes/tubular={medicion['bytes_por_tubular']:>7.1f}  "
+          f"tiempo={medicion['segundos']:.2f}s")
+
+
+def main():
+    """Ejecuta el benchmark."""
+    parser = argparse.ArgumentParser(description="Memoria por tubular antes y después")
+    parser.add_argument("--estanterias", type=int, default=10000,
+                        help="estanterías inactivas a construir con el modelo actual")
+    parser.add_argument("--materializadas", type=int, default=2000,
+                        help="estanterías a construir y materializar con el modelo actual")
+    parser.add_argument("--muestra", type=int, default=500,
+                        help="estanterías a construir con el modelo original (se extrapola)")
+    args = parser.parse_args()
+
+    with bus_eventos.silenciar():
+        antes = medir(_construir_original, min(args.muestra, args.estanterias))
+        inactivas = medir(_construir_actual, args.estanterias)
+        materializadas = medir(_construir_materializado, args.materializadas)
+
+    imprimir("antes", antes)
+    imprimir("inactivas", inactivas)
+    imprimir("materializadas", materializadas)
+    for titulo, medicion in (("inactivas", inactivas), ("materializadas", materializadas)):
+        print(f"Reducción ({titulo}): "
+              f"{antes['bytes_por_tubular'] / medicion['bytes_por_tubular']:.1f}x "
+              f"(antes extrapolado a {medicion['estanterias']} estanterías: "
+              f"{antes['bytes_por_tubular'] * medicion['tubulares'] / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+BENCHMARK_REPORTES_PARALELOS.PY - Reportes de todas las estanterías con 1 a N procesos
+Sistema de Gestión de Producción de Orellanas
+
+Construye una planta (la mitad de las estanterías activas, con dos pisos
+inoculados, algunos defectos y, en una de cada cuatro, 40 tubulares
+llevados a producción uno por uno) y mide el tiempo de calcular
+obtener_estado_general, obtener_estadisticas_detalladas y generar_resumen
+de todas las estanterías:
+- serie: llamando al método de cada estantería en el proceso actual
+  (planta recién construida, sin resultados memorizados)
+- procesos=N: con GeneradorReportesParalelo, para cada N pedido
+
+Los resultados en paralelo deben ser iguales a los de la serie (sin
+contar los días de producción, que dependen del momento del cálculo).
+
+Uso:
+    python benchmarks/benchmark_reportes_paralelos.py [--estanterias 20000] [--procesos 1 2 4]
+
+Fecha: Noviembre 2025
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from clases.estanteria import Estanteria
+from clases.planta import Planta
+from clases.reportes_paralelos import GeneradorReportesParalelo
+from clases.eventos import bus_eventos
+
+
+# (método de Estanteria, método de GeneradorReportesParalelo)
+METODOS = (("obtener_estado_general", "obtener_estados_generales"),
+           ("obtener_estadisticas_detalladas", "obtener_estadisticas_detalladas"),
+           ("generar_resumen", "generar_resumenes"))
+
+
+def construir_planta(numero_estanterias: int) -> Planta:
+    """Construye una planta con estanterías en distintos estados."""
+    planta = Planta()
+    for i in range(numero_estanterias):
+        estanteria = Estanteria(f"{i:05d}")
+        planta.agregar_estanteria(estanteria)
+        if i % 2 == 0:
+            estanteria.iniciar_produccion()
+            estanteria.get_piso(1).inocular_piso()
+            estanteria.get_piso(2).inocular_piso()
+            estanteria.get_piso(1).marcar_tubular_defectuoso(i % 80 + 1)
+        if i % 4 == 0:
+            # Cambios tubular por tubular (no pasan por las transiciones masivas)
+            for tubular in estanteria.get_piso(3).get_tubulares()[:40]:
+                tubular.inocular()
+                tubular.set_estado("producción")
+    return planta
+
+
+def comparable(resultado):
+    """Retorna el resultado sin los días de producción de las estadísticas."""
+    if isinstance(resultado, dict) and isinstance(resultado.get("dias_produccion"), float):
+        return dict(resultado, dias_produccion=None)
+    return resultado
+
+
+def cronometrar(funcion, *args):
+    """Ejecuta una función y retorna (resultado, segundos)."""
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def medir(numero_estanterias: int, procesos: list) -> None:
+    """Mide cada método en serie y con cada número de procesos e imprime el resultado."""
+    for metodo, metodo_generador in METODOS:
+        planta = construir_planta(numero_estanterias)
+        esperado, t_serie = cronometrar(
+            lambda: [getattr(estanteria, metodo)() for estanteria in planta])
+        print(f"{metodo} ({numero_estanterias} estanterías)")
+        print(f"  {'serie':<12} {t_serie:>8.3f}s")
+
+        for numero in procesos:
+            with GeneradorReportesParalelo(numero, minimo_paralelo=0) as generador:
+                # La primera llamada arranca los procesos; se mide la segunda
+                generador.obtener_estados_generales(planta.get_estanterias()[:numero])
+                resultado, tiempo = cronometrar(getattr(generador, metodo_generador), planta)
+            if len(resultado) != len(esperado):
+                raise RuntimeError("Faltan estanterías en el resultado en paralelo")
+            if list(map(comparable, resultado)) != list(map(comparable, esperado)):
+                raise RuntimeError(f"{metodo} en paralelo no coincide con la serie")
+            print(f"  {f'procesos={numero}':<12} {tiempo:>8.3f}s  "
+                  f"aceleración={t_serie / tiempo:>5.2f}x")
+
+
+def main():
+    """Ejecuta el benchmark."""
+    parser = argparse.ArgumentParser(description="Reportes de estanterías en varios procesos")
+    parser.add_argument("--estanterias", type=int, default=20000,
+                        help="número de estanterías de la planta")
+    parser.add_argument("--procesos", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+                        help="números de procesos a medir")
+    args = parser.parse_args()
+
+    with bus_eventos.silenciar():
+        medir(args.estanterias, args.procesos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+BENCHMARK_SNAPSHOT.PY - Tiempo de guardar y cargar la planta completa
+Sistema de Gestión de Producción de Orellanas
+
+Construye plantas de varios tamaños (la mitad de las estanterías activas,
+con dos pisos inoculados y algunos defectos) y mide:
+- foto binaria (SnapshotPlanta): tamaño, tiempo de guardar y de cargar
+- base SQLite (RepositorioSQLite): tiempo de guardar y de cargar
+- inicio: el camino de arranque de la interfaz, cargar la foto y seguir
+  sus estanterías con el repositorio (sin reescribirlas en la base)
+
+Uso:
+    python benchmarks/benchmark_snapshot.py [--tamanos 1000 10000] [--sin-sqlite]
+
+Fecha: Noviembre 2025
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from clases.estanteria import Estanteria
+from clases.planta import Planta
+from clases.snapshot import SnapshotPlanta
+from clases.repositorio import RepositorioSQLite
+from clases.eventos import bus_eventos
+
+
+def construir_planta(numero_estanterias: int) -> Planta:
+    """Construye una planta con estanterías en distintos estados."""
+    planta = Planta()
+    for i in range(numero_estanterias):
+        estanteria = Estanteria(f"{i:05d}")
+        planta.agregar_estanteria(estanteria)
+        if i % 2 == 0:
+            estanteria.iniciar_produccion()
+            estanteria.get_piso(1).inocular_piso()
+            estanteria.get_piso(2).inocular_piso()
+            estanteria.get_piso(1).marcar_tubular_defectuoso(i % 80 + 1)
+    return planta
+
+
+def cronometrar(funcion, *args):
+    """Ejecuta una función y retorna (resultado, segundos)."""
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def medir(numero_estanterias: int, directorio: str, con_sqlite: bool) -> None:
+    """Mide guardar y cargar una planta de un tamaño dado e imprime el resultado."""
+    planta = construir_planta(numero_estanterias)
+
+    ruta_foto = os.path.join(directorio, f"planta_{numero_estanterias}.snap")
+    tamano, t_guardar = cronometrar(SnapshotPlanta.guardar, planta, ruta_foto)
+    cargada, t_cargar = cronometrar(SnapshotPlanta.cargar, ruta_foto)
+    if cargada.contar_por_fase() != planta.contar_por_fase():
+        raise RuntimeError("La planta cargada de la foto no coincide con la original")
+    print(f"{'foto':<7} estanterías={numero_estanterias:>6}  tamaño={tamano / 1e6:>7.2f} MB  "
+          f"guardar={t_guardar:.3f}s  cargar={t_cargar:.3f}s")
+
+    if con_sqlite:
+        ruta_bd = os.path.join(directorio, f"planta_{numero_estanterias}.db")
+        repositorio = RepositorioSQLite(ruta_bd)
+        _, t_guardar = cronometrar(repositorio.guardar_planta, planta)
+        cargada, t_cargar = cronometrar(repositorio.cargar_planta)
+        repositorio.cerrar()
+        if cargada.contar_por_fase() != planta.contar_por_fase():
+            raise RuntimeError("La planta cargada de SQLite no coincide con la original")
+        print(f"{'sqlite':<7} estanterías={numero_estanterias:>6}  "
+              f"tamaño={os.path.getsize(ruta_bd) / 1e6:>7.2f} MB  "
+              f"guardar={t_guardar:.3f}s  cargar={t_cargar:.3f}s")
+
+        # Arranque de la interfaz: foto al día + seguir sus estanterías
+        repositorio = RepositorioSQLite(ruta_bd)
+        _, t_inicio = cronometrar(iniciar, repositorio, ruta_foto)
+        repositorio.cerrar()
+        print(f"{'inicio':<7} estanterías={numero_estanterias:>6}  "
+              f"cargar foto y seguir={t_inicio:.3f}s")
+
+
+def iniciar(repositorio: RepositorioSQLite, ruta_foto: str) -> Planta:
+    """Carga la foto y sigue la planta como al iniciar la interfaz."""
+    planta = SnapshotPlanta.cargar(ruta_foto)
+    repositorio.seguir_planta(planta, guardar=False)
+    return planta
+
+
+def main():
+    """Ejecuta el benchmark."""
+    parser = argparse.ArgumentParser(description="Guardar y cargar la planta completa")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[1000, 10000],
+                        help="números de estanterías a medir")
+    parser.add_argument("--sin-sqlite", action="store_true",
+                        help="no medir la base SQLite")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio, bus_eventos.silenciar():
+        for numero in args.tamanos:
+            medir(numero, directorio, not args.sin_sqlite)
+
+
+if __name__ == "__main__":
+    main()
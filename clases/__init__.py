@@ -3,8 +3,17 @@ Paquete clases - Sistema de Gestión de Producción de Orellanas
 
 Este paquete contiene todas las clases del sistema:
 - Usuarios: Usuario, Trabajador, Supervisor, JefePlanta, Administrador
-- Producción: Estanteria, Piso, Tubular  
-- Gestión: Publicacion, Reporte, RegistroTiempo, Alerta
+- Producción: Planta, Estanteria, Piso, Tubular, AlmacenTubulares, IndiceInoculacion,
+  PlanificadorCiclo
+- Gestión: Publicacion, Reporte, SerieNumerica, AcumuladorEstadistico, RegistroTiempo,
+  LibroRegistros, ImportadorMarcaciones, ResumenNomina, Alerta
+- Alertas: AlmacenAlertas, MotorReglas y sus reglas, AgrupadorAlertas, AlertaAgrupada,
+  EstadisticasResolucion, SketchCuantiles
+- Notificaciones: DespachadorNotificaciones y sus canales (archivo, webhook, suscriptores)
+- Eventos: Evento, BusEventos y sus salidas (consola, archivo, memoria)
+- Persistencia: RepositorioSQLite, SnapshotPlanta, HistorialProduccion
+- Exportación: ExportadorReporte y sus escritores (CSV, XLSX)
+- Reportes en paralelo: GeneradorReportesParalelo
 
 Autor: [Tu nombre]
 Fecha: Noviembre 2024
@@ -20,8 +29,29 @@ from .piso import Piso
 from .estanteria import Estanteria
 from .publicacion import Publicacion
 from .reporte import Reporte
+from .serie_numerica import AcumuladorEstadistico, SerieNumerica
 from .registro_tiempo import RegistroTiempo
+from .libro_registros import LibroRegistros
+from .importador_marcaciones import ImportadorMarcaciones
+from .resumen_nomina import ResumenNomina
 from .alerta import Alerta
+from .almacen_tubulares import AlmacenTubulares
+from .planta import Planta
+from .indice_inoculacion import IndiceInoculacion
+from .planificador import PlanificadorCiclo
+from .almacen_alertas import AlmacenAlertas
+from .agrupador_alertas import AlertaAgrupada, AgrupadorAlertas
+from .motor_reglas import Regla, ReglaDefectosPiso, ReglaEficiencia, ReglaRevisionVencida, MotorReglas
+from .estadisticas_resolucion import SketchCuantiles, EstadisticasResolucion
+from .notificador import (CanalNotificacion, CanalArchivo, CanalWebhook, CanalSuscriptores,
+                          DespachadorNotificaciones)
+from .asignador_ids import AsignadorIds
+from .eventos import Evento, BusEventos, SalidaConsola, SalidaArchivo, SalidaMemoria, bus_eventos
+from .repositorio import RepositorioSQLite
+from .snapshot import SnapshotPlanta
+from .historial_produccion import HistorialProduccion
+from .exportador import EscritorTabla, EscritorCSV, EscritorXLSX, ExportadorReporte
+from .reportes_paralelos import GeneradorReportesParalelo
 
 __all__ = [
     'Usuario',
@@ -34,6 +64,45 @@ __all__ = [
     'Estanteria',
     'Publicacion',
     'Reporte',
+    'AcumuladorEstadistico',
+    'SerieNumerica',
     'RegistroTiempo',
-    'Alerta'
+    'LibroRegistros',
+    'ImportadorMarcaciones',
+    'ResumenNomina',
+    'Alerta',
+    'AlmacenTubulares',
+    'Planta',
+    'IndiceInoculacion',
+    'PlanificadorCiclo',
+    'AlmacenAlertas',
+    'Regla',
+    'ReglaDefectosPiso',
+    'ReglaEficiencia',
+    'ReglaRevisionVencida',
+    'MotorReglas',
+    'AlertaAgrupada',
+    'AgrupadorAlertas',
+    'SketchCuantiles',
+    'EstadisticasResolucion',
+    'CanalNotificacion',
+    'CanalArchivo',
+    'CanalWebhook',
+    'CanalSuscriptores',
+    'DespachadorNotificaciones',
+    'AsignadorIds',
+    'Evento',
+    'BusEventos',
+    'SalidaConsola',
+    'SalidaArchivo',
+    'SalidaMemoria',
+    'bus_eventos',
+    'RepositorioSQLite',
+    'SnapshotPlanta',
+    'HistorialProduccion',
+    'EscritorTabla',
+    'EscritorCSV',
+    'EscritorXLSX',
+    'ExportadorReporte',
+    'GeneradorReportesParalelo'
 ]
@@ -0,0 +1,278 @@
+"""
+Clases AlertaAgrupada y AgrupadorAlertas - Agrupación de alertas repetidas
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import time
+from datetime import datetime
+from clases import eventos
+from clases.alerta import Alerta
+from clases.estanteria import Estanteria, ObservadorEstanteria
+
+
+class AlertaAgrupada(Alerta):
+    """
+    Clase que representa varias ocurrencias de la misma alerta.
+
+    Junta las ocurrencias de un (tipo, estantería, piso) dentro de una
+    ventana de tiempo: guarda cuántas fueron y la primera y última.
+
+    Demuestra:
+    - Herencia: extends Alerta
+    """
+
+    __slots__ = ("__base", "__piso", "__cantidad", "__primera", "__ultima")
+
+    def __init__(self, tipo: str, mensaje: str, estanteria=None, numero_piso: int = None,
+                 cantidad: int = 1, marca: float = None):
+        """
+        Constructor de AlertaAgrupada.
+
+        Args:
+            tipo: Tipo de alerta
+            mensaje: Mensaje de la primera ocurrencia
+            estanteria: Instancia de Estanteria relacionada (opcional)
+            numero_piso: Piso relacionado (opcional)
+            cantidad: Ocurrencias iniciales
+            marca: Marca de tiempo de la primera ocurrencia (por defecto, la actual)
+        """
+        super().__init__(tipo, mensaje, estanteria)
+        fecha = datetime.fromtimestamp(marca) if marca is not None else datetime.now()
+        # La alerta se crea con la primera ocurrencia, aunque se registre después
+        self._set_fecha_creacion(fecha)
+        self.__base = mensaje
+        self.__piso = numero_piso
+        self.__cantidad = cantidad
+        self.__primera = fecha
+        self.__ultima = fecha
+        self.__actualizar_mensaje()
+
+    @classmethod
+    def restaurar(cls, id_alerta: int, tipo: str, mensaje: str, fecha_creacion: datetime,
+                  estanteria=None, resuelta: bool = False, fecha_resolucion=None,
+                  numero_piso: int = None, cantidad: int = 1, primera: datetime = None,
+                  ultima: datetime = None, mensaje_base: str = None):
+        """
+        Reconstruye una alerta agrupada guardada, sin publicar eventos.
+
+        Args:
+            id_alerta, tipo, mensaje, fecha_creacion, estanteria, resuelta,
+            fecha_resolucion: Como en Alerta.restaurar
+            numero_piso: Piso relacionado (opcional)
+            cantidad: Ocurrencias agrupadas
+            primera: Fecha de la primera ocurrencia (por defecto, la de creación)
+            ultima: Fecha de la última ocurrencia (por defecto, la primera)
+            mensaje_base: Mensaje sin el contador (por defecto, el mensaje)
+
+        Returns:
+            Instancia de AlertaAgrupada
+        """
+        alerta = super().restaurar(id_alerta, tipo, mensaje, fecha_creacion, estanteria,
+                                   resuelta, fecha_resolucion)
+        alerta.__base = mensaje_base if mensaje_base is not None else mensaje
+        alerta.__piso = numero_piso
+        alerta.__cantidad = cantidad
+        alerta.__primera = primera or fecha_creacion
+        alerta.__ultima = ultima or alerta.__primera
+        return alerta
+
+    def get_mensaje_base(self) -> str:
+        """Retorna el mensaje de la primera ocurrencia (sin el contador)."""
+        return self.__base
+
+    def get_piso(self):
+        """Retorna el piso relacionado (None si no tiene)."""
+        return self.__piso
+
+    def get_cantidad(self) -> int:
+        """Retorna el número de ocurrencias agrupadas."""
+        return self.__cantidad
+
+    def get_primera(self) -> datetime:
+        """Retorna la fecha de la primera ocurrencia."""
+        return self.__primera
+
+    def get_ultima(self) -> datetime:
+        """Retorna la fecha de la última ocurrencia."""
+        return self.__ultima
+
+    def sumar(self, cantidad: int = 1, marca: float = None) -> None:
+        """
+        Suma ocurrencias a la alerta.
+
+        Args:
+            cantidad: Ocurrencias nuevas
+            marca: Marca de tiempo de la ocurrencia (por defecto, la actual)
+        """
+        self.__cantidad += cantidad
+        self.__ultima = datetime.fromtimestamp(marca) if marca is not None else datetime.now()
+        self.__actualizar_mensaje()
+
+    def __actualizar_mensaje(self) -> None:
+        """Método privado que pone el contador y las fechas en el mensaje."""
+        if self.__cantidad == 1:
+            self._set_mensaje(self.__base)
+        else:
+            self._set_mensaje(f"{self.__base} (x{self.__cantidad} entre "
+                              f"{self.__primera.strftime('%d/%m %H:%M')} y "
+                              f"{self.__ultima.strftime('%d/%m %H:%M')})")
+
+    def obtener_estadisticas(self) -> dict:
+        """Estadísticas de la alerta con los datos de la agrupación."""
+        stats = super().obtener_estadisticas()
+        stats["piso"] = self.__piso
+        stats["cantidad"] = self.__cantidad
+        stats["primera"] = self.__primera.strftime('%d/%m/%Y %H:%M')
+        stats["ultima"] = self.__ultima.strftime('%d/%m/%Y %H:%M')
+        return stats
+
+    def __repr__(self) -> str:
+        """Representación técnica de la alerta agrupada."""
+        return (f"AlertaAgrupada(id={self.get_id()}, tipo='{self.get_tipo()}', "
+                f"piso={self.__piso}, cantidad={self.__cantidad})")
+
+
+class AgrupadorAlertas(ObservadorEstanteria):
+    """
+    Clase que agrupa alertas repetidas en una sola por ventana de tiempo.
+
+    Las ocurrencias con el mismo (tipo, estantería, piso) que llegan dentro
+    de 'ventana' segundos desde la primera se suman a la misma
+    AlertaAgrupada; solo la primera publica ALERTA_CREADA, así una
+    contaminación que marca decenas de tubulares en minutos genera una
+    alerta y una notificación. Pasada la ventana, o si la alerta se
+    resolvió, la siguiente ocurrencia abre un grupo nuevo.
+
+    Como observador de estanterías convierte los tubulares que pasan a
+    "defectuoso" en ocurrencias de tipo "defecto" de su piso.
+
+    Demuestra:
+    - Herencia: extends ObservadorEstanteria
+    - Composición: Crea y agrupa objetos AlertaAgrupada
+    """
+
+    def __init__(self, ventana: float = 900):
+        """
+        Constructor de AgrupadorAlertas.
+
+        Args:
+            ventana: Segundos que dura un grupo desde su primera ocurrencia
+        """
+        if ventana <= 0:
+            raise ValueError("La ventana debe ser positiva")
+        self.__ventana = ventana
+        # (tipo, código, piso) -> (marca de la primera ocurrencia, AlertaAgrupada)
+        self.__grupos = {}
+        self.__estanterias = {}
+        self.__ocurrencias = 0
+        self.__alertas_creadas = 0
+
+    def get_ventana(self) -> float:
+        """Retorna la ventana de agrupación en segundos."""
+        return self.__ventana
+
+    def registrar(self, tipo: str, mensaje: str, estanteria=None, numero_piso: int = None,
+                  cantidad: int = 1, ahora: float = None) -> AlertaAgrupada:
+        """
+        Registra una ocurrencia y la agrupa con las anteriores de su ventana.
+
+        Args:
+            tipo: Tipo de alerta
+            mensaje: Mensaje de la ocurrencia (se usa si abre un grupo)
+            estanteria: Instancia de Estanteria relacionada (opcional)
+            numero_piso: Piso relacionado (opcional)
+            cantidad: Ocurrencias que representa
+            ahora: Marca de tiempo de la ocurrencia (por defecto, la actual)
+
+        Returns:
+            La AlertaAgrupada donde quedó la ocurrencia
+        """
+        if ahora is None:
+            ahora = time.time()
+        codigo = estanteria.get_codigo() if estanteria is not None else None
+        clave = (tipo, codigo, numero_piso)
+        self.__ocurrencias += cantidad
+
+        grupo = self.__grupos.get(clave)
+        if grupo is not None:
+            inicio, alerta = grupo
+            if ahora - inicio <= self.__ventana and not alerta.esta_resuelta():
+                alerta.sumar(cantidad, ahora)
+                return alerta
+
+        alerta = AlertaAgrupada(tipo, mensaje, estanteria, numero_piso, cantidad, ahora)
+        self.__grupos[clave] = (ahora, alerta)
+        self.__alertas_creadas += 1
+        eventos.publicar(eventos.ALERTA_CREADA, f"🔔 Alerta #{alerta.get_id()}: {mensaje}",
+                         "aviso", alerta=alerta)
+        return alerta
+
+    def cerrar_vencidos(self, ahora: float = None) -> list:
+        """
+        Cierra los grupos cuya ventana terminó (sus alertas siguen abiertas).
+
+        Args:
+            ahora: Marca de tiempo de referencia (por defecto, la actual)
+
+        Returns:
+            Lista de AlertaAgrupada cerradas, con su cantidad final
+        """
+        if ahora is None:
+            ahora = time.time()
+        vencidos = [clave for clave, (inicio, alerta) in self.__grupos.items()
+                    if ahora - inicio > self.__ventana or alerta.esta_resuelta()]
+        return [self.__grupos.pop(clave)[1] for clave in vencidos]
+
+    def get_grupos_abiertos(self) -> list:
+        """Retorna las alertas de los grupos todavía abiertos."""
+        return [alerta for _, alerta in self.__grupos.values()]
+
+    def obtener_estadisticas(self) -> dict:
+        """
+        Obtiene estadísticas de la agrupación.
+
+        Returns:
+            Diccionario con ocurrencias, alertas creadas y factor de reducción
+        """
+        return {
+            "ocurrencias": self.__ocurrencias,
+            "alertas_creadas": self.__alertas_creadas,
+            "grupos_abiertos": len(self.__grupos),
+            "reduccion": round(self.__ocurrencias / self.__alertas_creadas, 2)
+                         if self.__alertas_creadas else 0.0
+        }
+
+    # Registro de estanterías
+
+    def registrar_estanteria(self, estanteria: Estanteria) -> None:
+        """Empieza a agrupar los defectos de una estantería."""
+        self.__estanterias[estanteria.get_codigo()] = estanteria
+        estanteria.agregar_observador(self)
+
+    def registrar_planta(self, planta) -> None:
+        """Empieza a agrupar los defectos de todas las estanterías de una planta."""
+        for estanteria in planta:
+            self.registrar_estanteria(estanteria)
+
+    def quitar_estanteria(self, estanteria: Estanteria) -> None:
+        """Deja de seguir una estantería."""
+        estanteria.quitar_observador(self)
+        self.__estanterias.pop(estanteria.get_codigo(), None)
+
+    # Avisos de las estanterías (ObservadorEstanteria)
+
+    def tubulares_cambiados(self, estanteria, numero_piso: int, anterior: str,
+                            nuevo: str, cantidad: int) -> None:
+        """Registra los tubulares que pasaron a defectuosos como ocurrencias del piso."""
+        if nuevo == "defectuoso":
+            self.registrar("defecto",
+                           f"Estantería {estanteria.get_codigo()}, piso {numero_piso}: "
+                           f"tubulares marcados como defectuosos",
+                           estanteria, numero_piso, cantidad)
+
+    def __repr__(self) -> str:
+        """Representación técnica del agrupador."""
+        return (f"AgrupadorAlertas(ventana={self.__ventana}, grupos={len(self.__grupos)}, "
+                f"ocurrencias={self.__ocurrencias})")
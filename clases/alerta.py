@@ -6,7 +6,9 @@ Autor: [Tu nombre]
 Fecha: Noviembre 2024
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from clases.asignador_ids import siguiente_id
+from clases import eventos
 
 
 class Alerta:
@@ -19,8 +21,11 @@ class Alerta:
     - Agregación: Tiene una relación con Estanteria
     """
     
-   
-    _contador_id = 0
+    # Horas sin resolver a partir de las cuales una alerta es urgente
+    HORAS_URGENCIA = 24
+    
+    __slots__ = ("__id", "__tipo", "__mensaje", "__nivel", "__fecha_creacion",
+                 "__estanteria", "__resuelta", "__fecha_resolucion")
     
     def __init__(self, tipo: str, mensaje: str, estanteria=None):
         """
@@ -31,8 +36,7 @@ class Alerta:
             mensaje: Mensaje descriptivo de la alerta
             estanteria: Instancia de Estanteria relacionada (opcional)
         """
-        Alerta._contador_id += 1
-        self.__id = Alerta._contador_id
+        self.__id = siguiente_id("alerta")
         self.__tipo = tipo
         self.__mensaje = mensaje
         self.__nivel = self.__determinar_nivel(tipo)
@@ -41,6 +45,35 @@ class Alerta:
         self.__resuelta = False
         self.__fecha_resolucion = None
     
+    @classmethod
+    def restaurar(cls, id_alerta: int, tipo: str, mensaje: str, fecha_creacion: datetime,
+                  estanteria=None, resuelta: bool = False, fecha_resolucion=None):
+        """
+        Reconstruye una alerta guardada conservando su ID, sin publicar eventos.
+        
+        Args:
+            id_alerta: ID original de la alerta
+            tipo: Tipo de alerta
+            mensaje: Mensaje descriptivo
+            fecha_creacion: Fecha de creación original
+            estanteria: Instancia de Estanteria relacionada (opcional)
+            resuelta: Si la alerta estaba resuelta
+            fecha_resolucion: Fecha de resolución (None si no está resuelta)
+            
+        Returns:
+            Instancia de Alerta
+        """
+        alerta = cls.__new__(cls)
+        alerta.__id = id_alerta
+        alerta.__tipo = tipo
+        alerta.__mensaje = mensaje
+        alerta.__nivel = alerta.__determinar_nivel(tipo)
+        alerta.__fecha_creacion = fecha_creacion
+        alerta.__estanteria = estanteria
+        alerta.__resuelta = resuelta
+        alerta.__fecha_resolucion = fecha_resolucion
+        return alerta
+    
     def __determinar_nivel(self, tipo: str) -> str:
         """
         Método privado para determinar el nivel de la alerta según su tipo.
@@ -73,6 +106,10 @@ class Alerta:
         """Retorna el mensaje de la alerta."""
         return self.__mensaje
     
+    def _set_mensaje(self, mensaje: str) -> None:
+        """Cambia el mensaje (para subclases que lo actualizan, como AlertaAgrupada)."""
+        self.__mensaje = mensaje
+    
     def get_nivel(self) -> str:
         """Retorna el nivel de severidad de la alerta."""
         return self.__nivel
@@ -81,6 +118,10 @@ class Alerta:
         """Retorna la fecha de creación de la alerta."""
         return self.__fecha_creacion
     
+    def _set_fecha_creacion(self, fecha: datetime) -> None:
+        """Cambia la fecha de creación (para subclases con fecha propia, como AlertaAgrupada)."""
+        self.__fecha_creacion = fecha
+    
     def get_estanteria(self):
         """Retorna la estantería asociada (puede ser None)."""
         return self.__estanteria
@@ -99,23 +140,30 @@ class Alerta:
         if not self.__resuelta:
             self.__resuelta = True
             self.__fecha_resolucion = datetime.now()
-            print(f"✓ Alerta #{self.__id} marcada como resuelta")
+            eventos.publicar(eventos.ALERTA_RESUELTA, f"✓ Alerta #{self.__id} marcada como resuelta",
+                             alerta=self)
         else:
-            print(f"⚠️ Alerta #{self.__id} ya estaba resuelta")
+            eventos.publicar(eventos.ALERTA_RESUELTA, f"⚠️ Alerta #{self.__id} ya estaba resuelta",
+                             "aviso", alerta=self)
     
     def reabrir(self) -> None:
         """Reabre una alerta previamente resuelta."""
         if self.__resuelta:
             self.__resuelta = False
             self.__fecha_resolucion = None
-            print(f"⚠️ Alerta #{self.__id} reabierta")
+            eventos.publicar(eventos.ALERTA_REABIERTA, f"⚠️ Alerta #{self.__id} reabierta",
+                             alerta=self)
         else:
-            print(f"ℹ️ Alerta #{self.__id} ya estaba abierta")
+            eventos.publicar(eventos.ALERTA_REABIERTA, f"ℹ️ Alerta #{self.__id} ya estaba abierta",
+                             "aviso", alerta=self)
     
-    def es_urgente(self) -> bool:
+    def es_urgente(self, ahora: datetime = None) -> bool:
         """
         Determina si la alerta es urgente.
         
+        Args:
+            ahora: Fecha de referencia (por defecto, la actual)
+        
         Returns:
             True si es crítica o lleva más de 24 horas sin resolver
         """
@@ -123,11 +171,15 @@ class Alerta:
             return True
         
         if not self.__resuelta:
-            tiempo_abierta = datetime.now() - self.__fecha_creacion
-            return tiempo_abierta.total_seconds() > 86400  # 24 horas
+            tiempo_abierta = (ahora or datetime.now()) - self.__fecha_creacion
+            return tiempo_abierta.total_seconds() > self.HORAS_URGENCIA * 3600
         
         return False
     
+    def get_vencimiento_urgencia(self) -> datetime:
+        """Retorna la fecha en la que la alerta pasa a ser urgente si no se resuelve."""
+        return self.__fecha_creacion + timedelta(hours=self.HORAS_URGENCIA)
+    
     def calcular_tiempo_abierta(self) -> float:
         """
         Calcula el tiempo que la alerta ha estado abierta.
@@ -161,8 +213,18 @@ class Alerta:
             horas_resto = int(horas % 24)
             return f"{dias} días, {horas_resto} horas"
     
-    def notificar(self) -> None:
-        """Simula el envío de una notificación de la alerta."""
+    def notificar(self, despachador=None) -> None:
+        """
+        Envía una notificación de la alerta.
+        
+        Args:
+            despachador: DespachadorNotificaciones que la envía en segundo
+                         plano (si es None, se muestra en consola)
+        """
+        if despachador is not None:
+            despachador.notificar(self)
+            return
+        
         simbolo = self.__obtener_simbolo()
         urgente_str = " ⚠️ URGENTE" if self.es_urgente() else ""
         
@@ -0,0 +1,273 @@
+"""
+Clase AlmacenAlertas - Alertas indexadas para consultas directas
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import heapq
+import time
+from clases import eventos
+from clases.alerta import Alerta
+
+
+class AlmacenAlertas:
+    """
+    Clase que guarda alertas con índices por nivel, tipo, estantería,
+    estado (abierta o resuelta) y urgencia.
+
+    Cada índice es un diccionario valor -> conjunto de IDs, así una
+    consulta como "urgentes abiertas de la estantería 0001" es la
+    intersección de unos pocos conjuntos, empezando por el más chico, sin
+    recorrer el historial ni llamar a datetime.now() por alerta.
+
+    La urgencia por tiempo se mantiene con un heap de vencimientos (fecha
+    de creación + 24 horas) de las alertas abiertas no críticas:
+    actualizar_urgentes() saca solo las que ya vencieron y las pasa al
+    conjunto de urgentes. Las alertas críticas son urgentes mientras estén
+    abiertas.
+
+    El almacén escucha ALERTA_RESUELTA y ALERTA_REABIERTA en el bus de
+    eventos, así marcar_resuelta() y reabrir() sobre la Alerta mantienen
+    los índices al día.
+
+    Demuestra:
+    - Agregación: Guarda objetos Alerta que existen por separado
+    - Encapsulación: Los índices y el heap son privados
+    """
+
+    def __init__(self, alertas=None):
+        """
+        Constructor de AlmacenAlertas.
+
+        Args:
+            alertas: Alertas iniciales (opcional)
+        """
+        self.__alertas = {}
+        self.__por_nivel = {}
+        self.__por_tipo = {}
+        # código de estantería (None si no tiene) -> IDs
+        self.__por_estanteria = {}
+        self.__abiertas = set()
+        self.__resueltas = set()
+        self.__urgentes = set()
+        # Entradas (vencimiento, id); las de alertas resueltas o ya urgentes se descartan al salir
+        self.__heap = []
+        eventos.bus_eventos.suscribir(self.__alerta_cambiada, eventos.ALERTA_RESUELTA)
+        eventos.bus_eventos.suscribir(self.__alerta_cambiada, eventos.ALERTA_REABIERTA)
+        if alertas:
+            self.agregar_varias(alertas)
+
+    def cerrar(self) -> None:
+        """Deja de escuchar los eventos de alertas."""
+        eventos.bus_eventos.desuscribir(self.__alerta_cambiada, eventos.ALERTA_RESUELTA)
+        eventos.bus_eventos.desuscribir(self.__alerta_cambiada, eventos.ALERTA_REABIERTA)
+
+    # Alta y baja
+
+    def agregar(self, alerta: Alerta) -> None:
+        """
+        Agrega una alerta al almacén (si ya estaba, actualiza su estado).
+
+        Args:
+            alerta: Instancia de Alerta
+        """
+        id_alerta = alerta.get_id()
+        if id_alerta in self.__alertas:
+            self.__sincronizar(alerta)
+            return
+        self.__alertas[id_alerta] = alerta
+        self.__por_nivel.setdefault(alerta.get_nivel(), set()).add(id_alerta)
+        self.__por_tipo.setdefault(alerta.get_tipo(), set()).add(id_alerta)
+        self.__por_estanteria.setdefault(self.__codigo(alerta), set()).add(id_alerta)
+        self.__sincronizar(alerta)
+
+    def agregar_varias(self, alertas) -> None:
+        """Agrega varias alertas."""
+        for alerta in alertas:
+            self.agregar(alerta)
+
+    def quitar(self, alerta: Alerta) -> bool:
+        """
+        Quita una alerta del almacén.
+
+        Returns:
+            True si estaba en el almacén
+        """
+        id_alerta = alerta.get_id()
+        if self.__alertas.pop(id_alerta, None) is None:
+            return False
+        for indice, clave in ((self.__por_nivel, alerta.get_nivel()),
+                              (self.__por_tipo, alerta.get_tipo()),
+                              (self.__por_estanteria, self.__codigo(alerta))):
+            grupo = indice[clave]
+            grupo.discard(id_alerta)
+            if not grupo:
+                del indice[clave]
+        self.__abiertas.discard(id_alerta)
+        self.__resueltas.discard(id_alerta)
+        self.__urgentes.discard(id_alerta)
+        return True
+
+    @staticmethod
+    def __codigo(alerta: Alerta):
+        """Método privado: código de la estantería de la alerta (None si no tiene)."""
+        estanteria = alerta.get_estanteria()
+        return estanteria.get_codigo() if estanteria is not None else None
+
+    def __alerta_cambiada(self, evento) -> None:
+        """Método privado que recibe las resoluciones y reaperturas del bus."""
+        alerta = evento.get_datos().get("alerta")
+        if alerta is not None and alerta.get_id() in self.__alertas:
+            self.__sincronizar(alerta)
+
+    def __sincronizar(self, alerta: Alerta) -> None:
+        """Método privado que ubica la alerta en abiertas/resueltas y urgentes."""
+        id_alerta = alerta.get_id()
+        if alerta.esta_resuelta():
+            self.__abiertas.discard(id_alerta)
+            self.__urgentes.discard(id_alerta)
+            self.__resueltas.add(id_alerta)
+            return
+        self.__resueltas.discard(id_alerta)
+        self.__abiertas.add(id_alerta)
+        if alerta.get_nivel() == "critico":
+            self.__urgentes.add(id_alerta)
+        elif id_alerta not in self.__urgentes:
+            vencimiento = alerta.get_vencimiento_urgencia().timestamp()
+            heapq.heappush(self.__heap, (vencimiento, id_alerta))
+
+    # Urgencia
+
+    def actualizar_urgentes(self, ahora: float = None) -> list:
+        """
+        Pasa a urgentes las alertas abiertas que cumplieron 24 horas.
+
+        Args:
+            ahora: Marca de tiempo de referencia (por defecto, la actual)
+
+        Returns:
+            Lista de alertas que acaban de volverse urgentes
+        """
+        if ahora is None:
+            ahora = time.time()
+        nuevas = []
+        heap = self.__heap
+        while heap and heap[0][0] < ahora:
+            _, id_alerta = heapq.heappop(heap)
+            if id_alerta in self.__abiertas and id_alerta not in self.__urgentes:
+                self.__urgentes.add(id_alerta)
+                nuevas.append(self.__alertas[id_alerta])
+        for alerta in nuevas:
+            eventos.publicar(eventos.ALERTA_URGENTE,
+                             f"🔥 Alerta #{alerta.get_id()} lleva más de {Alerta.HORAS_URGENCIA} horas sin resolver",
+                             "aviso", alerta=alerta)
+        return nuevas
+
+    def proximo_vencimiento(self):
+        """Retorna la marca de tiempo de la próxima alerta en volverse urgente (None si no hay)."""
+        heap = self.__heap
+        while heap:
+            _, id_alerta = heap[0]
+            if id_alerta in self.__abiertas and id_alerta not in self.__urgentes:
+                return heap[0][0]
+            heapq.heappop(heap)
+        return None
+
+    def es_urgente(self, alerta: Alerta) -> bool:
+        """Indica si una alerta del almacén es urgente (según la última actualización)."""
+        return alerta.get_id() in self.__urgentes
+
+    # Consultas
+
+    def __ids(self, nivel, tipo, codigo, resuelta, urgente, ahora):
+        """Método privado: IDs que cumplen todos los filtros dados."""
+        if urgente is not None:
+            self.actualizar_urgentes(ahora)
+        grupos = []
+        if nivel is not None:
+            grupos.append(self.__por_nivel.get(nivel, set()))
+        if tipo is not None:
+            grupos.append(self.__por_tipo.get(tipo, set()))
+        if codigo is not None:
+            grupos.append(self.__por_estanteria.get(codigo, set()))
+        if resuelta is not None:
+            grupos.append(self.__resueltas if resuelta else self.__abiertas)
+        if urgente:
+            grupos.append(self.__urgentes)
+        if not grupos:
+            ids = set(self.__alertas)
+        else:
+            grupos.sort(key=len)
+            ids = grupos[0].intersection(*grupos[1:])
+        if urgente is False:
+            ids -= self.__urgentes
+        return ids
+
+    def buscar(self, nivel: str = None, tipo: str = None, codigo: str = None,
+               resuelta: bool = None, urgente: bool = None, ahora: float = None) -> list:
+        """
+        Busca alertas por cualquier combinación de filtros.
+
+        Args:
+            nivel: 'info', 'advertencia' o 'critico'
+            tipo: Tipo de alerta
+            codigo: Código de la estantería
+            resuelta: True para resueltas, False para abiertas
+            urgente: True para urgentes, False para no urgentes
+            ahora: Marca de tiempo para actualizar la urgencia (por defecto, la actual)
+
+        Returns:
+            Lista de alertas ordenadas por ID (de la más antigua a la más reciente)
+        """
+        ids = self.__ids(nivel, tipo, codigo, resuelta, urgente, ahora)
+        return [self.__alertas[id_alerta] for id_alerta in sorted(ids)]
+
+    def contar(self, nivel: str = None, tipo: str = None, codigo: str = None,
+               resuelta: bool = None, urgente: bool = None, ahora: float = None) -> int:
+        """Cuenta las alertas que cumplen los filtros (los mismos que buscar)."""
+        return len(self.__ids(nivel, tipo, codigo, resuelta, urgente, ahora))
+
+    def get_alerta(self, id_alerta: int):
+        """Retorna la alerta con ese ID (None si no está)."""
+        return self.__alertas.get(id_alerta)
+
+    def get_abiertas(self) -> list:
+        """Retorna las alertas sin resolver."""
+        return self.buscar(resuelta=False)
+
+    def get_urgentes(self, codigo: str = None) -> list:
+        """Retorna las alertas abiertas urgentes (de una estantería si se indica)."""
+        return self.buscar(codigo=codigo, resuelta=False, urgente=True)
+
+    def contar_por_nivel(self, resuelta: bool = None) -> dict:
+        """
+        Cuenta alertas por nivel.
+
+        Args:
+            resuelta: True solo resueltas, False solo abiertas, None todas
+
+        Returns:
+            Diccionario {nivel: cantidad}
+        """
+        if resuelta is None:
+            return {nivel: len(ids) for nivel, ids in self.__por_nivel.items()}
+        filtro = self.__resueltas if resuelta else self.__abiertas
+        return {nivel: len(ids & filtro) for nivel, ids in self.__por_nivel.items()}
+
+    def __len__(self) -> int:
+        """Retorna el número de alertas del almacén."""
+        return len(self.__alertas)
+
+    def __contains__(self, alerta) -> bool:
+        """Indica si una alerta está en el almacén."""
+        return alerta.get_id() in self.__alertas
+
+    def __iter__(self):
+        """Recorre las alertas en orden de ID."""
+        return (self.__alertas[id_alerta] for id_alerta in sorted(self.__alertas))
+
+    def __repr__(self) -> str:
+        """Representación técnica del almacén."""
+        return (f"AlmacenAlertas(alertas={len(self.__alertas)}, abiertas={len(self.__abiertas)}, "
+                f"urgentes={len(self.__urgentes)})")
@@ -0,0 +1,621 @@
+"""
+Clase AlmacenTubulares - Almacenamiento columnar del estado de los tubulares
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+from array import array
+from datetime import datetime
+
+
+class AlmacenTubulares:
+    """
+    Clase que guarda el estado de muchos tubulares en arreglos compactos.
+
+    En lugar de que cada Tubular tenga sus propios atributos, el almacén
+    mantiene tres columnas (código de estado, bandera de defecto y fecha
+    de inoculación) y los objetos Tubular solo son vistas sobre una
+    posición del almacén. El almacén se divide en segmentos (un segmento
+    por piso) y mantiene contadores por estado para cada segmento y para
+    el total, actualizados en cada transición, de modo que los conteos
+    son de tiempo constante.
+
+    Los arreglos y contadores se crean con la primera escritura: mientras
+    tanto todos los tubulares están "vacíos" y los conteos se calculan a
+    partir de la capacidad, así un almacén sin usar casi no ocupa memoria.
+
+    Las observaciones de los tubulares, que son pocas, se guardan aparte
+    en un diccionario disperso {posición: lista de observaciones}. Como
+    viven en el almacén y no en las vistas, no se pierden al recrear los
+    objetos Tubular ni al reemplazar las columnas.
+
+    Demuestra:
+    - Encapsulación: Los arreglos son privados
+    - Abstracción: Oculta la representación interna de los estados
+    """
+
+    ESTADOS = ("vacío", "inoculado", "en_desarrollo", "producción", "cosechado", "defectuoso")
+    CODIGOS = {estado: codigo for codigo, estado in enumerate(ESTADOS)}
+    CODIGO_VACIO = 0
+    CODIGO_DEFECTUOSO = 5
+
+    # Si está activo, cada consulta de conteo se compara contra un reconteo completo
+    _verificacion_activa = False
+
+    def __init__(self, capacidad: int, tam_segmento: int = None):
+        """
+        Constructor de AlmacenTubulares.
+
+        Args:
+            capacidad: Número de tubulares que guarda el almacén
+            tam_segmento: Tubulares por segmento (por defecto, un solo segmento)
+        """
+        self.__capacidad = capacidad
+        self.__tam_segmento = tam_segmento or capacidad
+        self.__numero_segmentos = -(-capacidad // self.__tam_segmento)
+        # Se crean en __materializar() con la primera escritura
+        self.__estados = None
+        self.__defectos = None
+        self.__fechas = None
+        self.__conteos = None
+        self.__totales = None
+        # posición -> lista de {"fecha": datetime, "texto": str} (None si no hay ninguna)
+        self.__observaciones = None
+        self.__observadores = []
+        self.__observadores_fechas = []
+        self.__observadores_observaciones = []
+
+    def __materializar(self) -> None:
+        """Método privado que crea los arreglos y contadores (todo vacío)."""
+        capacidad = self.__capacidad
+        self.__estados = bytearray(capacidad)
+        self.__defectos = bytearray(capacidad)
+        # Marca de tiempo (epoch) de inoculación, 0.0 si no ha sido inoculado
+        self.__fechas = array('d', bytes(8 * capacidad))
+        self.__conteos = [self.__conteo_inicial(segmento)
+                          for segmento in range(self.__numero_segmentos)]
+        self.__totales = [capacidad] + [0] * (len(self.ESTADOS) - 1)
+
+    def __conteo_inicial(self, segmento: int) -> list:
+        """Método privado: contadores de un segmento en el que todo está vacío."""
+        if segmento is None:
+            tamano = self.__capacidad
+        else:
+            tamano = min(self.__tam_segmento, self.__capacidad - segmento * self.__tam_segmento)
+        return [tamano] + [0] * (len(self.ESTADOS) - 1)
+
+    def __conteo(self, segmento: int) -> list:
+        """Método privado que retorna los contadores de un segmento (o del total)."""
+        if self.__estados is None:
+            return self.__conteo_inicial(segmento)
+        return self.__totales if segmento is None else self.__conteos[segmento]
+
+    def esta_materializado(self) -> bool:
+        """Indica si el almacén ya creó sus arreglos."""
+        return self.__estados is not None
+
+    @classmethod
+    def activar_verificacion(cls, activa: bool = True) -> None:
+        """
+        Activa o desactiva el modo de verificación de contadores.
+
+        En modo verificación cada conteo se compara contra un reconteo
+        completo de los arreglos (útil en pruebas, costoso en producción).
+
+        Args:
+            activa: True para activar la verificación
+        """
+        cls._verificacion_activa = activa
+
+    def agregar_observador(self, funcion) -> None:
+        """
+        Registra una función que se llama en cada cambio de los contadores.
+
+        La función recibe (segmento, codigo_anterior, codigo_nuevo, cantidad).
+
+        Args:
+            funcion: Función a notificar
+        """
+        self.__observadores.append(funcion)
+
+    def quitar_observador(self, funcion) -> None:
+        """Quita una función registrada con agregar_observador."""
+        if funcion in self.__observadores:
+            self.__observadores.remove(funcion)
+
+    def agregar_observador_fechas(self, funcion) -> None:
+        """
+        Registra una función que se llama cuando cambian fechas de inoculación.
+
+        La función recibe (posiciones, marca): la lista de posiciones que
+        quedaron con esa marca de tiempo (0.0 si se borró la fecha), o
+        (None, None) si se reemplazaron todas las columnas.
+
+        Args:
+            funcion: Función a notificar
+        """
+        self.__observadores_fechas.append(funcion)
+
+    def quitar_observador_fechas(self, funcion) -> None:
+        """Quita una función registrada con agregar_observador_fechas."""
+        if funcion in self.__observadores_fechas:
+            self.__observadores_fechas.remove(funcion)
+
+    def agregar_observador_observaciones(self, funcion) -> None:
+        """
+        Registra una función que se llama cuando se agrega una observación.
+
+        La función recibe (posicion, observacion), con la observación como
+        diccionario {"fecha", "texto"}.
+
+        Args:
+            funcion: Función a notificar
+        """
+        self.__observadores_observaciones.append(funcion)
+
+    def quitar_observador_observaciones(self, funcion) -> None:
+        """Quita una función registrada con agregar_observador_observaciones."""
+        if funcion in self.__observadores_observaciones:
+            self.__observadores_observaciones.remove(funcion)
+
+    def get_capacidad(self) -> int:
+        """Retorna el número de tubulares del almacén."""
+        return self.__capacidad
+
+    def get_tam_segmento(self) -> int:
+        """Retorna el número de tubulares por segmento."""
+        return self.__tam_segmento
+
+    def get_numero_segmentos(self) -> int:
+        """Retorna el número de segmentos del almacén."""
+        return self.__numero_segmentos
+
+    def get_estado(self, indice: int) -> str:
+        """Retorna el estado del tubular en la posición indicada."""
+        if self.__estados is None:
+            return self.ESTADOS[self.CODIGO_VACIO]
+        return self.ESTADOS[self.__estados[indice]]
+
+    def get_codigo_estado(self, indice: int) -> int:
+        """Retorna el código numérico del estado en la posición indicada."""
+        if self.__estados is None:
+            return self.CODIGO_VACIO
+        return self.__estados[indice]
+
+    def es_defectuoso(self, indice: int) -> bool:
+        """Indica si el tubular en la posición indicada está defectuoso."""
+        return self.__defectos is not None and self.__defectos[indice] == 1
+
+    def get_fecha_inoculacion(self, indice: int):
+        """Retorna la fecha de inoculación (datetime) o None."""
+        marca = self.get_marca_inoculacion(indice)
+        if marca:
+            return datetime.fromtimestamp(marca)
+        return None
+
+    def get_marca_inoculacion(self, indice: int) -> float:
+        """Retorna la marca de tiempo de inoculación (0.0 si no hay)."""
+        if self.__fechas is None:
+            return 0.0
+        return self.__fechas[indice]
+
+    def set_estado(self, indice: int, estado: str) -> None:
+        """
+        Cambia el estado del tubular en la posición indicada.
+
+        Args:
+            indice: Posición del tubular en el almacén
+            estado: Nombre del nuevo estado
+        """
+        codigo = self.CODIGOS[estado]
+        if self.__estados is None:
+            if codigo == self.CODIGO_VACIO:
+                return
+            self.__materializar()
+        anterior = self.__categoria(indice)
+        self.__estados[indice] = codigo
+        self.__registrar_transicion(indice, anterior, self.__categoria(indice))
+
+    def marcar_defectuoso(self, indice: int) -> None:
+        """Marca como defectuoso el tubular en la posición indicada."""
+        if self.__estados is None:
+            self.__materializar()
+        anterior = self.__categoria(indice)
+        self.__defectos[indice] = 1
+        self.__estados[indice] = self.CODIGO_DEFECTUOSO
+        self.__registrar_transicion(indice, anterior, self.CODIGO_DEFECTUOSO)
+
+    def transicionar(self, nuevo_estado: str, estado: str = None, inicio: int = 0,
+                     fin: int = None, inoculado_antes: float = None,
+                     inoculado_despues: float = None, fecha_inoculacion=None) -> int:
+        """
+        Cambia de estado, en una sola pasada, todos los tubulares de un rango
+        que cumplan el filtro. Los tubulares defectuosos no se modifican.
+
+        Args:
+            nuevo_estado: Estado destino
+            estado: Estado de origen requerido (None para cualquiera)
+            inicio: Primera posición del rango
+            fin: Posición final (excluida), por defecto la capacidad
+            inoculado_antes: Solo tubulares inoculados en esta marca de tiempo o antes
+            inoculado_despues: Solo tubulares inoculados en esta marca de tiempo o después
+            fecha_inoculacion: Si se indica, se registra como fecha de inoculación
+
+        Returns:
+            Número de tubulares que cambiaron de estado
+        """
+        if fin is None:
+            fin = self.__capacidad
+        codigo_nuevo = self.CODIGOS[nuevo_estado]
+        marca = fecha_inoculacion.timestamp() if fecha_inoculacion else None
+        filtrar_fecha = inoculado_antes is not None or inoculado_despues is not None
+        if self.__estados is None:
+            # Todo está vacío y sin fecha: solo puede aplicar un filtro "desde vacío"
+            if filtrar_fecha or codigo_nuevo == self.CODIGO_VACIO or estado not in (None, "vacío"):
+                return 0
+            self.__materializar()
+        estados = self.__estados
+        defectos = self.__defectos
+        fechas = self.__fechas
+
+        if estado is not None:
+            codigo_origen = self.CODIGOS[estado]
+            if codigo_origen == codigo_nuevo:
+                return 0
+            posiciones = self.__buscar(codigo_origen, inicio, fin)
+        else:
+            posiciones = range(inicio, fin)
+
+        # (segmento, código anterior) -> cantidad
+        cambios = {}
+        fechados = [] if marca is not None else None
+        for posicion in posiciones:
+            if defectos[posicion]:
+                continue
+            anterior = estados[posicion]
+            if anterior == codigo_nuevo:
+                continue
+            if filtrar_fecha:
+                fecha = fechas[posicion]
+                if not fecha:
+                    continue
+                if inoculado_antes is not None and fecha > inoculado_antes:
+                    continue
+                if inoculado_despues is not None and fecha < inoculado_despues:
+                    continue
+            estados[posicion] = codigo_nuevo
+            if marca is not None:
+                fechas[posicion] = marca
+                fechados.append(posicion)
+            clave = (posicion // self.__tam_segmento, anterior)
+            cambios[clave] = cambios.get(clave, 0) + 1
+
+        total = 0
+        for (segmento, anterior), cantidad in cambios.items():
+            self.__conteos[segmento][anterior] -= cantidad
+            self.__conteos[segmento][codigo_nuevo] += cantidad
+            self.__totales[anterior] -= cantidad
+            self.__totales[codigo_nuevo] += cantidad
+            for funcion in self.__observadores:
+                funcion(segmento, anterior, codigo_nuevo, cantidad)
+            total += cantidad
+        if fechados:
+            for funcion in self.__observadores_fechas:
+                funcion(fechados, marca)
+        return total
+
+    def __buscar(self, codigo: int, inicio: int, fin: int):
+        """Método privado que genera las posiciones con un código de estado."""
+        estados = self.__estados
+        posicion = estados.find(codigo, inicio, fin)
+        while posicion != -1:
+            yield posicion
+            posicion = estados.find(codigo, posicion + 1, fin)
+
+    def __categoria(self, indice: int) -> int:
+        """Método privado: código con el que se cuenta el tubular."""
+        if self.__defectos[indice]:
+            return self.CODIGO_DEFECTUOSO
+        return self.__estados[indice]
+
+    def __registrar_transicion(self, indice: int, anterior: int, nuevo: int) -> None:
+        """Método privado para actualizar los contadores tras un cambio."""
+        if anterior == nuevo:
+            return
+        segmento = indice // self.__tam_segmento
+        conteo = self.__conteos[segmento]
+        conteo[anterior] -= 1
+        conteo[nuevo] += 1
+        self.__totales[anterior] -= 1
+        self.__totales[nuevo] += 1
+        for funcion in self.__observadores:
+            funcion(segmento, anterior, nuevo, 1)
+
+    def set_fecha_inoculacion(self, indice: int, fecha) -> None:
+        """
+        Registra la fecha de inoculación del tubular.
+
+        Args:
+            indice: Posición del tubular en el almacén
+            fecha: datetime de inoculación o None para borrarla
+        """
+        if self.__fechas is None:
+            if not fecha:
+                return
+            self.__materializar()
+        marca = fecha.timestamp() if fecha else 0.0
+        self.__fechas[indice] = marca
+        for funcion in self.__observadores_fechas:
+            funcion([indice], marca)
+
+    def agregar_observacion(self, indice: int, texto: str, fecha: datetime = None) -> dict:
+        """
+        Agrega una observación al tubular en la posición indicada.
+
+        Args:
+            indice: Posición del tubular en el almacén
+            texto: Texto de la observación
+            fecha: Fecha de la observación (por defecto, la actual)
+
+        Returns:
+            La observación agregada {"fecha", "texto"}
+        """
+        if not 0 <= indice < self.__capacidad:
+            raise IndexError(f"Posición fuera del almacén: {indice}")
+        observacion = {"fecha": fecha or datetime.now(), "texto": texto}
+        if self.__observaciones is None:
+            self.__observaciones = {}
+        self.__observaciones.setdefault(indice, []).append(observacion)
+        for funcion in self.__observadores_observaciones:
+            funcion(indice, observacion)
+        return observacion
+
+    def get_observaciones(self, indice: int) -> list:
+        """Retorna una copia de las observaciones del tubular en la posición indicada."""
+        if not self.__observaciones:
+            return []
+        return [dict(observacion) for observacion in self.__observaciones.get(indice, ())]
+
+    def exportar_observaciones(self) -> list:
+        """
+        Retorna todas las observaciones del almacén.
+
+        Returns:
+            Lista de tuplas (posicion, fecha, texto) ordenada por posición
+        """
+        if not self.__observaciones:
+            return []
+        return [(indice, observacion["fecha"], observacion["texto"])
+                for indice in sorted(self.__observaciones)
+                for observacion in self.__observaciones[indice]]
+
+    def cargar_observaciones(self, observaciones) -> None:
+        """
+        Reemplaza las observaciones del almacén (sin notificar a los observadores).
+
+        Args:
+            observaciones: Iterable de tuplas (posicion, fecha, texto)
+        """
+        cargadas = {}
+        for indice, fecha, texto in observaciones:
+            if not 0 <= indice < self.__capacidad:
+                raise IndexError(f"Posición fuera del almacén: {indice}")
+            cargadas.setdefault(indice, []).append({"fecha": fecha, "texto": texto})
+        self.__observaciones = cargadas or None
+
+    def primera_inoculacion(self, estado: str, inicio: int = 0, fin: int = None):
+        """
+        Retorna la marca de inoculación más antigua entre los tubulares de un
+        rango que están en un estado (sin contar defectuosos ni sin fecha).
+
+        Args:
+            estado: Estado buscado
+            inicio: Primera posición del rango
+            fin: Posición final (excluida), por defecto la capacidad
+
+        Returns:
+            Marca de tiempo más antigua o None si no hay ninguno
+        """
+        if self.__estados is None:
+            return None
+        if fin is None:
+            fin = self.__capacidad
+        defectos = self.__defectos
+        fechas = self.__fechas
+        minima = None
+        for posicion in self.__buscar(self.CODIGOS[estado], inicio, fin):
+            marca = fechas[posicion]
+            if marca and not defectos[posicion] and (minima is None or marca < minima):
+                minima = marca
+        return minima
+
+    def listar_fechas_inoculacion(self) -> list:
+        """
+        Retorna las posiciones que tienen fecha de inoculación.
+
+        Returns:
+            Lista de tuplas (posicion, marca de tiempo)
+        """
+        if self.__fechas is None:
+            return []
+        return [(posicion, marca) for posicion, marca in enumerate(self.__fechas) if marca]
+
+    def contar_por_estado(self, segmento: int = None) -> dict:
+        """
+        Cuenta los tubulares por estado a partir de los contadores.
+
+        Un tubular con bandera de defecto cuenta como "defectuoso" aunque
+        luego se le haya asignado otro estado.
+
+        Args:
+            segmento: Segmento a contar, None para todo el almacén
+
+        Returns:
+            Diccionario con conteo por estado
+        """
+        conteo = self.__conteo(segmento)
+        if self._verificacion_activa:
+            self.verificar_consistencia()
+        return dict(zip(self.ESTADOS, conteo))
+
+    def contar_defectuosos(self, segmento: int = None) -> int:
+        """
+        Cuenta los tubulares defectuosos.
+
+        Args:
+            segmento: Segmento a contar, None para todo el almacén
+
+        Returns:
+            Número de tubulares defectuosos
+        """
+        if self._verificacion_activa:
+            self.verificar_consistencia()
+        conteo = self.__conteo(segmento)
+        return conteo[self.CODIGO_DEFECTUOSO]
+
+    def contar_ocupados(self, segmento: int = None) -> int:
+        """
+        Cuenta los tubulares que no están vacíos.
+
+        Args:
+            segmento: Segmento a contar, None para todo el almacén
+
+        Returns:
+            Número de tubulares ocupados
+        """
+        if self._verificacion_activa:
+            self.verificar_consistencia()
+        conteo = self.__conteo(segmento)
+        return sum(conteo) - conteo[self.CODIGO_VACIO]
+
+    def recontar_por_estado(self, inicio: int = 0, fin: int = None) -> dict:
+        """
+        Recuenta los tubulares por estado recorriendo los arreglos.
+
+        No usa los contadores; sirve para verificarlos.
+
+        Args:
+            inicio: Primera posición del rango
+            fin: Posición final (excluida), por defecto la capacidad
+
+        Returns:
+            Diccionario con conteo por estado
+        """
+        if fin is None:
+            fin = self.__capacidad
+        if self.__estados is None:
+            tamano = max(0, min(fin, self.__capacidad) - inicio)
+            return dict(zip(self.ESTADOS, [tamano] + [0] * (len(self.ESTADOS) - 1)))
+        return dict(zip(self.ESTADOS, self.__recontar(inicio, fin)))
+
+    def __recontar(self, inicio: int, fin: int) -> list:
+        """Método privado: reconteo de un rango como lista indexada por código."""
+        estados = self.__estados
+        conteo = [estados.count(codigo, inicio, fin) for codigo in range(len(self.ESTADOS))]
+
+        defectuosos = self.__defectos.count(1, inicio, fin)
+        if defectuosos != conteo[self.CODIGO_DEFECTUOSO]:
+            # Caso poco común: tubulares defectuosos a los que se les cambió el estado
+            defectos = self.__defectos
+            posicion = defectos.find(1, inicio, fin)
+            while posicion != -1:
+                codigo = estados[posicion]
+                if codigo != self.CODIGO_DEFECTUOSO:
+                    conteo[codigo] -= 1
+                posicion = defectos.find(1, posicion + 1, fin)
+            conteo[self.CODIGO_DEFECTUOSO] = defectuosos
+
+        return conteo
+
+    def verificar_consistencia(self) -> None:
+        """
+        Compara los contadores contra un reconteo completo de los arreglos.
+
+        Raises:
+            RuntimeError: Si algún contador no coincide con el reconteo
+        """
+        if self.__estados is None:
+            return
+        totales = self.recontar_por_estado()
+        if list(totales.values()) != self.__totales:
+            raise RuntimeError(f"Contadores inconsistentes en {self!r}: "
+                               f"{self.__totales} != {list(totales.values())}")
+        for segmento, conteo in enumerate(self.__conteos):
+            inicio = segmento * self.__tam_segmento
+            real = self.recontar_por_estado(inicio, inicio + self.__tam_segmento)
+            if list(real.values()) != conteo:
+                raise RuntimeError(f"Contadores inconsistentes en el segmento {segmento} "
+                                   f"de {self!r}: {conteo} != {list(real.values())}")
+
+    def exportar_columnas(self):
+        """
+        Retorna una copia de las tres columnas del almacén.
+
+        Returns:
+            Tupla (estados, defectos, fechas) con bytes, bytes y array('d'),
+            o None si el almacén aún no se ha materializado (todo vacío)
+        """
+        if self.__estados is None:
+            return None
+        return bytes(self.__estados), bytes(self.__defectos), array('d', self.__fechas)
+
+    def cargar_columnas(self, estados, defectos, fechas) -> None:
+        """
+        Reemplaza el contenido del almacén y recalcula los contadores.
+
+        Los observadores reciben la diferencia de conteos de cada segmento
+        como transiciones, así los totales que mantienen siguen siendo
+        correctos.
+
+        Args:
+            estados: Códigos de estado (bytes del largo de la capacidad)
+            defectos: Banderas de defecto (0/1) del mismo largo
+            fechas: Marcas de tiempo de inoculación (0.0 si no hay)
+        """
+        if not len(estados) == len(defectos) == len(fechas) == self.__capacidad:
+            raise ValueError(f"Las columnas deben tener {self.__capacidad} posiciones")
+        estados = bytearray(estados)
+        # Al borrar los códigos válidos no debe quedar nada
+        if estados.translate(None, bytes(range(len(self.ESTADOS)))):
+            raise ValueError("Código de estado inválido en las columnas")
+
+        anteriores = [list(self.__conteo(segmento)) for segmento in range(self.__numero_segmentos)]
+        self.__estados = estados
+        self.__defectos = bytearray(defectos)
+        self.__fechas = array('d', fechas)
+        tam = self.__tam_segmento
+        self.__conteos = [self.__recontar(segmento * tam, segmento * tam + tam)
+                          for segmento in range(self.__numero_segmentos)]
+        self.__totales = [sum(columna) for columna in zip(*self.__conteos)]
+        for segmento, (antes, despues) in enumerate(zip(anteriores, self.__conteos)):
+            self.__notificar_diferencias(segmento, antes, despues)
+        for funcion in self.__observadores_fechas:
+            funcion(None, None)
+
+    def __notificar_diferencias(self, segmento: int, antes: list, despues: list) -> None:
+        """Método privado: expresa el cambio de contadores de un segmento como transiciones."""
+        if not self.__observadores or antes == despues:
+            return
+        sobrantes = [[codigo, antes[codigo] - despues[codigo]]
+                     for codigo in range(len(antes)) if antes[codigo] > despues[codigo]]
+        i = 0
+        for codigo in range(len(antes)):
+            faltan = despues[codigo] - antes[codigo]
+            while faltan > 0:
+                origen = sobrantes[i]
+                movidos = min(faltan, origen[1])
+                for funcion in self.__observadores:
+                    funcion(segmento, origen[0], codigo, movidos)
+                origen[1] -= movidos
+                faltan -= movidos
+                if origen[1] == 0:
+                    i += 1
+
+    def __len__(self) -> int:
+        """Retorna la capacidad del almacén."""
+        return self.__capacidad
+
+    def __repr__(self) -> str:
+        """Representación técnica del almacén."""
+        return f"AlmacenTubulares(capacidad={self.__capacidad})"
@@ -0,0 +1,269 @@
+"""
+Clase AsignadorIds - Asigna IDs únicos a las entidades del dominio
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import threading
+import weakref
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class AsignadorIds:
+    """
+    Clase que reparte IDs por bloques.
+
+    Cada hilo reserva un bloque de IDs consecutivos y los va entregando sin
+    bloquear a los demás; solo se toma el candado al reservar un bloque
+    nuevo. Si se indica un archivo, la marca más alta reservada de cada
+    secuencia se guarda allí (con bloqueo de archivo), de modo que varios
+    procesos que usen el mismo archivo nunca repiten IDs y los IDs
+    continúan entre ejecuciones.
+
+    Sin archivo, las marcas se guardan en memoria compartida con los
+    procesos hijos creados con fork (por ejemplo, los de un
+    ProcessPoolExecutor en Linux), así el padre y los hijos reservan
+    bloques distintos. Los procesos iniciados con spawn no heredan esa
+    memoria: para ellos hay que usar un archivo.
+
+    Demuestra:
+    - Encapsulación: El estado de los bloques es privado
+    """
+
+    # Bytes del mapa compartido (largo del JSON + JSON de marcas)
+    TAM_COMPARTIDO = 65536
+    __LARGO = struct.Struct("<I")
+
+    def __init__(self, tam_bloque: int = 1000, ruta: str = None):
+        """
+        Constructor de AsignadorIds.
+
+        Args:
+            tam_bloque: Número de IDs por bloque
+            ruta: Archivo donde persistir las marcas (None para solo memoria)
+        """
+        if tam_bloque < 1:
+            raise ValueError("El tamaño de bloque debe ser mayor a 0")
+        self.__tam_bloque = tam_bloque
+        self.__ruta = ruta
+        self.__candado = threading.Lock()
+        self.__local = threading.local()
+        self.__marcas = {}
+        self.__compartidas = None
+        if ruta is None and hasattr(os, "fork"):
+            # Marcas visibles para los procesos hijos (mapa anónimo compartido)
+            self.__compartidas = mmap.mmap(-1, self.TAM_COMPARTIDO)
+            self.__candado_procesos = multiprocessing.Lock()
+        _asignadores.add(self)
+
+    def get_tam_bloque(self) -> int:
+        """Retorna el tamaño de bloque."""
+        return self.__tam_bloque
+
+    def get_ruta(self) -> str:
+        """Retorna la ruta del archivo de marcas (None si es solo memoria)."""
+        return self.__ruta
+
+    def siguiente(self, secuencia: str) -> int:
+        """
+        Entrega el siguiente ID de una secuencia.
+
+        Args:
+            secuencia: Nombre de la secuencia (ej: "tubular", "alerta")
+
+        Returns:
+            ID único dentro de la secuencia
+        """
+        bloques = getattr(self.__local, "bloques", None)
+        if bloques is None:
+            bloques = self.__local.bloques = {}
+        bloque = bloques.get(secuencia)
+        if bloque is None or bloque[0] > bloque[1]:
+            bloque = bloques[secuencia] = list(self.reservar_bloque(secuencia))
+        identificador = bloque[0]
+        bloque[0] += 1
+        return identificador
+
+    def reservar_bloque(self, secuencia: str, cantidad: int = None) -> tuple:
+        """
+        Reserva un rango de IDs consecutivos.
+
+        Args:
+            secuencia: Nombre de la secuencia
+            cantidad: Número de IDs (por defecto, el tamaño de bloque)
+
+        Returns:
+            Tupla (primero, ultimo) con el rango reservado (incluido)
+        """
+        cantidad = cantidad or self.__tam_bloque
+        with self.__candado:
+            if self.__compartidas is not None:
+                marca = self.__reservar_compartida(secuencia, cantidad)
+            elif self.__ruta is None:
+                marca = self.__marcas.get(secuencia, 0)
+                self.__marcas[secuencia] = marca + cantidad
+            else:
+                marca = self.__reservar_en_archivo(secuencia, cantidad)
+        return marca + 1, marca + cantidad
+
+    def avanzar(self, secuencia: str, minimo: int) -> None:
+        """
+        Asegura que los próximos bloques de una secuencia empiecen después de 'minimo'.
+
+        Se usa al cargar entidades guardadas para no repetir sus IDs. Los
+        bloques ya reservados por otros hilos no se modifican, así que
+        conviene llamarlo antes de crear entidades nuevas.
+
+        Args:
+            secuencia: Nombre de la secuencia
+            minimo: ID más alto ya usado
+        """
+        marca = self.get_marca_alta(secuencia)
+        if minimo > marca:
+            self.reservar_bloque(secuencia, minimo - marca)
+        bloques = getattr(self.__local, "bloques", None)
+        if bloques is not None and secuencia in bloques and bloques[secuencia][0] <= minimo:
+            del bloques[secuencia]
+
+    def get_marca_alta(self, secuencia: str) -> int:
+        """
+        Retorna el ID más alto reservado de una secuencia.
+
+        Args:
+            secuencia: Nombre de la secuencia
+        """
+        with self.__candado:
+            if self.__compartidas is not None:
+                with self.__candado_procesos:
+                    return self.__leer_compartidas().get(secuencia, 0)
+            if self.__ruta is None:
+                return self.__marcas.get(secuencia, 0)
+            with open(self.__ruta, "a+", encoding="utf-8") as archivo:
+                self.__bloquear(archivo)
+                try:
+                    return self.__leer_marcas(archivo).get(secuencia, 0)
+                finally:
+                    self.__desbloquear(archivo)
+
+    def __leer_compartidas(self) -> dict:
+        """Método privado que lee las marcas del mapa compartido."""
+        largo, = self.__LARGO.unpack_from(self.__compartidas, 0)
+        inicio = self.__LARGO.size
+        return json.loads(self.__compartidas[inicio:inicio + largo]) if largo else {}
+
+    def __reservar_compartida(self, secuencia: str, cantidad: int) -> int:
+        """Método privado: lee, aumenta y guarda la marca en el mapa compartido."""
+        with self.__candado_procesos:
+            marcas = self.__leer_compartidas()
+            marca = marcas.get(secuencia, 0)
+            marcas[secuencia] = marca + cantidad
+            contenido = json.dumps(marcas).encode("utf-8")
+            if self.__LARGO.size + len(contenido) > self.TAM_COMPARTIDO:
+                raise RuntimeError("Demasiadas secuencias para la memoria compartida del asignador")
+            self.__compartidas[self.__LARGO.size:self.__LARGO.size + len(contenido)] = contenido
+            self.__LARGO.pack_into(self.__compartidas, 0, len(contenido))
+        return marca
+
+    def __reservar_en_archivo(self, secuencia: str, cantidad: int) -> int:
+        """Método privado: lee, aumenta y guarda la marca de una secuencia."""
+        with open(self.__ruta, "a+", encoding="utf-8") as archivo:
+            self.__bloquear(archivo)
+            try:
+                marcas = self.__leer_marcas(archivo)
+                marca = marcas.get(secuencia, 0)
+                marcas[secuencia] = marca + cantidad
+                archivo.seek(0)
+                archivo.truncate()
+                json.dump(marcas, archivo)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            finally:
+                self.__desbloquear(archivo)
+        return marca
+
+    @staticmethod
+    def __leer_marcas(archivo) -> dict:
+        """Método privado que lee el JSON de marcas del archivo abierto."""
+        archivo.seek(0)
+        contenido = archivo.read()
+        return json.loads(contenido) if contenido.strip() else {}
+
+    @staticmethod
+    def __bloquear(archivo) -> None:
+        """Método privado: bloqueo exclusivo del archivo entre procesos."""
+        if fcntl is not None:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+        else:
+            archivo.seek(0)
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+
+    @staticmethod
+    def __desbloquear(archivo) -> None:
+        """Método privado que libera el bloqueo del archivo."""
+        if fcntl is not None:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+        else:
+            archivo.seek(0)
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _reiniciar_en_hijo(self) -> None:
+        """Descarta bloques y candado heredados tras un fork (ver _reiniciar_asignadores)."""
+        self.__candado = threading.Lock()
+        self.__local = threading.local()
+
+    def __repr__(self) -> str:
+        """Representación técnica del asignador."""
+        return f"AsignadorIds(tam_bloque={self.__tam_bloque}, ruta={self.__ruta!r})"
+
+
+# Asignadores vivos; el hook de fork se registra una sola vez para todos
+_asignadores = weakref.WeakSet()
+
+
+def _reiniciar_asignadores() -> None:
+    """En el proceso hijo, los bloques heredados del padre no son válidos."""
+    for asignador in list(_asignadores):
+        asignador._reiniciar_en_hijo()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reiniciar_asignadores)
+
+# Asignador usado por las clases del dominio (solo memoria por defecto)
+_asignador = AsignadorIds()
+
+
+def configurar_asignador(asignador: AsignadorIds) -> None:
+    """
+    Reemplaza el asignador usado por las clases del dominio.
+
+    Los procesos hijos creados con fork comparten las marcas de un asignador
+    en memoria; para procesos independientes (o iniciados con spawn), todos
+    deben usar un AsignadorIds con el mismo archivo.
+
+    Args:
+        asignador: Nuevo asignador
+    """
+    global _asignador
+    _asignador = asignador
+
+
+def get_asignador() -> AsignadorIds:
+    """Retorna el asignador usado por las clases del dominio."""
+    return _asignador
+
+
+def siguiente_id(secuencia: str) -> int:
+    """Entrega el siguiente ID de una secuencia con el asignador actual."""
+    return _asignador.siguiente(secuencia)
@@ -0,0 +1,315 @@
+"""
+Clases SketchCuantiles y EstadisticasResolucion - Tiempos de resolución de alertas
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import math
+from clases import eventos
+
+
+class SketchCuantiles:
+    """
+    Clase que resume una distribución de valores positivos en cubetas
+    logarítmicas para estimar cuantiles con error relativo acotado.
+
+    Cada valor cae en la cubeta ceil(log(valor) / log(gamma)), con
+    gamma = (1 + precision) / (1 - precision); el cuantil estimado está a
+    menos de 'precision' (relativo) del real. Agregar y quitar un valor es
+    O(1), la memoria depende del rango de valores y no de cuántos son, y
+    dos sketches con la misma precisión se combinan sumando sus cubetas.
+
+    Demuestra:
+    - Encapsulación: Las cubetas son privadas
+    """
+
+    # Valores menores se cuentan como cero
+    MINIMO = 1e-9
+
+    def __init__(self, precision: float = 0.01):
+        """
+        Constructor de SketchCuantiles.
+
+        Args:
+            precision: Error relativo máximo de los cuantiles (entre 0 y 1)
+        """
+        if not 0 < precision < 1:
+            raise ValueError("La precisión debe estar entre 0 y 1")
+        self.__precision = precision
+        self.__log_gamma = math.log((1 + precision) / (1 - precision))
+        self.__cubetas = {}
+        self.__ceros = 0
+        self.__cantidad = 0
+        self.__suma = 0.0
+
+    def get_precision(self) -> float:
+        """Retorna el error relativo máximo."""
+        return self.__precision
+
+    def __indice(self, valor: float) -> int:
+        """Método privado: cubeta de un valor positivo."""
+        return math.ceil(math.log(valor) / self.__log_gamma)
+
+    def agregar(self, valor: float, cantidad: int = 1) -> None:
+        """
+        Agrega un valor (o varias veces el mismo).
+
+        Args:
+            valor: Valor no negativo
+            cantidad: Veces que se agrega
+        """
+        if valor < 0:
+            raise ValueError("El sketch solo acepta valores no negativos")
+        if valor < self.MINIMO:
+            self.__ceros += cantidad
+        else:
+            indice = self.__indice(valor)
+            self.__cubetas[indice] = self.__cubetas.get(indice, 0) + cantidad
+        self.__cantidad += cantidad
+        self.__suma += valor * cantidad
+
+    def quitar(self, valor: float, cantidad: int = 1) -> None:
+        """
+        Quita un valor agregado antes.
+
+        Args:
+            valor: Valor que se había agregado
+            cantidad: Veces que se quita
+        """
+        if valor < self.MINIMO:
+            if self.__ceros < cantidad:
+                raise ValueError("El valor no está en el sketch")
+            self.__ceros -= cantidad
+        else:
+            indice = self.__indice(valor)
+            restante = self.__cubetas.get(indice, 0) - cantidad
+            if restante < 0:
+                raise ValueError("El valor no está en el sketch")
+            if restante:
+                self.__cubetas[indice] = restante
+            else:
+                del self.__cubetas[indice]
+        self.__cantidad -= cantidad
+        self.__suma -= valor * cantidad
+
+    def combinar(self, otro: "SketchCuantiles") -> None:
+        """
+        Suma a este sketch los valores de otro con la misma precisión.
+
+        Args:
+            otro: Instancia de SketchCuantiles
+        """
+        if otro.get_precision() != self.__precision:
+            raise ValueError("Solo se combinan sketches con la misma precisión")
+        ceros, cubetas, cantidad, suma = otro.__estado()
+        for indice, conteo in cubetas.items():
+            self.__cubetas[indice] = self.__cubetas.get(indice, 0) + conteo
+        self.__ceros += ceros
+        self.__cantidad += cantidad
+        self.__suma += suma
+
+    def __estado(self) -> tuple:
+        """Método privado: contenido del sketch para combinarlo."""
+        return self.__ceros, self.__cubetas, self.__cantidad, self.__suma
+
+    def contar(self) -> int:
+        """Retorna cuántos valores hay en el sketch."""
+        return self.__cantidad
+
+    def calcular_media(self) -> float:
+        """Retorna la media exacta de los valores (0.0 si no hay)."""
+        return self.__suma / self.__cantidad if self.__cantidad else 0.0
+
+    def calcular_cuantil(self, q: float) -> float:
+        """
+        Estima un cuantil.
+
+        Args:
+            q: Cuantil entre 0 y 1 (0.5 es la mediana)
+
+        Returns:
+            Valor estimado (0.0 si el sketch está vacío)
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("El cuantil debe estar entre 0 y 1")
+        if not self.__cantidad:
+            return 0.0
+        rango = q * (self.__cantidad - 1)
+        acumulado = self.__ceros
+        if rango < acumulado:
+            return 0.0
+        for indice in sorted(self.__cubetas):
+            acumulado += self.__cubetas[indice]
+            if rango < acumulado:
+                # Punto de la cubeta con el mismo error relativo a ambos extremos
+                gamma = math.exp(self.__log_gamma)
+                return 2 * math.exp(indice * self.__log_gamma) / (gamma + 1)
+        return 0.0
+
+    def __len__(self) -> int:
+        """Retorna cuántos valores hay en el sketch."""
+        return self.__cantidad
+
+    def __repr__(self) -> str:
+        """Representación técnica del sketch."""
+        return (f"SketchCuantiles(precision={self.__precision}, cantidad={self.__cantidad}, "
+                f"cubetas={len(self.__cubetas)})")
+
+
+class EstadisticasResolucion:
+    """
+    Clase que mantiene, al vuelo, estadísticas del tiempo de resolución de
+    las alertas: total, por tipo y por estantería.
+
+    Escucha ALERTA_RESUELTA y ALERTA_REABIERTA en el bus de eventos: al
+    resolverse una alerta su tiempo se agrega a tres sketches (total, su
+    tipo y su estantería) y al reabrirse se quita, ambas cosas en O(1). Los
+    resúmenes (cantidad, media y percentiles 50/90/99 en horas) se leen sin
+    recorrer el historial de alertas.
+
+    Demuestra:
+    - Composición: Contiene objetos SketchCuantiles
+    - Encapsulación: Los sketches son privados
+    """
+
+    PERCENTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, alertas=None, precision: float = 0.01):
+        """
+        Constructor de EstadisticasResolucion.
+
+        Args:
+            alertas: Historial inicial (se cuentan las alertas ya resueltas)
+            precision: Error relativo de los percentiles
+        """
+        self.__precision = precision
+        self.__total = SketchCuantiles(precision)
+        self.__por_tipo = {}
+        self.__por_estanteria = {}
+        # id de alerta -> (horas, tipo, código) de la resolución contada
+        self.__contadas = {}
+        eventos.bus_eventos.suscribir(self.__alerta_resuelta, eventos.ALERTA_RESUELTA)
+        eventos.bus_eventos.suscribir(self.__alerta_reabierta, eventos.ALERTA_REABIERTA)
+        for alerta in alertas or ():
+            if alerta.esta_resuelta():
+                self.registrar_resolucion(alerta)
+
+    def cerrar(self) -> None:
+        """Deja de escuchar los eventos de alertas."""
+        eventos.bus_eventos.desuscribir(self.__alerta_resuelta, eventos.ALERTA_RESUELTA)
+        eventos.bus_eventos.desuscribir(self.__alerta_reabierta, eventos.ALERTA_REABIERTA)
+
+    def __alerta_resuelta(self, evento) -> None:
+        """Método privado que cuenta las alertas resueltas."""
+        alerta = evento.get_datos().get("alerta")
+        if alerta is not None and alerta.esta_resuelta():
+            self.registrar_resolucion(alerta)
+
+    def __alerta_reabierta(self, evento) -> None:
+        """Método privado que descuenta las alertas reabiertas."""
+        alerta = evento.get_datos().get("alerta")
+        if alerta is not None:
+            self.descontar_resolucion(alerta)
+
+    def registrar_resolucion(self, alerta) -> bool:
+        """
+        Cuenta el tiempo de resolución de una alerta resuelta.
+
+        Args:
+            alerta: Instancia de Alerta resuelta
+
+        Returns:
+            True si se contó (False si ya estaba contada o no está resuelta)
+        """
+        id_alerta = alerta.get_id()
+        if id_alerta in self.__contadas or not alerta.esta_resuelta():
+            return False
+        horas = max(0.0, (alerta.get_fecha_resolucion() - alerta.get_fecha_creacion())
+                    .total_seconds() / 3600)
+        estanteria = alerta.get_estanteria()
+        codigo = estanteria.get_codigo() if estanteria is not None else None
+        tipo = alerta.get_tipo()
+        for sketch in self.__sketches(tipo, codigo, crear=True):
+            sketch.agregar(horas)
+        self.__contadas[id_alerta] = (horas, tipo, codigo)
+        return True
+
+    def descontar_resolucion(self, alerta) -> bool:
+        """
+        Quita de las estadísticas el tiempo de una alerta que se reabrió.
+
+        Returns:
+            True si estaba contada
+        """
+        contada = self.__contadas.pop(alerta.get_id(), None)
+        if contada is None:
+            return False
+        horas, tipo, codigo = contada
+        for sketch in self.__sketches(tipo, codigo):
+            sketch.quitar(horas)
+        return True
+
+    def __sketches(self, tipo: str, codigo, crear: bool = False) -> list:
+        """Método privado: sketches total, del tipo y de la estantería."""
+        if crear:
+            if tipo not in self.__por_tipo:
+                self.__por_tipo[tipo] = SketchCuantiles(self.__precision)
+            if codigo not in self.__por_estanteria:
+                self.__por_estanteria[codigo] = SketchCuantiles(self.__precision)
+        return [self.__total, self.__por_tipo[tipo], self.__por_estanteria[codigo]]
+
+    # Consultas
+
+    def get_sketch(self, tipo: str = None, codigo: str = None) -> SketchCuantiles:
+        """
+        Retorna el sketch total, el de un tipo o el de una estantería.
+
+        Args:
+            tipo: Tipo de alerta (opcional)
+            codigo: Código de la estantería (opcional; no se combina con tipo)
+
+        Returns:
+            Instancia de SketchCuantiles (vacía si no hay datos)
+        """
+        if tipo is not None:
+            return self.__por_tipo.get(tipo) or SketchCuantiles(self.__precision)
+        if codigo is not None:
+            return self.__por_estanteria.get(codigo) or SketchCuantiles(self.__precision)
+        return self.__total
+
+    @classmethod
+    def resumir(cls, sketch: SketchCuantiles) -> dict:
+        """
+        Resume un sketch en horas.
+
+        Returns:
+            Diccionario con cantidad, media_horas, p50, p90 y p99
+        """
+        resumen = {"cantidad": sketch.contar(),
+                   "media_horas": round(sketch.calcular_media(), 2)}
+        for q in cls.PERCENTILES:
+            resumen[f"p{round(q * 100)}"] = round(sketch.calcular_cuantil(q), 2)
+        return resumen
+
+    def obtener_resumen(self, tipo: str = None, codigo: str = None) -> dict:
+        """Resumen total, de un tipo o de una estantería (ver get_sketch)."""
+        return self.resumir(self.get_sketch(tipo, codigo))
+
+    def obtener_resumen_por_tipo(self) -> dict:
+        """Retorna {tipo: resumen} de los tipos con alertas resueltas."""
+        return {tipo: self.resumir(sketch) for tipo, sketch in self.__por_tipo.items() if sketch.contar()}
+
+    def obtener_resumen_por_estanteria(self) -> dict:
+        """Retorna {código: resumen} de las estanterías con alertas resueltas."""
+        return {codigo: self.resumir(sketch) for codigo, sketch in self.__por_estanteria.items()
+                if sketch.contar()}
+
+    def __len__(self) -> int:
+        """Retorna el número de resoluciones contadas."""
+        return len(self.__contadas)
+
+    def __repr__(self) -> str:
+        """Representación técnica de las estadísticas."""
+        return (f"EstadisticasResolucion(resueltas={len(self.__contadas)}, "
+                f"tipos={len(self.__por_tipo)}, estanterias={len(self.__por_estanteria)})")
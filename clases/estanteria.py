@@ -7,7 +7,71 @@ Fecha: Noviembre 2024
 """
 
 from clases.piso import Piso
+from clases.almacen_tubulares import AlmacenTubulares
+from clases.indice_inoculacion import IndiceInoculacion
 from datetime import datetime
+from itertools import islice
+from clases import eventos
+
+
+class ObservadorEstanteria:
+    """
+    Clase base para objetos que siguen los cambios de una estantería.
+
+    Las subclases sobrescriben solo los métodos que les interesan.
+
+    Demuestra:
+    - Polimorfismo: Cada observador reacciona a su manera
+    """
+
+    def tubulares_cambiados(self, estanteria, numero_piso: int, anterior: str,
+                            nuevo: str, cantidad: int) -> None:
+        """
+        Se llama cuando 'cantidad' tubulares de un piso pasan de un estado a otro.
+
+        Args:
+            estanteria: Estantería donde ocurrió el cambio
+            numero_piso: Número del piso (1-4)
+            anterior: Estado con el que se contaban los tubulares
+            nuevo: Estado con el que se cuentan ahora
+            cantidad: Número de tubulares que cambiaron
+        """
+        pass
+
+    def fase_cambiada(self, estanteria, fase_anterior: str, fase_nueva: str) -> None:
+        """Se llama cuando la estantería cambia de fase."""
+        pass
+
+    def fechas_cambiadas(self, estanteria, posiciones: list, marca: float) -> None:
+        """
+        Se llama cuando cambian fechas de inoculación de la estantería.
+
+        Args:
+            estanteria: Estantería donde ocurrió el cambio
+            posiciones: Posiciones (0-319) que quedaron con la marca, o None
+                        si se reemplazaron todos los tubulares
+            marca: Marca de tiempo nueva (0.0 si se borró la fecha)
+        """
+        pass
+
+    def observacion_agregada(self, estanteria, posicion: int, observacion: dict) -> None:
+        """
+        Se llama cuando se agrega una observación a un tubular.
+
+        Args:
+            estanteria: Estantería donde ocurrió el cambio
+            posicion: Posición (0-319) del tubular
+            observacion: Diccionario {"fecha", "texto"}
+        """
+        pass
+
+    def estanteria_activada(self, estanteria) -> None:
+        """Se llama cuando la estantería inicia producción."""
+        pass
+
+    def revision_registrada(self, estanteria) -> None:
+        """Se llama cuando se registra una revisión de la estantería."""
+        pass
 
 
 class Estanteria:
@@ -18,12 +82,24 @@ class Estanteria:
     Demuestra:
     - Encapsulación: Atributos privados
     - Composición: Contiene objetos Piso
+
+    Los 4 pisos comparten un único AlmacenTubulares de 320 posiciones
+    (un segmento por piso) cuyos contadores se actualizan en cada cambio
+    de estado, así los conteos de la estantería son de tiempo constante.
+    Los objetos Piso se crean en el primer acceso; mientras tanto sus
+    conteos salen directamente del almacén.
+
+    Cada cambio (de tubulares, fechas, fase, ubicación o revisión) sube
+    un número de versión. El resumen, el estado general y las estadísticas
+    detalladas se guardan junto con la versión con que se calcularon y se
+    reutilizan mientras la versión no cambie.
     """
     
    
     NUMERO_PISOS = 4
     TUBULARES_POR_PISO = 80
     TUBULARES_TOTALES = NUMERO_PISOS * TUBULARES_POR_PISO
+    FASES = ["preparación", "germinación", "fructificación", "cosecha"]
     
     def __init__(self, codigo: str):
         """
@@ -34,21 +110,123 @@ class Estanteria:
         """
         self.__codigo = codigo
        
-        self.__pisos = [Piso(i + 1) for i in range(self.NUMERO_PISOS)]
+        self.__almacen = AlmacenTubulares(self.TUBULARES_TOTALES, self.TUBULARES_POR_PISO)
+        # Pisos ya creados (None hasta el primer acceso)
+        self.__pisos = [None] * self.NUMERO_PISOS
         self.__fase = "preparación"  
         self.__fecha_inicio = None
         self.__fecha_ultima_revision = None
         self.__ubicacion = "Almacén principal"
         self.__activa = False
+        self.__observadores = []
+        # Índice por fecha de inoculación (se construye en el primer uso)
+        self.__indice_inoculacion = None
+        self.__version = 0
+        # nombre -> (clave con la versión, resultado)
+        self.__memoria = {}
+        self.__almacen.agregar_observador(self.__notificar_tubulares)
+        self.__almacen.agregar_observador_fechas(self.__notificar_fechas)
+        self.__almacen.agregar_observador_observaciones(self.__notificar_observacion)
+    
+    @classmethod
+    def restaurar(cls, codigo: str, fase: str = "preparación", activa: bool = False,
+                  ubicacion: str = "Almacén principal", fecha_inicio=None,
+                  fecha_ultima_revision=None):
+        """
+        Reconstruye una estantería guardada, sin publicar eventos.
+        
+        Args:
+            codigo: Código de la estantería
+            fase: Fase de producción
+            activa: Si la estantería está activa
+            ubicacion: Ubicación de la estantería
+            fecha_inicio: Fecha de inicio de producción (datetime o None)
+            fecha_ultima_revision: Fecha de la última revisión (datetime o None)
+            
+        Returns:
+            Instancia de Estanteria (con todos los tubulares vacíos)
+        """
+        if fase not in cls.FASES:
+            raise ValueError(f"Fase inválida. Debe ser: {', '.join(cls.FASES)}")
+        estanteria = cls(codigo)
+        estanteria.__fase = fase
+        estanteria.__activa = activa
+        estanteria.__ubicacion = ubicacion
+        estanteria.__fecha_inicio = fecha_inicio
+        estanteria.__fecha_ultima_revision = fecha_ultima_revision
+        return estanteria
+    
+    def agregar_observador(self, observador: ObservadorEstanteria) -> None:
+        """
+        Registra un observador de los cambios de la estantería.
+        
+        Args:
+            observador: Instancia de ObservadorEstanteria
+        """
+        if observador not in self.__observadores:
+            self.__observadores.append(observador)
+    
+    def quitar_observador(self, observador: ObservadorEstanteria) -> None:
+        """Quita un observador registrado."""
+        if observador in self.__observadores:
+            self.__observadores.remove(observador)
+    
+    def __notificar_tubulares(self, segmento: int, anterior: int, nuevo: int, cantidad: int) -> None:
+        """Método privado que propaga los cambios del almacén a los observadores."""
+        self.__version += 1
+        if self.__observadores:
+            estados = AlmacenTubulares.ESTADOS
+            for observador in self.__observadores:
+                observador.tubulares_cambiados(self, segmento + 1, estados[anterior],
+                                               estados[nuevo], cantidad)
     
 
+    def __notificar_fechas(self, posiciones: list, marca: float) -> None:
+        """Método privado que mantiene el índice de inoculación y avisa a los observadores."""
+        self.__version += 1
+        indice = self.__indice_inoculacion
+        if indice is not None:
+            if posiciones is None:
+                self.__indice_inoculacion = None
+            elif marca:
+                indice.agregar_varios(posiciones, marca)
+            else:
+                indice.quitar_varios(posiciones)
+        for observador in self.__observadores:
+            observador.fechas_cambiadas(self, posiciones, marca)
+    
+    def __notificar_observacion(self, posicion: int, observacion: dict) -> None:
+        """Método privado que avisa a los observadores de una observación nueva."""
+        for observador in self.__observadores:
+            observador.observacion_agregada(self, posicion, observacion)
+    
+    def get_version(self) -> int:
+        """Retorna la versión de la estantería (sube con cada cambio)."""
+        return self.__version
+    
+    def __memorizar(self, nombre: str, clave, calcular):
+        """
+        Método privado: reutiliza un resultado mientras su clave no cambie.
+        
+        Args:
+            nombre: Nombre del resultado
+            clave: Versión (y lo demás de lo que dependa el resultado)
+            calcular: Función sin argumentos que calcula el resultado
+        """
+        guardado = self.__memoria.get(nombre)
+        if guardado is not None and guardado[0] == clave:
+            return guardado[1]
+        resultado = calcular()
+        self.__memoria[nombre] = (clave, resultado)
+        return resultado
+    
     def get_codigo(self) -> str:
         """Retorna el código de la estantería."""
         return self.__codigo
     
     def get_pisos(self) -> list:
         """Retorna la lista de pisos (copia)."""
-        return self.__pisos.copy()
+        return [self.get_piso(numero) for numero in range(1, self.NUMERO_PISOS + 1)]
     
     def get_fase(self) -> str:
         """Retorna la fase actual de la estantería."""
@@ -81,7 +259,11 @@ class Estanteria:
             Instancia de Piso o None si no existe
         """
         if 1 <= numero <= self.NUMERO_PISOS:
-            return self.__pisos[numero - 1]
+            piso = self.__pisos[numero - 1]
+            if piso is None:
+                piso = Piso(numero, self.__almacen, numero - 1)
+                self.__pisos[numero - 1] = piso
+            return piso
         return None
     
    
@@ -93,18 +275,30 @@ class Estanteria:
             nueva_ubicacion: Nueva ubicación
         """
         self.__ubicacion = nueva_ubicacion
-        print(f"✓ Estantería {self.__codigo} movida a: {nueva_ubicacion}")
+        self.__version += 1
+        eventos.publicar(eventos.ESTANTERIA_UBICACION,
+                         f"✓ Estantería {self.__codigo} movida a: {nueva_ubicacion}",
+                         codigo=self.__codigo, ubicacion=nueva_ubicacion)
     
  
     def iniciar_produccion(self) -> None:
         """Inicia la producción en la estantería."""
         if not self.__activa:
+            fase_anterior = self.__fase
             self.__activa = True
             self.__fecha_inicio = datetime.now()
             self.__fase = "germinación"
-            print(f"✓ Estantería {self.__codigo} iniciada en fase: {self.__fase}")
+            self.__version += 1
+            for observador in self.__observadores:
+                observador.estanteria_activada(self)
+                observador.fase_cambiada(self, fase_anterior, self.__fase)
+            eventos.publicar(eventos.ESTANTERIA_INICIADA,
+                             f"✓ Estantería {self.__codigo} iniciada en fase: {self.__fase}",
+                             codigo=self.__codigo, fase=self.__fase)
         else:
-            print(f"ℹ️ Estantería {self.__codigo} ya está activa")
+            eventos.publicar(eventos.ESTANTERIA_INICIADA,
+                             f"ℹ️ Estantería {self.__codigo} ya está activa", "aviso",
+                             codigo=self.__codigo, fase=self.__fase)
     
     def cambiar_fase(self, nueva_fase: str) -> None:
         """
@@ -113,18 +307,53 @@ class Estanteria:
         Args:
             nueva_fase: Nueva fase ('germinación', 'fructificación', 'cosecha')
         """
-        fases_validas = ["preparación", "germinación", "fructificación", "cosecha"]
+        fases_validas = self.FASES
         
         if nueva_fase in fases_validas:
+            fase_anterior = self.__fase
             self.__fase = nueva_fase
-            print(f"✓ Estantería {self.__codigo} cambió a fase: {nueva_fase}")
+            self.__version += 1
+            for observador in self.__observadores:
+                observador.fase_cambiada(self, fase_anterior, nueva_fase)
+            eventos.publicar(eventos.ESTANTERIA_FASE,
+                             f"✓ Estantería {self.__codigo} cambió a fase: {nueva_fase}",
+                             codigo=self.__codigo, fase_anterior=fase_anterior, fase=nueva_fase)
         else:
             raise ValueError(f"Fase inválida. Debe ser: {', '.join(fases_validas)}")
     
     def registrar_revision(self) -> None:
         """Registra una revisión de la estantería."""
         self.__fecha_ultima_revision = datetime.now()
-        print(f"✓ Revisión registrada para estantería {self.__codigo}")
+        self.__version += 1
+        for observador in self.__observadores:
+            observador.revision_registrada(self)
+        eventos.publicar(eventos.ESTANTERIA_REVISION,
+                         f"✓ Revisión registrada para estantería {self.__codigo}",
+                         codigo=self.__codigo)
+    
+    def transicionar_tubulares(self, nuevo_estado: str, estado: str = None,
+                               dias_minimos: float = None, dias_maximos: float = None,
+                               piso_desde: int = 1, piso_hasta: int = NUMERO_PISOS) -> int:
+        """
+        Cambia de estado, de forma masiva, los tubulares que cumplan el filtro.
+        
+        Ejemplo: transicionar_tubulares("en_desarrollo", "inoculado", dias_minimos=14)
+        
+        Args:
+            nuevo_estado: Estado destino
+            estado: Estado de origen requerido (None para cualquiera)
+            dias_minimos: Solo tubulares inoculados hace al menos estos días
+            dias_maximos: Solo tubulares inoculados hace como mucho estos días
+            piso_desde: Primer piso incluido (1-4)
+            piso_hasta: Último piso incluido (1-4)
+            
+        Returns:
+            Número de tubulares que cambiaron de estado
+        """
+        cambiados = 0
+        for numero in range(max(piso_desde, 1), min(piso_hasta, self.NUMERO_PISOS) + 1):
+            cambiados += self.get_piso(numero).transicionar_tubulares(nuevo_estado, estado, dias_minimos, dias_maximos)
+        return cambiados
     
     def contar_tubulares_total(self) -> int:
         """
@@ -142,21 +371,16 @@ class Estanteria:
         Returns:
             Diccionario con conteo por estado
         """
-        conteo_total = {
-            "vacío": 0,
-            "inoculado": 0,
-            "en_desarrollo": 0,
-            "producción": 0,
-            "cosechado": 0,
-            "defectuoso": 0
-        }
-        
-        for piso in self.__pisos:
-            conteo_piso = piso.contar_tubulares_por_estado()
-            for estado, cantidad in conteo_piso.items():
-                conteo_total[estado] += cantidad
+        return self.__almacen.contar_por_estado()
+    
+    def contar_tubulares_por_piso(self) -> list:
+        """
+        Cuenta los tubulares por estado de cada piso, sin crear los objetos Piso.
         
-        return conteo_total
+        Returns:
+            Lista con el conteo por estado de cada piso (el piso 1 primero)
+        """
+        return [self.__almacen.contar_por_estado(segmento) for segmento in range(self.NUMERO_PISOS)]
     
     def contar_defectuosos_total(self) -> int:
         """
@@ -165,7 +389,125 @@ class Estanteria:
         Returns:
             Número total de defectuosos
         """
-        return sum(piso.contar_tubulares_defectuosos() for piso in self.__pisos)
+        return self.__almacen.contar_defectuosos()
+    
+    def exportar_tubulares(self):
+        """
+        Retorna una copia del estado de los 320 tubulares en columnas.
+        
+        Returns:
+            Tupla (estados, defectos, fechas) o None si todos están vacíos
+            (ver AlmacenTubulares.exportar_columnas)
+        """
+        return self.__almacen.exportar_columnas()
+    
+    def cargar_tubulares(self, estados, defectos, fechas) -> None:
+        """
+        Reemplaza el estado de los 320 tubulares (ver AlmacenTubulares.cargar_columnas).
+        
+        Los observadores reciben los cambios de conteo por piso.
+        
+        Args:
+            estados: Códigos de estado por posición
+            defectos: Banderas de defecto por posición
+            fechas: Marcas de tiempo de inoculación por posición
+        """
+        self.__almacen.cargar_columnas(estados, defectos, fechas)
+        self.__version += 1
+    
+    def exportar_observaciones(self) -> list:
+        """
+        Retorna las observaciones de todos los tubulares.
+        
+        Returns:
+            Lista de tuplas (posicion, fecha, texto), con la posición 0-319
+        """
+        return self.__almacen.exportar_observaciones()
+    
+    def cargar_observaciones(self, observaciones) -> None:
+        """
+        Reemplaza las observaciones de los tubulares (al cargar una estantería guardada).
+        
+        Args:
+            observaciones: Iterable de tuplas (posicion, fecha, texto)
+        """
+        self.__almacen.cargar_observaciones(observaciones)
+    
+    def get_indice_inoculacion(self) -> IndiceInoculacion:
+        """
+        Retorna el índice de los tubulares por fecha de inoculación.
+        
+        Se construye en el primer uso y luego se mantiene con cada
+        inoculación. Las claves son posiciones (0-319) en la estantería.
+        """
+        if self.__indice_inoculacion is None:
+            indice = IndiceInoculacion()
+            indice.cargar(self.__almacen.listar_fechas_inoculacion())
+            self.__indice_inoculacion = indice
+        return self.__indice_inoculacion
+    
+    def listar_fechas_inoculacion(self) -> list:
+        """Retorna las tuplas (posicion, marca de tiempo) de los tubulares con fecha."""
+        return self.__almacen.listar_fechas_inoculacion()
+    
+    def get_tubular_en(self, posicion: int):
+        """
+        Obtiene un tubular por su posición en la estantería.
+        
+        Args:
+            posicion: Posición 0-319 (piso * 80 + número - 1)
+        """
+        piso = self.get_piso(posicion // self.TUBULARES_POR_PISO + 1)
+        return piso.get_tubular_por_numero(posicion % self.TUBULARES_POR_PISO + 1) if piso else None
+    
+    def buscar_tubulares_por_edad(self, dias_minimos: float = None, dias_maximos: float = None,
+                                  estado: str = None) -> list:
+        """
+        Busca los tubulares inoculados hace entre dias_minimos y dias_maximos.
+        
+        Usa el índice de inoculación: no recorre los 320 tubulares.
+        
+        Args:
+            dias_minimos: Inoculados hace al menos estos días
+            dias_maximos: Inoculados hace como mucho estos días
+            estado: Solo tubulares en este estado (None para cualquiera)
+            
+        Returns:
+            Lista de Tubular, del más antiguo al más reciente
+        """
+        desde, hasta = IndiceInoculacion.limites_por_edad(dias_minimos, dias_maximos)
+        return [self.get_tubular_en(posicion)
+                for posicion in self.__filtrar_estado(self.get_indice_inoculacion().rango(desde, hasta), estado)]
+    
+    def tubulares_mas_antiguos(self, cantidad: int, estado: str = None) -> list:
+        """
+        Retorna los tubulares inoculados hace más tiempo.
+        
+        Args:
+            cantidad: Número máximo de tubulares
+            estado: Solo tubulares en este estado (None para cualquiera)
+            
+        Returns:
+            Lista de Tubular, del más antiguo al más reciente
+        """
+        posiciones = self.__filtrar_estado(self.get_indice_inoculacion().rango(), estado)
+        return [self.get_tubular_en(posicion) for posicion in islice(posiciones, cantidad)]
+    
+    def __filtrar_estado(self, pares, estado: str):
+        """Método privado: posiciones de los pares (marca, posición) con el estado pedido."""
+        for _, posicion in pares:
+            if estado is None or self.__almacen.get_estado(posicion) == estado:
+                yield posicion
+    
+    def verificar_consistencia(self) -> None:
+        """
+        Verifica los contadores de la estantería y sus pisos contra un
+        reconteo completo.
+
+        Raises:
+            RuntimeError: Si los contadores no coinciden
+        """
+        self.__almacen.verificar_consistencia()
     
     def calcular_tiempo_produccion(self) -> float:
         """
@@ -202,6 +544,11 @@ class Estanteria:
         Returns:
             Diccionario con estado general
         """
+        clave = (self.__version, int(self.calcular_tiempo_produccion()))
+        return dict(self.__memorizar("estado_general", clave, self.__calcular_estado_general))
+    
+    def __calcular_estado_general(self) -> dict:
+        """Método privado que calcula el estado general (ver obtener_estado_general)."""
         return {
             "codigo": self.__codigo,
             "fase": self.__fase,
@@ -211,7 +558,8 @@ class Estanteria:
             "tubulares_totales": self.TUBULARES_TOTALES,
             "tubulares_defectuosos": self.contar_defectuosos_total(),
             "eficiencia": self.calcular_eficiencia_total(),
-            "en_produccion": sum(1 for piso in self.__pisos if piso.get_estado_general() == "óptimo")
+            "en_produccion": sum(1 for conteo in self.contar_tubulares_por_piso()
+                                 if Piso.calcular_estado_general(conteo) == "óptimo")
         }
     
     def generar_resumen(self) -> str:
@@ -221,6 +569,11 @@ class Estanteria:
         Returns:
             String con el resumen de la estantería
         """
+        clave = (self.__version, int(self.calcular_tiempo_produccion()))
+        return self.__memorizar("resumen", clave, self.__calcular_resumen)
+    
+    def __calcular_resumen(self) -> str:
+        """Método privado que arma el resumen (ver generar_resumen)."""
         estado = self.obtener_estado_general()
         conteo = self.contar_tubulares_por_estado()
         
@@ -262,6 +615,17 @@ class Estanteria:
         Returns:
             Diccionario con estadísticas completas
         """
+        guardadas = self.__memorizar("estadisticas_detalladas", self.__version,
+                                     self.__calcular_estadisticas_detalladas)
+        estadisticas = dict(guardadas)
+        estadisticas["dias_produccion"] = self.calcular_tiempo_produccion()
+        estadisticas["distribucion_estados"] = dict(guardadas["distribucion_estados"])
+        estadisticas["pisos"] = [dict(piso, distribucion_estados=dict(piso["distribucion_estados"]))
+                                 for piso in guardadas["pisos"]]
+        return estadisticas
+    
+    def __calcular_estadisticas_detalladas(self) -> dict:
+        """Método privado que calcula las estadísticas detalladas (sin los días de producción)."""
         estadisticas = {
             "codigo": self.__codigo,
             "fase": self.__fase,
@@ -269,7 +633,7 @@ class Estanteria:
             "ubicacion": self.__ubicacion,
             "fecha_inicio": self.__fecha_inicio.strftime('%d/%m/%Y %H:%M') if self.__fecha_inicio else None,
             "fecha_ultima_revision": self.__fecha_ultima_revision.strftime('%d/%m/%Y %H:%M') if self.__fecha_ultima_revision else None,
-            "dias_produccion": self.calcular_tiempo_produccion(),
+            "dias_produccion": None,
             "tubulares_totales": self.TUBULARES_TOTALES,
             "eficiencia_general": self.calcular_eficiencia_total(),
             "distribucion_estados": self.contar_tubulares_por_estado(),
@@ -277,7 +641,7 @@ class Estanteria:
         }
         
         # Estadísticas por piso
-        for i, piso in enumerate(self.__pisos, 1):
+        for piso in self.get_pisos():
             stats_piso = piso.obtener_estadisticas()
             estadisticas["pisos"].append(stats_piso)
         
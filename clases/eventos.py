@@ -0,0 +1,393 @@
+"""
+Bus de eventos del dominio
+Sistema de Gestión de Producción de Orellanas
+
+Los métodos de las clases del dominio publican eventos en lugar de
+escribir directamente en consola. Cada evento se entrega a los
+suscriptores (de forma síncrona) y a las salidas configuradas (consola,
+archivo, memoria), que pueden despacharse por lotes en un hilo aparte.
+
+Fecha: Noviembre 2025
+"""
+
+import atexit
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+
+# Catálogo de tipos de evento del dominio
+TUBULAR_ESTADO_CAMBIADO = "tubular.estado_cambiado"
+TUBULAR_DEFECTUOSO = "tubular.defectuoso"
+TUBULAR_INOCULADO = "tubular.inoculado"
+TUBULAR_OBSERVACION = "tubular.observacion"
+PISO_INOCULADO = "piso.inoculado"
+PISO_AVISO = "piso.aviso"
+PISO_CICLO_AVANZADO = "piso.ciclo_avanzado"
+ESTANTERIA_UBICACION = "estanteria.ubicacion"
+ESTANTERIA_INICIADA = "estanteria.iniciada"
+ESTANTERIA_FASE = "estanteria.fase"
+ESTANTERIA_REVISION = "estanteria.revision"
+REPORTE_DATOS = "reporte.datos"
+REPORTE_FINALIZADO = "reporte.finalizado"
+REPORTE_EXPORTADO = "reporte.exportado"
+TRABAJADOR_HORAS = "trabajador.horas"
+TRABAJADOR_TAREA = "trabajador.tarea"
+TRABAJADOR_ESTANTERIA = "trabajador.estanteria"
+ALERTA_CREADA = "alerta.creada"
+ALERTA_RESUELTA = "alerta.resuelta"
+ALERTA_REABIERTA = "alerta.reabierta"
+ALERTA_URGENTE = "alerta.urgente"
+REGISTRO_ENTRADA = "registro.entrada"
+REGISTRO_SALIDA = "registro.salida"
+REGISTRO_IMPORTADO = "registro.importado"
+
+TIPOS_EVENTO = frozenset([
+    TUBULAR_ESTADO_CAMBIADO, TUBULAR_DEFECTUOSO, TUBULAR_INOCULADO, TUBULAR_OBSERVACION,
+    PISO_INOCULADO, PISO_AVISO, PISO_CICLO_AVANZADO,
+    ESTANTERIA_UBICACION, ESTANTERIA_INICIADA, ESTANTERIA_FASE, ESTANTERIA_REVISION,
+    REPORTE_DATOS, REPORTE_FINALIZADO, REPORTE_EXPORTADO,
+    TRABAJADOR_HORAS, TRABAJADOR_TAREA, TRABAJADOR_ESTANTERIA,
+    ALERTA_CREADA, ALERTA_RESUELTA, ALERTA_REABIERTA, ALERTA_URGENTE,
+    REGISTRO_ENTRADA, REGISTRO_SALIDA, REGISTRO_IMPORTADO,
+])
+
+NIVELES = ("info", "aviso", "error")
+
+
+class Evento:
+    """
+    Clase que representa un evento ocurrido en el dominio.
+
+    Demuestra:
+    - Encapsulación: Atributos privados de solo lectura
+    """
+
+    __slots__ = ("__tipo", "__mensaje", "__nivel", "__datos", "__fecha")
+
+    def __init__(self, tipo: str, mensaje: str, nivel: str = "info", datos: dict = None):
+        """
+        Constructor de Evento.
+
+        Args:
+            tipo: Tipo de evento (uno de TIPOS_EVENTO)
+            mensaje: Texto legible del evento
+            nivel: 'info', 'aviso' o 'error'
+            datos: Datos estructurados del evento
+        """
+        if tipo not in TIPOS_EVENTO:
+            raise ValueError(f"Tipo de evento desconocido: {tipo}")
+        if nivel not in NIVELES:
+            raise ValueError(f"Nivel inválido. Debe ser: {', '.join(NIVELES)}")
+        self.__tipo = tipo
+        self.__mensaje = mensaje
+        self.__nivel = nivel
+        self.__datos = datos or {}
+        self.__fecha = datetime.now()
+
+    def get_tipo(self) -> str:
+        """Retorna el tipo del evento."""
+        return self.__tipo
+
+    def get_mensaje(self) -> str:
+        """Retorna el mensaje del evento."""
+        return self.__mensaje
+
+    def get_nivel(self) -> str:
+        """Retorna el nivel del evento."""
+        return self.__nivel
+
+    def get_datos(self) -> dict:
+        """Retorna los datos estructurados del evento."""
+        return self.__datos
+
+    def get_fecha(self) -> datetime:
+        """Retorna la fecha del evento."""
+        return self.__fecha
+
+    def __str__(self) -> str:
+        """Representación en string del evento."""
+        return self.__mensaje
+
+    def __repr__(self) -> str:
+        """Representación técnica del evento."""
+        return f"Evento(tipo='{self.__tipo}', nivel='{self.__nivel}')"
+
+
+class SalidaEventos(ABC):
+    """
+    Clase abstracta para los destinos de los eventos.
+
+    Demuestra:
+    - Abstracción: Define cómo se escribe un lote de eventos
+    - Polimorfismo: Cada salida escribe a su manera
+    """
+
+    @abstractmethod
+    def escribir_lote(self, eventos: list) -> None:
+        """
+        Escribe un lote de eventos.
+
+        Args:
+            eventos: Lista de Evento
+        """
+        pass
+
+    def cerrar(self) -> None:
+        """Libera los recursos de la salida."""
+        pass
+
+
+class SalidaConsola(SalidaEventos):
+    """Salida que escribe los mensajes de los eventos en consola."""
+
+    def escribir_lote(self, eventos: list) -> None:
+        """Escribe todos los mensajes del lote con una sola llamada a print."""
+        print("\n".join(evento.get_mensaje() for evento in eventos))
+
+
+class SalidaArchivo(SalidaEventos):
+    """Salida que agrega los eventos a un archivo de texto."""
+
+    def __init__(self, ruta: str):
+        """
+        Constructor de SalidaArchivo.
+
+        Args:
+            ruta: Ruta del archivo (se abre en modo agregar)
+        """
+        self.__ruta = ruta
+        self.__archivo = open(ruta, "a", encoding="utf-8", buffering=1 << 16)
+
+    def get_ruta(self) -> str:
+        """Retorna la ruta del archivo."""
+        return self.__ruta
+
+    def escribir_lote(self, eventos: list) -> None:
+        """Escribe una línea por evento: fecha, nivel, tipo y mensaje."""
+        self.__archivo.write("".join(
+            f"{evento.get_fecha().isoformat()}\t{evento.get_nivel()}\t"
+            f"{evento.get_tipo()}\t{evento.get_mensaje()}\n"
+            for evento in eventos))
+        self.__archivo.flush()
+
+    def cerrar(self) -> None:
+        """Cierra el archivo."""
+        if not self.__archivo.closed:
+            self.__archivo.close()
+
+
+class SalidaMemoria(SalidaEventos):
+    """Salida que guarda los eventos en memoria (útil en pruebas)."""
+
+    def __init__(self, limite: int = None):
+        """
+        Constructor de SalidaMemoria.
+
+        Args:
+            limite: Máximo de eventos guardados (None sin límite)
+        """
+        self.__eventos = deque(maxlen=limite)
+
+    def escribir_lote(self, eventos: list) -> None:
+        """Guarda los eventos del lote."""
+        self.__eventos.extend(eventos)
+
+    def get_eventos(self, tipo: str = None) -> list:
+        """
+        Retorna los eventos guardados.
+
+        Args:
+            tipo: Filtra por tipo de evento (None para todos)
+        """
+        if tipo is None:
+            return list(self.__eventos)
+        return [evento for evento in self.__eventos if evento.get_tipo() == tipo]
+
+    def limpiar(self) -> None:
+        """Borra los eventos guardados."""
+        self.__eventos.clear()
+
+
+class BusEventos:
+    """
+    Clase que distribuye los eventos del dominio.
+
+    - Los suscriptores reciben cada evento de inmediato (aunque el bus
+      esté en modo silencioso).
+    - Las salidas reciben los eventos por lotes: al instante en modo
+      síncrono o desde un hilo de despacho en modo asíncrono.
+
+    Demuestra:
+    - Encapsulación: Atributos privados
+    - Agregación: Tiene objetos SalidaEventos
+    """
+
+    def __init__(self, salidas: list = None):
+        """
+        Constructor de BusEventos.
+
+        Args:
+            salidas: Salidas iniciales (por defecto ninguna)
+        """
+        self.__salidas = list(salidas or [])
+        self.__suscriptores = {}
+        self.__silencio = 0
+        self.__pendientes = []
+        self.__condicion = threading.Condition()
+        self.__escritura = threading.Lock()
+        self.__hilo = None
+        self.__activo = False
+        self.__intervalo = 0.1
+        self.__tam_lote = 500
+
+    def agregar_salida(self, salida: SalidaEventos) -> None:
+        """Agrega una salida de eventos."""
+        self.__salidas.append(salida)
+
+    def quitar_salida(self, salida: SalidaEventos) -> None:
+        """Quita una salida de eventos (sin cerrarla)."""
+        self.vaciar()
+        if salida in self.__salidas:
+            self.__salidas.remove(salida)
+
+    def get_salidas(self) -> list:
+        """Retorna las salidas configuradas (copia)."""
+        return self.__salidas.copy()
+
+    def suscribir(self, funcion, tipo: str = None) -> None:
+        """
+        Registra una función que recibe los eventos de un tipo.
+
+        Args:
+            funcion: Función que recibe un Evento
+            tipo: Tipo de evento (None para todos)
+        """
+        self.__suscriptores.setdefault(tipo, []).append(funcion)
+
+    def desuscribir(self, funcion, tipo: str = None) -> None:
+        """Quita una función registrada con suscribir."""
+        funciones = self.__suscriptores.get(tipo, [])
+        if funcion in funciones:
+            funciones.remove(funcion)
+
+    def esta_silencioso(self) -> bool:
+        """Indica si las salidas están silenciadas."""
+        return self.__silencio > 0
+
+    def set_silencioso(self, silencioso: bool) -> None:
+        """
+        Activa o desactiva el modo silencioso (las salidas no reciben eventos).
+
+        Args:
+            silencioso: True para silenciar
+        """
+        self.__silencio = 1 if silencioso else 0
+
+    @contextmanager
+    def silenciar(self):
+        """Silencia las salidas mientras dura el bloque 'with'."""
+        self.__silencio += 1
+        try:
+            yield self
+        finally:
+            self.__silencio -= 1
+
+    def publicar(self, tipo: str, mensaje: str, nivel: str = "info", **datos) -> None:
+        """
+        Publica un evento.
+
+        Args:
+            tipo: Tipo de evento (uno de TIPOS_EVENTO)
+            mensaje: Texto legible del evento
+            nivel: 'info', 'aviso' o 'error'
+            **datos: Datos estructurados del evento
+        """
+        suscriptores = self.__suscriptores.get(tipo)
+        generales = self.__suscriptores.get(None)
+        enviar_a_salidas = self.__silencio == 0 and self.__salidas
+        if not (suscriptores or generales or enviar_a_salidas):
+            return
+
+        evento = Evento(tipo, mensaje, nivel, datos)
+        for funcion in (suscriptores or ()):
+            funcion(evento)
+        for funcion in (generales or ()):
+            funcion(evento)
+
+        if enviar_a_salidas:
+            if self.__activo:
+                with self.__condicion:
+                    self.__pendientes.append(evento)
+                    if len(self.__pendientes) >= self.__tam_lote:
+                        self.__condicion.notify()
+            else:
+                for salida in self.__salidas:
+                    salida.escribir_lote([evento])
+
+    def iniciar_despacho_asincrono(self, intervalo: float = 0.1, tam_lote: int = 500) -> None:
+        """
+        Despacha los eventos a las salidas desde un hilo aparte, por lotes.
+
+        Args:
+            intervalo: Segundos máximos que un evento espera en el búfer
+            tam_lote: Tamaño del lote que dispara un despacho inmediato
+        """
+        if self.__activo:
+            return
+        self.__intervalo = intervalo
+        self.__tam_lote = tam_lote
+        self.__activo = True
+        self.__hilo = threading.Thread(target=self.__despachar, name="bus-eventos", daemon=True)
+        self.__hilo.start()
+
+    def detener_despacho_asincrono(self) -> None:
+        """Detiene el hilo de despacho y escribe los eventos pendientes."""
+        if not self.__activo:
+            return
+        with self.__condicion:
+            self.__activo = False
+            self.__condicion.notify()
+        self.__hilo.join()
+        self.__hilo = None
+        self.vaciar()
+
+    def vaciar(self) -> None:
+        """Escribe de inmediato los eventos pendientes en las salidas."""
+        with self.__condicion:
+            lote = self.__pendientes
+            self.__pendientes = []
+        if lote:
+            with self.__escritura:
+                for salida in self.__salidas:
+                    salida.escribir_lote(lote)
+
+    def cerrar(self) -> None:
+        """Detiene el despacho, vacía el búfer y cierra las salidas."""
+        self.detener_despacho_asincrono()
+        self.vaciar()
+        for salida in self.__salidas:
+            salida.cerrar()
+
+    def __despachar(self) -> None:
+        """Método privado: bucle del hilo de despacho."""
+        while True:
+            with self.__condicion:
+                if self.__activo and len(self.__pendientes) < self.__tam_lote:
+                    self.__condicion.wait(self.__intervalo)
+                activo = self.__activo
+            self.vaciar()
+            if not activo:
+                return
+
+
+# Bus por defecto del sistema: escribe en consola de forma síncrona
+bus_eventos = BusEventos([SalidaConsola()])
+atexit.register(bus_eventos.cerrar)
+
+
+def publicar(tipo: str, mensaje: str, nivel: str = "info", **datos) -> None:
+    """Publica un evento en el bus por defecto."""
+    bus_eventos.publicar(tipo, mensaje, nivel, **datos)
@@ -0,0 +1,384 @@
+"""
+Escritores de tablas y ExportadorReporte - Exportación a CSV y XLSX
+Sistema de Gestión de Producción de Orellanas
+
+Los escritores reciben las filas de a una (de un generador) y las
+escriben de inmediato, así la memoria no depende del número de filas.
+
+Fecha: Noviembre 2025
+"""
+
+import csv
+import math
+import os
+import re
+import zipfile
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from clases.almacen_tubulares import AlmacenTubulares
+from clases.piso import Piso
+
+
+class EscritorTabla(ABC):
+    """
+    Clase abstracta de un archivo con una o varias hojas de filas.
+
+    Demuestra:
+    - Abstracción: Define cómo se escribe una hoja
+    - Polimorfismo: Cada formato la escribe a su manera
+    """
+
+    @abstractmethod
+    def escribir_hoja(self, nombre: str, encabezado: list, filas) -> int:
+        """
+        Escribe una hoja completa consumiendo las filas de a una.
+
+        Args:
+            nombre: Nombre de la hoja
+            encabezado: Nombres de las columnas
+            filas: Iterable de filas (listas o tuplas)
+
+        Returns:
+            Número de filas escritas (sin el encabezado)
+        """
+        pass
+
+    def cerrar(self) -> None:
+        """Termina el archivo y libera los recursos."""
+        pass
+
+    def __enter__(self):
+        """Permite usar el escritor en un bloque with."""
+        return self
+
+    def __exit__(self, tipo, valor, traza) -> None:
+        """Cierra el escritor al salir del bloque with."""
+        self.cerrar()
+
+
+class EscritorCSV(EscritorTabla):
+    """
+    Escritor CSV: cada hoja va a su propio archivo.
+
+    Con ruta "reporte.csv", la hoja "pisos" se escribe en "reporte_pisos.csv".
+    """
+
+    def __init__(self, ruta: str, delimitador: str = ","):
+        """
+        Constructor de EscritorCSV.
+
+        Args:
+            ruta: Ruta base de los archivos
+            delimitador: Separador de columnas
+        """
+        self.__base, self.__extension = os.path.splitext(ruta)
+        self.__extension = self.__extension or ".csv"
+        self.__delimitador = delimitador
+        self.__rutas = []
+
+    def get_rutas(self) -> list:
+        """Retorna las rutas de los archivos escritos."""
+        return list(self.__rutas)
+
+    def escribir_hoja(self, nombre: str, encabezado: list, filas) -> int:
+        """Escribe la hoja en '<ruta>_<nombre>.csv' (UTF-8 con BOM para Excel)."""
+        ruta = f"{self.__base}_{nombre}{self.__extension}"
+        cantidad = 0
+        with open(ruta, "w", newline="", encoding="utf-8-sig") as archivo:
+            escritor = csv.writer(archivo, delimiter=self.__delimitador)
+            escritor.writerow(encabezado)
+            for fila in filas:
+                escritor.writerow(fila)
+                cantidad += 1
+        self.__rutas.append(ruta)
+        return cantidad
+
+
+class EscritorXLSX(EscritorTabla):
+    """
+    Escritor XLSX mínimo (Office Open XML) sin dependencias.
+
+    Cada hoja se escribe en streaming dentro del ZIP con textos en línea
+    (sin tabla de textos compartidos, que obligaría a tenerlos todos en
+    memoria). Los archivos de estructura del libro se agregan al cerrar.
+    Si una hoja pasa el máximo de filas de Excel, continúa en otra hoja
+    con el mismo nombre y un número.
+    """
+
+    MAX_FILAS = 1048576
+    # Caracteres de control que XML no admite
+    __INVALIDOS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+    def __init__(self, ruta: str):
+        """
+        Constructor de EscritorXLSX.
+
+        Args:
+            ruta: Ruta del archivo .xlsx
+        """
+        self.__ruta = ruta
+        self.__zip = zipfile.ZipFile(ruta, "w", zipfile.ZIP_DEFLATED)
+        self.__hojas = []
+
+    def get_ruta(self) -> str:
+        """Retorna la ruta del archivo."""
+        return self.__ruta
+
+    def get_hojas(self) -> list:
+        """Retorna los nombres de las hojas escritas."""
+        return list(self.__hojas)
+
+    def escribir_hoja(self, nombre: str, encabezado: list, filas) -> int:
+        """Escribe la hoja (y sus continuaciones si pasa MAX_FILAS)."""
+        filas = iter(filas)
+        total = 0
+        parte = 1
+        while True:
+            nombre_hoja = nombre if parte == 1 else f"{nombre} ({parte})"
+            escritas, agotadas = self.__escribir_parte(nombre_hoja, encabezado, filas)
+            total += escritas
+            if agotadas:
+                return total
+            parte += 1
+
+    def __escribir_parte(self, nombre: str, encabezado: list, filas) -> tuple:
+        """Método privado: escribe una hoja de hasta MAX_FILAS filas."""
+        self.__hojas.append(nombre[:31])
+        numero = len(self.__hojas)
+        escritas = 0
+        agotadas = True
+        celda = self.__celda
+        with self.__zip.open(f"xl/worksheets/sheet{numero}.xml", "w", force_zip64=True) as destino:
+            destino.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                          b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                          b'<sheetData>')
+            destino.write(self.__fila(encabezado).encode("utf-8"))
+            pendiente = []
+            for fila in filas:
+                pendiente.append("<row>" + "".join(map(celda, fila)) + "</row>")
+                escritas += 1
+                if len(pendiente) >= 1000:
+                    destino.write("".join(pendiente).encode("utf-8"))
+                    pendiente = []
+                if escritas >= self.MAX_FILAS - 1:
+                    agotadas = False
+                    break
+            destino.write("".join(pendiente).encode("utf-8"))
+            destino.write(b"</sheetData></worksheet>")
+        return escritas, agotadas
+
+    def __fila(self, valores) -> str:
+        """Método privado: XML de una fila."""
+        return "<row>" + "".join(map(self.__celda, valores)) + "</row>"
+
+    @classmethod
+    def __texto(cls, texto: str) -> str:
+        """Método privado: texto escapado para XML."""
+        texto = texto.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        return cls.__INVALIDOS.sub("", texto)
+
+    @classmethod
+    def __celda(cls, valor) -> str:
+        """Método privado: XML de una celda (número, booleano o texto)."""
+        if valor is None:
+            return "<c/>"
+        if isinstance(valor, bool):
+            return f'<c t="b"><v>{int(valor)}</v></c>'
+        if isinstance(valor, int) or (isinstance(valor, float) and math.isfinite(valor)):
+            return f"<c><v>{valor!r}</v></c>"
+        if isinstance(valor, (datetime, date)):
+            valor = valor.isoformat(" ") if isinstance(valor, datetime) else valor.isoformat()
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{cls.__texto(str(valor))}</t></is></c>'
+
+    def cerrar(self) -> None:
+        """Agrega la estructura del libro y cierra el ZIP."""
+        if self.__zip is None:
+            return
+        if not self.__hojas:
+            self.escribir_hoja("Hoja1", [], [])
+        hojas = self.__hojas
+        escribir = self.__zip.writestr
+        escribir("[Content_Types].xml",
+                 '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                 '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                 '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                 '<Default Extension="xml" ContentType="application/xml"/>'
+                 '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                 + "".join(f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                           for i in range(1, len(hojas) + 1))
+                 + '</Types>')
+        escribir("_rels/.rels",
+                 '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                 '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                 '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+                 '</Relationships>')
+        escribir("xl/workbook.xml",
+                 '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                 '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+                 + "".join(f'<sheet name="{self.__texto(nombre).replace(chr(34), "&quot;")}" sheetId="{i}" r:id="rId{i}"/>'
+                           for i, nombre in enumerate(hojas, 1))
+                 + '</sheets></workbook>')
+        escribir("xl/_rels/workbook.xml.rels",
+                 '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                 '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                 + "".join(f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                           for i in range(1, len(hojas) + 1))
+                 + '</Relationships>')
+        self.__zip.close()
+        self.__zip = None
+
+
+class ExportadorReporte:
+    """
+    Clase que exporta un reporte y el detalle de sus estanterías.
+
+    Hojas:
+    - reporte: metadatos y datos (clave, valor) del Reporte
+    - estanterias: una fila por estantería (mismos datos que
+      obtener_estadisticas_detalladas)
+    - pisos: una fila por piso de cada estantería
+    - tubulares (opcional): una fila por tubular, leída de las columnas del
+      almacén de cada estantería sin crear objetos Tubular
+
+    Todas las hojas se generan con generadores que recorren una estantería
+    a la vez, así exportar una planta entera con millones de tubulares usa
+    memoria acotada. Las filas de estanterías y pisos salen de los
+    contadores del almacén: no se crean objetos Piso ni se guardan
+    estadísticas memorizadas en las estanterías.
+
+    Demuestra:
+    - Asociación: Usa un Reporte y las estanterías que detalla
+    - Polimorfismo: Escribe en cualquier EscritorTabla
+    """
+
+    ESTADOS = AlmacenTubulares.ESTADOS
+
+    def __init__(self, reporte=None, estanterias=None, incluir_tubulares: bool = False):
+        """
+        Constructor de ExportadorReporte.
+
+        Args:
+            reporte: Instancia de Reporte (opcional)
+            estanterias: Iterable de Estanteria o una Planta (opcional)
+            incluir_tubulares: Si se agrega la hoja de tubulares
+        """
+        self.__reporte = reporte
+        self.__estanterias = estanterias if estanterias is not None else []
+        self.__incluir_tubulares = incluir_tubulares
+
+    def exportar(self, escritor: EscritorTabla) -> dict:
+        """
+        Escribe todas las hojas en un escritor.
+
+        Returns:
+            Diccionario {hoja: filas escritas}
+        """
+        resultado = {}
+        if self.__reporte is not None:
+            resultado["reporte"] = escritor.escribir_hoja("reporte", ["clave", "valor"], self.__filas_reporte())
+        resultado["estanterias"] = escritor.escribir_hoja(
+            "estanterias", ["codigo", "fase", "activa", "ubicacion", "fecha_inicio",
+                            "fecha_ultima_revision", "dias_produccion", "tubulares_totales",
+                            "eficiencia_general"] + list(self.ESTADOS),
+            self.__filas_estanterias())
+        resultado["pisos"] = escritor.escribir_hoja(
+            "pisos", ["codigo", "piso", "estado_general", "porcentaje_ocupacion",
+                      "tubulares_defectuosos"] + list(self.ESTADOS),
+            self.__filas_pisos())
+        if self.__incluir_tubulares:
+            resultado["tubulares"] = escritor.escribir_hoja(
+                "tubulares", ["codigo", "piso", "numero", "estado", "defectuoso", "fecha_inoculacion"],
+                self.__filas_tubulares())
+        return resultado
+
+    def exportar_csv(self, ruta: str) -> list:
+        """
+        Exporta a archivos CSV (uno por hoja).
+
+        Returns:
+            Rutas de los archivos escritos
+        """
+        escritor = EscritorCSV(ruta)
+        self.exportar(escritor)
+        return escritor.get_rutas()
+
+    def exportar_xlsx(self, ruta: str) -> str:
+        """
+        Exporta a un libro XLSX.
+
+        Returns:
+            Ruta del archivo escrito
+        """
+        with EscritorXLSX(ruta) as escritor:
+            self.exportar(escritor)
+        return ruta
+
+    # Generadores de filas
+
+    def __filas_reporte(self):
+        """Método privado: metadatos y datos del reporte."""
+        reporte = self.__reporte
+        usuario = reporte.get_generado_por()
+        yield "id", reporte.get_id()
+        yield "tipo", reporte.get_tipo()
+        yield "periodo", reporte.get_periodo()
+        yield "generado_por", usuario.get_nombre_completo() if usuario is not None else None
+        yield "fecha_generacion", reporte.get_fecha_generacion()
+        yield "finalizado", reporte.esta_finalizado()
+        for clave, valor in reporte.get_datos().items():
+            if not isinstance(valor, (int, float, str, bool, date)) and valor is not None:
+                valor = str(valor)
+            yield clave, valor
+
+    def __filas_estanterias(self):
+        """Método privado: una fila por estantería."""
+        for estanteria in self.__estanterias:
+            distribucion = estanteria.contar_tubulares_por_estado()
+            yield ([estanteria.get_codigo(), estanteria.get_fase(), estanteria.esta_activa(),
+                    estanteria.get_ubicacion(), self.__texto_fecha(estanteria.get_fecha_inicio()),
+                    self.__texto_fecha(estanteria.get_fecha_ultima_revision()),
+                    estanteria.calcular_tiempo_produccion(), estanteria.TUBULARES_TOTALES,
+                    estanteria.calcular_eficiencia_total()]
+                   + [distribucion[estado] for estado in self.ESTADOS])
+
+    def __filas_pisos(self):
+        """Método privado: una fila por piso de cada estantería."""
+        por_piso = Piso.TUBULARES_POR_PISO
+        for estanteria in self.__estanterias:
+            codigo = estanteria.get_codigo()
+            for numero, conteo in enumerate(estanteria.contar_tubulares_por_piso(), 1):
+                ocupados = por_piso - conteo["vacío"]
+                yield ([codigo, numero, Piso.calcular_estado_general(conteo),
+                        ocupados / por_piso * 100, conteo["defectuoso"]]
+                       + [conteo[estado] for estado in self.ESTADOS])
+
+    @staticmethod
+    def __texto_fecha(fecha):
+        """Método privado: fecha con el formato de obtener_estadisticas_detalladas."""
+        return fecha.strftime('%d/%m/%Y %H:%M') if fecha else None
+
+    def __filas_tubulares(self):
+        """Método privado: una fila por tubular, desde las columnas del almacén."""
+        estados_texto = self.ESTADOS
+        fechas_texto = {}
+        for estanteria in self.__estanterias:
+            codigo = estanteria.get_codigo()
+            por_piso = estanteria.TUBULARES_TOTALES // estanteria.NUMERO_PISOS
+            columnas = estanteria.exportar_tubulares()
+            if columnas is None:
+                for posicion in range(estanteria.TUBULARES_TOTALES):
+                    yield codigo, posicion // por_piso + 1, posicion % por_piso + 1, "vacío", False, None
+                continue
+            estados, defectos, fechas = columnas
+            for posicion, (estado, defecto, marca) in enumerate(zip(estados, defectos, fechas)):
+                fecha = None
+                if marca:
+                    # Las inoculaciones masivas repiten la marca: se formatea una vez
+                    fecha = fechas_texto.get(marca)
+                    if fecha is None:
+                        if len(fechas_texto) > 10000:
+                            fechas_texto.clear()
+                        fecha = fechas_texto[marca] = datetime.fromtimestamp(marca).isoformat(" ", "seconds")
+                yield (codigo, posicion // por_piso + 1, posicion % por_piso + 1,
+                       estados_texto[estado], bool(defecto), fecha)
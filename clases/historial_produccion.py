@@ -0,0 +1,372 @@
+"""
+Clase HistorialProduccion - Serie de tiempo del estado de las estanterías
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import operator
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from clases.almacen_tubulares import AlmacenTubulares
+from clases.estanteria import Estanteria
+from clases.serie_numerica import SerieNumerica
+
+
+class HistorialProduccion:
+    """
+    Clase que guarda, una vez por intervalo, la distribución de estados,
+    los defectos, la fase y si está activa cada estantería.
+
+    Cada muestra es una foto de toda la planta guardada en columnas: un
+    byte por estantería (fase y activa) y 6 conteos por estantería, más
+    los totales de la planta. Las consultas por rango buscan por fecha
+    con bisección y la reducción por día, semana o mes usa SerieNumerica.
+
+    Con una ruta, cada muestra se agrega al final del archivo como un
+    bloque comprimido con zlib que guarda solo la diferencia con la
+    muestra anterior (XOR de los bytes de fase y resta de los conteos);
+    como entre una muestra y la siguiente casi nada cambia, el bloque
+    queda casi todo en ceros. El formato (little-endian) es:
+
+    - Cabecera: firma "ORELLHIS" y versión.
+    - Bloques: largo del bloque comprimido y el bloque, que contiene la
+      marca de tiempo, los códigos de las estanterías nuevas, las fases
+      y los conteos.
+
+    Un bloque cortado a la mitad (por un corte de luz) se descarta al
+    leer el archivo.
+
+    Demuestra:
+    - Encapsulación: Las columnas de las muestras son privadas
+    - Abstracción: Oculta el formato comprimido del archivo
+    """
+
+    FIRMA = b"ORELLHIS"
+    VERSION = 1
+    ESTADOS = AlmacenTubulares.ESTADOS
+    # Byte de fase de una estantería que no estaba en la planta
+    AUSENTE = 0xFF
+    ACTIVA = 0x80
+
+    __CABECERA = struct.Struct("<8sB")
+    __BLOQUE = struct.Struct("<I")
+    __MUESTRA = struct.Struct("<dII")
+    __LARGO = struct.Struct("<H")
+    __NO_CERO = re.compile(b"[^\x00]")
+
+    def __init__(self, ruta: str = None, intervalo: float = 86400, nivel_compresion: int = 6):
+        """
+        Constructor de HistorialProduccion. Si el archivo existe, carga sus muestras.
+
+        Args:
+            ruta: Archivo del historial (None para guardarlo solo en memoria)
+            intervalo: Segundos entre muestras de registrar_si_corresponde
+            nivel_compresion: Nivel de zlib (1-9)
+
+        Raises:
+            ValueError: Si el archivo no es un historial válido
+        """
+        self.__ruta = ruta
+        self.__intervalo = intervalo
+        self.__nivel = nivel_compresion
+        self.__codigos = []
+        # código -> posición de la estantería en las muestras
+        self.__posiciones = {}
+        self.__marcas = array("d")
+        # Por muestra: bytes de fase (con la bandera de activa) por estantería
+        self.__fases = []
+        # Por muestra: 6 conteos por estantería
+        self.__conteos = []
+        # Por estado: total de la planta en cada muestra
+        self.__totales = [array("l") for _ in self.ESTADOS]
+        if ruta is not None and os.path.exists(ruta):
+            self.__leer()
+
+    def get_ruta(self) -> str:
+        """Retorna la ruta del archivo (None si está solo en memoria)."""
+        return self.__ruta
+
+    def get_intervalo(self) -> float:
+        """Retorna los segundos entre muestras."""
+        return self.__intervalo
+
+    def get_codigos(self) -> list:
+        """Retorna los códigos de las estanterías que tienen historial."""
+        return list(self.__codigos)
+
+    def get_ultima_fecha(self):
+        """Retorna la fecha de la última muestra (None si no hay)."""
+        return datetime.fromtimestamp(self.__marcas[-1]) if self.__marcas else None
+
+    # Registro
+
+    def registrar_si_corresponde(self, estanterias, ahora: datetime = None) -> bool:
+        """
+        Registra una muestra si ya pasó el intervalo desde la última.
+
+        Args:
+            estanterias: Planta o lista de estanterías
+            ahora: Momento de la muestra (por defecto, ahora)
+
+        Returns:
+            True si se registró la muestra
+        """
+        ahora = ahora or datetime.now()
+        if self.__marcas and ahora.timestamp() - self.__marcas[-1] < self.__intervalo:
+            return False
+        self.registrar(estanterias, ahora)
+        return True
+
+    def registrar(self, estanterias, ahora: datetime = None) -> None:
+        """
+        Registra una muestra de todas las estanterías.
+
+        Args:
+            estanterias: Planta o lista de estanterías
+            ahora: Momento de la muestra (por defecto, ahora)
+
+        Raises:
+            ValueError: Si la muestra es anterior a la última registrada
+        """
+        marca = (ahora or datetime.now()).timestamp()
+        if self.__marcas and marca < self.__marcas[-1]:
+            raise ValueError("Las muestras deben registrarse en orden cronológico")
+
+        estanterias = list(estanterias)
+        nuevos = []
+        for estanteria in estanterias:
+            codigo = estanteria.get_codigo()
+            if codigo not in self.__posiciones:
+                self.__posiciones[codigo] = len(self.__codigos)
+                self.__codigos.append(codigo)
+                nuevos.append(codigo)
+
+        numero = len(self.ESTADOS)
+        fases = bytearray([self.AUSENTE]) * len(self.__codigos)
+        conteos = array("H", bytes(2 * numero * len(self.__codigos)))
+        indices_fase = {fase: indice for indice, fase in enumerate(Estanteria.FASES)}
+        for estanteria in estanterias:
+            posicion = self.__posiciones[estanteria.get_codigo()]
+            fases[posicion] = (indices_fase[estanteria.get_fase()]
+                               | (self.ACTIVA if estanteria.esta_activa() else 0))
+            conteos[posicion * numero:(posicion + 1) * numero] = \
+                array("H", estanteria.contar_tubulares_por_estado().values())
+
+        if self.__ruta is not None:
+            self.__escribir_bloque(marca, nuevos, bytes(fases), conteos)
+        self.__agregar_muestra(marca, bytes(fases), conteos)
+
+    def __agregar_muestra(self, marca: float, fases: bytes, conteos: array,
+                          diferencias: dict = None) -> None:
+        """
+        Método privado que agrega una muestra a las columnas en memoria.
+
+        Args:
+            marca: Marca de tiempo de la muestra
+            fases: Byte de fase de cada estantería
+            conteos: Conteos de cada estantería
+            diferencias: {posición en conteos: cambio} respecto de la muestra
+                anterior, si se conocen (evita volver a sumar los totales)
+        """
+        # Las columnas que no cambiaron se comparten con la muestra anterior
+        if self.__fases and fases == self.__fases[-1]:
+            fases = self.__fases[-1]
+        iguales = bool(self.__conteos) and conteos == self.__conteos[-1]
+        if iguales:
+            conteos = self.__conteos[-1]
+        self.__marcas.append(marca)
+        self.__fases.append(fases)
+        self.__conteos.append(conteos)
+        numero = len(self.ESTADOS)
+        if diferencias is not None and len(self.__marcas) > 1:
+            nuevos = [totales[-1] for totales in self.__totales]
+            for posicion, cambio in diferencias.items():
+                nuevos[posicion % numero] += cambio
+            for totales, nuevo in zip(self.__totales, nuevos):
+                totales.append(nuevo)
+            return
+        for indice, totales in enumerate(self.__totales):
+            totales.append(totales[-1] if iguales else sum(conteos[indice::numero]))
+
+    def __anterior(self, largo: int) -> tuple:
+        """Método privado: fases y conteos de la última muestra, rellenados hasta 'largo' estanterías."""
+        if not self.__fases:
+            return bytes(largo), array("H", bytes(2 * len(self.ESTADOS) * largo))
+        fases = self.__fases[-1]
+        conteos = self.__conteos[-1]
+        faltan = largo - len(fases)
+        return (fases + bytes(faltan),
+                conteos + array("H", bytes(2 * len(self.ESTADOS) * faltan)))
+
+    # Archivo
+
+    @staticmethod
+    def __xor(a: bytes, b: bytes) -> bytes:
+        """Método privado: XOR byte a byte de dos bytes del mismo largo."""
+        return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+    @staticmethod
+    def __little_endian(columna: array) -> array:
+        """Método privado: el archivo siempre guarda los números en little-endian."""
+        if sys.byteorder == "big":
+            columna.byteswap()
+        return columna
+
+    def __escribir_bloque(self, marca: float, nuevos: list, fases: bytes, conteos: array) -> None:
+        """Método privado que agrega una muestra al archivo como diferencia con la anterior."""
+        fases_previas, conteos_previos = self.__anterior(len(fases))
+        diferencias = array("h", map(operator.sub, conteos, conteos_previos))
+        partes = [self.__MUESTRA.pack(marca, len(nuevos), len(fases))]
+        for codigo in nuevos:
+            codificado = codigo.encode("utf-8")
+            partes.append(self.__LARGO.pack(len(codificado)) + codificado)
+        partes.append(self.__xor(fases, fases_previas))
+        partes.append(self.__little_endian(diferencias).tobytes())
+        bloque = zlib.compress(b"".join(partes), self.__nivel)
+
+        nuevo = not os.path.exists(self.__ruta)
+        with open(self.__ruta, "ab") as archivo:
+            if nuevo:
+                archivo.write(self.__CABECERA.pack(self.FIRMA, self.VERSION))
+            archivo.write(self.__BLOQUE.pack(len(bloque)) + bloque)
+
+    def __leer(self) -> None:
+        """Método privado que carga las muestras del archivo (y descarta un bloque cortado)."""
+        with open(self.__ruta, "rb") as archivo:
+            datos = memoryview(archivo.read())
+        if len(datos) < self.__CABECERA.size:
+            raise ValueError(f"{self.__ruta} no es un historial de producción")
+        firma, version = self.__CABECERA.unpack_from(datos, 0)
+        if firma != self.FIRMA:
+            raise ValueError(f"{self.__ruta} no es un historial de producción")
+        if version != self.VERSION:
+            raise ValueError(f"Versión de historial no soportada: {version}")
+
+        numero = len(self.ESTADOS)
+        posicion = self.__CABECERA.size
+        while posicion + self.__BLOQUE.size <= len(datos):
+            largo, = self.__BLOQUE.unpack_from(datos, posicion)
+            fin = posicion + self.__BLOQUE.size + largo
+            if fin > len(datos):
+                break
+            try:
+                bloque = memoryview(zlib.decompress(datos[posicion + self.__BLOQUE.size:fin]))
+            except zlib.error:
+                break
+            marca, cantidad_nuevos, largo_fases = self.__MUESTRA.unpack_from(bloque, 0)
+            desde = self.__MUESTRA.size
+            for _ in range(cantidad_nuevos):
+                largo_codigo, = self.__LARGO.unpack_from(bloque, desde)
+                desde += self.__LARGO.size
+                codigo = str(bloque[desde:desde + largo_codigo], "utf-8")
+                desde += largo_codigo
+                self.__posiciones[codigo] = len(self.__codigos)
+                self.__codigos.append(codigo)
+
+            fases_previas, conteos_previos = self.__anterior(largo_fases)
+            fases = self.__xor(bytes(bloque[desde:desde + largo_fases]), fases_previas)
+            desde += largo_fases
+            crudo = bytes(bloque[desde:desde + 2 * numero * largo_fases])
+            diferencias = array("h")
+            diferencias.frombytes(crudo)
+            self.__little_endian(diferencias)
+            # Solo se suman las pocas diferencias que no son cero
+            cambios = {coincidencia.start() // 2: 0 for coincidencia in self.__NO_CERO.finditer(crudo)}
+            conteos = array("H", conteos_previos) if cambios else conteos_previos
+            for indice in cambios:
+                cambios[indice] = diferencias[indice]
+                conteos[indice] += diferencias[indice]
+            self.__agregar_muestra(marca, fases, conteos, cambios)
+            posicion = fin
+
+        if posicion < len(datos):
+            # Bloque incompleto al final: se corta para poder seguir agregando
+            os.truncate(self.__ruta, posicion)
+
+    # Consultas
+
+    def __rango(self, desde, hasta) -> range:
+        """Método privado: posiciones de las muestras entre dos fechas (incluidas)."""
+        marcas = self.__marcas
+        inicio = bisect_left(marcas, desde.timestamp()) if desde is not None else 0
+        fin = bisect_right(marcas, hasta.timestamp()) if hasta is not None else len(marcas)
+        return range(inicio, fin)
+
+    def obtener_serie(self, codigo: str = None, desde: datetime = None,
+                      hasta: datetime = None) -> list:
+        """
+        Retorna las muestras de una estantería o de la planta en un rango.
+
+        Args:
+            codigo: Código de la estantería (None para los totales de la planta)
+            desde: Primera fecha incluida (None para el inicio)
+            hasta: Última fecha incluida (None para el final)
+
+        Returns:
+            Lista de diccionarios con fecha y el conteo de cada estado; los de una
+            estantería incluyen además fase y activa (y faltan las muestras en que
+            no estaba en la planta)
+        """
+        rango = self.__rango(desde, hasta)
+        estados = self.ESTADOS
+        if codigo is None:
+            columnas = [totales[rango.start:rango.stop] for totales in self.__totales]
+            return [dict(zip(estados, fila), fecha=datetime.fromtimestamp(marca))
+                    for marca, *fila in zip(self.__marcas[rango.start:rango.stop], *columnas)]
+
+        posicion = self.__posiciones.get(codigo)
+        if posicion is None:
+            return []
+        numero = len(estados)
+        fases = Estanteria.FASES
+        serie = []
+        for indice in rango:
+            fila = self.__fases[indice]
+            if posicion >= len(fila) or fila[posicion] == self.AUSENTE:
+                continue
+            muestra = dict(zip(estados, self.__conteos[indice][posicion * numero:(posicion + 1) * numero]))
+            muestra["fecha"] = datetime.fromtimestamp(self.__marcas[indice])
+            muestra["fase"] = fases[fila[posicion] & ~self.ACTIVA]
+            muestra["activa"] = bool(fila[posicion] & self.ACTIVA)
+            serie.append(muestra)
+        return serie
+
+    def reducir(self, periodo: str = "dia", codigo: str = None, desde: datetime = None,
+                hasta: datetime = None) -> dict:
+        """
+        Reduce la serie a un valor por periodo: el promedio de cada conteo.
+
+        Args:
+            periodo: 'dia', 'semana' (ISO), 'mes' o 'año' (ver SerieNumerica.agrupar)
+            codigo: Código de la estantería (None para los totales de la planta)
+            desde: Primera fecha incluida (None para el inicio)
+            hasta: Última fecha incluida (None para el final)
+
+        Returns:
+            {clave del periodo: {estado: promedio}} ordenado por clave
+        """
+        muestras = self.obtener_serie(codigo, desde, hasta)
+        fechas = [muestra["fecha"] for muestra in muestras]
+        resultado = {}
+        for estado in self.ESTADOS:
+            serie = SerieNumerica(estado)
+            serie.extender(fechas, [muestra[estado] for muestra in muestras])
+            for clave, estadisticas in serie.agrupar(periodo).items():
+                resultado.setdefault(clave, {})[estado] = round(estadisticas["media"], 2)
+        return resultado
+
+    def __len__(self) -> int:
+        """Retorna el número de muestras."""
+        return len(self.__marcas)
+
+    def __repr__(self) -> str:
+        """Representación técnica del historial."""
+        return (f"HistorialProduccion(muestras={len(self.__marcas)}, "
+                f"estanterias={len(self.__codigos)}, ruta={self.__ruta!r})")
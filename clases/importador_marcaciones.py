@@ -0,0 +1,201 @@
+"""
+Clase ImportadorMarcaciones - Importación masiva de marcaciones del reloj
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import csv
+from datetime import datetime, timedelta
+from itertools import islice
+from clases import eventos
+from clases.asignador_ids import get_asignador
+
+
+class ImportadorMarcaciones:
+    """
+    Clase que importa archivos CSV del reloj de marcación en bloques.
+
+    Lee el archivo por bloques de filas, empareja cada entrada con la
+    siguiente salida del mismo trabajador y escribe los turnos completos
+    en lote (en un LibroRegistros y/o en un RepositorioSQLite) sin crear
+    objetos por fila. Un turno pertenece al día de su entrada, aunque la
+    salida caiga después de medianoche.
+
+    Las marcaciones que no forman un turno se marcan como huérfanas con
+    su motivo: entrada sin salida, salida sin entrada, turno más largo que
+    el máximo, marcación anterior a la previa del trabajador o fila
+    inválida. Las marcaciones de cada trabajador deben venir en orden
+    cronológico (el archivo completo no necesita estarlo).
+
+    Demuestra:
+    - Encapsulación: El emparejamiento pendiente es privado
+    - Asociación: Escribe en un LibroRegistros y un RepositorioSQLite
+    """
+
+    TIPOS_ENTRADA = frozenset(["entrada", "e", "in", "i", "1"])
+    TIPOS_SALIDA = frozenset(["salida", "s", "out", "o", "0"])
+
+    def __init__(self, libro=None, repositorio=None, tam_bloque: int = 10000,
+                 max_horas_turno: float = 16.0, columnas: tuple = ("usuario", "fecha_hora", "tipo"),
+                 formato_fecha: str = None, delimitador: str = ","):
+        """
+        Constructor de ImportadorMarcaciones.
+
+        Args:
+            libro: LibroRegistros donde se agregan los turnos (opcional)
+            repositorio: RepositorioSQLite donde se guardan (opcional)
+            tam_bloque: Filas leídas y escritas por bloque
+            max_horas_turno: Duración máxima de un turno válido
+            columnas: Nombres de las columnas (usuario, fecha y hora, tipo)
+            formato_fecha: Formato de strptime (None para ISO 8601)
+            delimitador: Separador de columnas del CSV
+        """
+        if libro is None and repositorio is None:
+            raise ValueError("Se necesita un libro o un repositorio de destino")
+        self.__libro = libro
+        self.__repositorio = repositorio
+        self.__tam_bloque = tam_bloque
+        self.__max_turno = timedelta(hours=max_horas_turno)
+        self.__columnas = columnas
+        self.__formato_fecha = formato_fecha
+        self.__delimitador = delimitador
+        # username -> (línea, hora de la entrada pendiente)
+        self.__pendientes = {}
+        # username -> hora de su última marcación
+        self.__ultimas = {}
+        self.__huerfanas = []
+
+    def get_huerfanas(self) -> list:
+        """
+        Retorna las marcaciones huérfanas de la última importación.
+
+        Returns:
+            Lista de tuplas (línea, usuario, fecha y hora en texto, motivo)
+        """
+        return list(self.__huerfanas)
+
+    def importar(self, archivo) -> dict:
+        """
+        Importa un archivo de marcaciones.
+
+        Args:
+            archivo: Ruta del CSV o archivo de texto ya abierto
+
+        Returns:
+            Diccionario con filas leídas, turnos importados, huérfanas y horas
+        """
+        if isinstance(archivo, str):
+            with open(archivo, newline="", encoding="utf-8-sig") as abierto:
+                return self.importar(abierto)
+
+        self.__pendientes = {}
+        self.__ultimas = {}
+        self.__huerfanas = []
+        lector = csv.reader(archivo, delimiter=self.__delimitador)
+        encabezado = [nombre.strip().lower() for nombre in next(lector, [])]
+        faltantes = [nombre for nombre in self.__columnas if nombre not in encabezado]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en el archivo: {', '.join(faltantes)}")
+        posiciones = [encabezado.index(nombre) for nombre in self.__columnas]
+
+        filas = turnos = 0
+        horas = 0.0
+        linea = 1
+        while True:
+            bloque = list(islice(lector, self.__tam_bloque))
+            if not bloque:
+                break
+            completos = self.__emparejar(bloque, posiciones, linea)
+            linea += len(bloque)
+            filas += len(bloque)
+            turnos += len(completos)
+            horas += sum((salida - entrada).total_seconds() for _, _, entrada, salida in completos) / 3600
+            self.__escribir(completos)
+
+        for username, (numero, entrada) in self.__pendientes.items():
+            self.__huerfanas.append((numero, username, entrada.isoformat(), "entrada sin salida"))
+        self.__pendientes = {}
+        self.__huerfanas.sort()
+
+        resultado = {"filas": filas, "turnos": turnos, "huerfanas": len(self.__huerfanas),
+                     "horas": round(horas, 2)}
+        eventos.publicar(eventos.REGISTRO_IMPORTADO,
+                         f"✓ Importación de marcaciones: {turnos} turnos de {filas} filas, "
+                         f"{len(self.__huerfanas)} marcaciones huérfanas",
+                         "aviso" if self.__huerfanas else "info", **resultado)
+        return resultado
+
+    def __leer_fecha(self, texto: str) -> datetime:
+        """Método privado que convierte el texto de la marcación a datetime."""
+        if self.__formato_fecha is None:
+            return datetime.fromisoformat(texto)
+        return datetime.strptime(texto, self.__formato_fecha)
+
+    def __emparejar(self, bloque: list, posiciones: list, primera_linea: int) -> list:
+        """
+        Método privado: empareja las marcaciones de un bloque.
+
+        Returns:
+            Lista de turnos (username, día, entrada, salida)
+        """
+        col_usuario, col_fecha, col_tipo = posiciones
+        pendientes = self.__pendientes
+        ultimas = self.__ultimas
+        huerfanas = self.__huerfanas
+        entradas, salidas = self.TIPOS_ENTRADA, self.TIPOS_SALIDA
+        completos = []
+        for numero, fila in enumerate(bloque, primera_linea + 1):
+            try:
+                username = fila[col_usuario].strip()
+                texto = fila[col_fecha].strip()
+                tipo = fila[col_tipo].strip().lower()
+                marca = self.__leer_fecha(texto)
+            except (IndexError, ValueError):
+                huerfanas.append((numero, None, None, "fila inválida"))
+                continue
+            if not username or (tipo not in entradas and tipo not in salidas):
+                huerfanas.append((numero, username or None, texto, "fila inválida"))
+                continue
+
+            ultima = ultimas.get(username)
+            if ultima is not None and marca < ultima:
+                huerfanas.append((numero, username, texto, "fuera de orden"))
+                continue
+            ultimas[username] = marca
+
+            pendiente = pendientes.pop(username, None)
+            if tipo in entradas:
+                if pendiente is not None:
+                    huerfanas.append((pendiente[0], username, pendiente[1].isoformat(),
+                                      "entrada sin salida"))
+                pendientes[username] = (numero, marca)
+            elif pendiente is None:
+                huerfanas.append((numero, username, texto, "salida sin entrada"))
+            elif marca - pendiente[1] > self.__max_turno:
+                huerfanas.append((pendiente[0], username, pendiente[1].isoformat(),
+                                  "turno demasiado largo"))
+                huerfanas.append((numero, username, texto, "turno demasiado largo"))
+            else:
+                entrada = pendiente[1]
+                completos.append((username, entrada.date(), entrada, marca))
+        return completos
+
+    def __escribir(self, turnos: list) -> None:
+        """Método privado que escribe un bloque de turnos en los destinos."""
+        if not turnos:
+            return
+        if self.__repositorio is not None:
+            ids = self.__repositorio.guardar_turnos(turnos)
+        else:
+            primero, _ = get_asignador().reservar_bloque("registro_tiempo", len(turnos))
+            ids = range(primero, primero + len(turnos))
+        if self.__libro is not None:
+            registrar = self.__libro.registrar_turno
+            for id_registro, (username, dia, entrada, salida) in zip(ids, turnos):
+                registrar(username, entrada, salida, dia, id_registro)
+
+    def __repr__(self) -> str:
+        """Representación técnica del importador."""
+        return (f"ImportadorMarcaciones(tam_bloque={self.__tam_bloque}, "
+                f"huerfanas={len(self.__huerfanas)})")
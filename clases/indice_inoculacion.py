@@ -0,0 +1,187 @@
+"""
+Clase IndiceInoculacion - Índice ordenado por fecha de inoculación
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import time
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+
+
+class IndiceInoculacion:
+    """
+    Clase que ordena tubulares por su marca de tiempo de inoculación.
+
+    Guarda la lista ordenada de marcas distintas y, para cada marca, el
+    conjunto de claves (tubulares) inoculados en ese instante. Como una
+    inoculación masiva da la misma marca a todo un piso, hay pocas marcas
+    distintas: ubicar un rango de edades es una búsqueda binaria y
+    recorrerlo cuesta lo que el resultado.
+
+    Las claves pueden ser cualquier valor comparable y hashable (la
+    posición en el almacén para una estantería, o (código, posición) para
+    la planta).
+
+    Demuestra:
+    - Encapsulación: Las estructuras del índice son privadas
+    """
+
+    def __init__(self):
+        """Constructor de IndiceInoculacion (índice vacío)."""
+        # Marcas distintas, en orden ascendente
+        self.__marcas = []
+        # marca -> conjunto de claves con esa marca
+        self.__grupos = {}
+        # clave -> marca
+        self.__marca_de = {}
+
+    @staticmethod
+    def limites_por_edad(dias_minimos: float = None, dias_maximos: float = None,
+                         ahora: float = None) -> tuple:
+        """
+        Convierte una edad en días a un rango de marcas de tiempo.
+
+        Args:
+            dias_minimos: Inoculados hace al menos estos días
+            dias_maximos: Inoculados hace como mucho estos días
+            ahora: Marca de tiempo de referencia (por defecto, la actual)
+
+        Returns:
+            Tupla (desde, hasta) con las marcas incluidas (None si no hay límite)
+        """
+        if ahora is None:
+            ahora = time.time()
+        desde = ahora - dias_maximos * 86400 if dias_maximos is not None else None
+        hasta = ahora - dias_minimos * 86400 if dias_minimos is not None else None
+        return desde, hasta
+
+    def cargar(self, pares) -> None:
+        """
+        Agrega muchas claves de una vez.
+
+        Args:
+            pares: Iterable de (clave, marca)
+        """
+        nuevos = {}
+        for clave, marca in pares:
+            self.quitar(clave)
+            nuevos.setdefault(marca, []).append(clave)
+        for marca, claves in nuevos.items():
+            self.agregar_varios(claves, marca)
+
+    def agregar(self, clave, marca: float) -> None:
+        """
+        Agrega una clave (o la mueve si ya estaba con otra marca).
+
+        Args:
+            clave: Clave del tubular
+            marca: Marca de tiempo de inoculación
+        """
+        self.agregar_varios((clave,), marca)
+
+    def agregar_varios(self, claves, marca: float) -> None:
+        """
+        Agrega varias claves con la misma marca de tiempo.
+
+        Args:
+            claves: Claves de los tubulares
+            marca: Marca de tiempo de inoculación
+        """
+        grupo = self.__grupos.get(marca)
+        if grupo is None:
+            grupo = self.__grupos[marca] = set()
+            insort(self.__marcas, marca)
+        marca_de = self.__marca_de
+        for clave in claves:
+            anterior = marca_de.get(clave)
+            if anterior == marca:
+                continue
+            if anterior is not None:
+                self.__sacar(clave, anterior)
+            grupo.add(clave)
+            marca_de[clave] = marca
+        if not grupo:
+            self.__borrar_grupo(marca)
+
+    def quitar(self, clave) -> bool:
+        """
+        Quita una clave del índice.
+
+        Returns:
+            True si estaba en el índice
+        """
+        marca = self.__marca_de.pop(clave, None)
+        if marca is None:
+            return False
+        self.__sacar(clave, marca)
+        return True
+
+    def quitar_varios(self, claves) -> None:
+        """Quita varias claves (las que no están se ignoran)."""
+        for clave in claves:
+            self.quitar(clave)
+
+    def __sacar(self, clave, marca: float) -> None:
+        """Método privado que saca una clave del grupo de su marca."""
+        grupo = self.__grupos[marca]
+        grupo.discard(clave)
+        if not grupo:
+            self.__borrar_grupo(marca)
+
+    def __borrar_grupo(self, marca: float) -> None:
+        """Método privado que elimina una marca sin claves."""
+        del self.__grupos[marca]
+        del self.__marcas[bisect_left(self.__marcas, marca)]
+
+    def get_marca(self, clave) -> float:
+        """Retorna la marca de una clave (None si no está en el índice)."""
+        return self.__marca_de.get(clave)
+
+    def rango(self, desde: float = None, hasta: float = None):
+        """
+        Recorre, de la más antigua a la más reciente, las claves con marca
+        entre 'desde' y 'hasta' (incluidas).
+
+        Args:
+            desde: Marca mínima (None para sin límite)
+            hasta: Marca máxima (None para sin límite)
+
+        Yields:
+            Tuplas (marca, clave)
+        """
+        marcas = self.__marcas
+        inicio = bisect_left(marcas, desde) if desde is not None else 0
+        fin = bisect_right(marcas, hasta) if hasta is not None else len(marcas)
+        for marca in marcas[inicio:fin]:
+            for clave in sorted(self.__grupos[marca]):
+                yield marca, clave
+
+    def contar_rango(self, desde: float = None, hasta: float = None) -> int:
+        """Cuenta las claves con marca entre 'desde' y 'hasta' (incluidas)."""
+        marcas = self.__marcas
+        inicio = bisect_left(marcas, desde) if desde is not None else 0
+        fin = bisect_right(marcas, hasta) if hasta is not None else len(marcas)
+        return sum(len(self.__grupos[marca]) for marca in marcas[inicio:fin])
+
+    def mas_antiguos(self, cantidad: int) -> list:
+        """
+        Retorna las 'cantidad' claves inoculadas hace más tiempo.
+
+        Returns:
+            Lista de tuplas (marca, clave)
+        """
+        return list(islice(self.rango(), cantidad))
+
+    def __len__(self) -> int:
+        """Retorna el número de claves del índice."""
+        return len(self.__marca_de)
+
+    def __contains__(self, clave) -> bool:
+        """Indica si una clave está en el índice."""
+        return clave in self.__marca_de
+
+    def __repr__(self) -> str:
+        """Representación técnica del índice."""
+        return f"IndiceInoculacion(claves={len(self.__marca_de)}, marcas={len(self.__marcas)})"
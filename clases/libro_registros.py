@@ -0,0 +1,362 @@
+"""
+Clase LibroRegistros - Libro columnar de entradas y salidas
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from itertools import groupby
+from clases import eventos
+
+
+class LibroRegistros:
+    """
+    Clase que guarda los turnos de todos los trabajadores en columnas.
+
+    Cada turno es una fila: trabajador, día, entrada y salida (marcas de
+    tiempo), e ID del RegistroTiempo de origen. Las filas solo se agregan;
+    lo único que cambia después es la salida de un turno abierto.
+
+    Además, por trabajador se guardan, ordenados por día, los días y las
+    horas de sus turnos en arreglos compactos. Un rango de fechas es una
+    búsqueda binaria y las horas del rango son la suma de un corte del
+    arreglo (en C), así "horas por semana" u "horas extra del mes" no
+    recorren todos los registros.
+
+    Escucha REGISTRO_ENTRADA y REGISTRO_SALIDA en el bus de eventos para
+    seguir los RegistroTiempo que se marcan.
+
+    Demuestra:
+    - Encapsulación: Las columnas e índices son privados
+    """
+
+    def __init__(self, registros=None):
+        """
+        Constructor de LibroRegistros.
+
+        Args:
+            registros: RegistroTiempo iniciales (opcional)
+        """
+        # Columnas por fila
+        self.__trabajador = array("I")
+        self.__dia = array("i")
+        self.__entrada = array("d")
+        self.__salida = array("d")
+        self.__ids = array("q")
+        # Trabajadores: username <-> número
+        self.__usernames = []
+        self.__numero_de = {}
+        # Por trabajador, ordenados por día: días, horas y fila de cada turno
+        self.__dias_de = []
+        self.__horas_de = []
+        self.__filas_de = []
+        # ID de RegistroTiempo -> fila, y turno abierto de cada trabajador
+        self.__fila_de_id = {}
+        self.__abiertos = {}
+        self.__observadores = []
+        eventos.bus_eventos.suscribir(self.__registro_marcado, eventos.REGISTRO_ENTRADA)
+        eventos.bus_eventos.suscribir(self.__registro_marcado, eventos.REGISTRO_SALIDA)
+        if registros:
+            self.cargar_registros(registros)
+
+    def cerrar(self) -> None:
+        """Deja de escuchar los eventos de registros."""
+        eventos.bus_eventos.desuscribir(self.__registro_marcado, eventos.REGISTRO_ENTRADA)
+        eventos.bus_eventos.desuscribir(self.__registro_marcado, eventos.REGISTRO_SALIDA)
+
+    def agregar_observador(self, funcion) -> None:
+        """
+        Registra una función que se llama cada vez que se cierra un turno.
+
+        La función recibe (username, día, horas) con el día como date.
+
+        Args:
+            funcion: Función a notificar
+        """
+        self.__observadores.append(funcion)
+
+    def quitar_observador(self, funcion) -> None:
+        """Quita una función registrada con agregar_observador."""
+        if funcion in self.__observadores:
+            self.__observadores.remove(funcion)
+
+    def __notificar(self, numero: int, ordinal: int, horas: float) -> None:
+        """Método privado que avisa a los observadores de un turno cerrado."""
+        if self.__observadores:
+            username = self.__usernames[numero]
+            dia = date.fromordinal(ordinal)
+            for funcion in self.__observadores:
+                funcion(username, dia, horas)
+
+    # Alta de turnos
+
+    def registrar_turno(self, username: str, entrada: datetime, salida: datetime = None,
+                        dia: date = None, id_registro: int = None) -> int:
+        """
+        Agrega un turno al libro.
+
+        Args:
+            username: Usuario del trabajador
+            entrada: Hora de entrada
+            salida: Hora de salida (None si el turno sigue abierto)
+            dia: Día de la jornada (por defecto, el de la entrada)
+            id_registro: ID del RegistroTiempo de origen (opcional)
+
+        Returns:
+            Número de fila del turno
+
+        Raises:
+            ValueError: Si el turno queda abierto y el trabajador ya tiene otro abierto
+        """
+        numero = self.__numero_de.get(username)
+        if salida is None and numero in self.__abiertos:
+            raise ValueError(f"{username} ya tiene un turno abierto")
+        if numero is None:
+            numero = self.__numero_de[username] = len(self.__usernames)
+            self.__usernames.append(username)
+            self.__dias_de.append(array("i"))
+            self.__horas_de.append(array("d"))
+            self.__filas_de.append(array("I"))
+
+        fila = len(self.__dia)
+        ordinal = (dia or entrada.date()).toordinal()
+        marca_entrada = entrada.timestamp()
+        marca_salida = salida.timestamp() if salida is not None else math.nan
+        self.__trabajador.append(numero)
+        self.__dia.append(ordinal)
+        self.__entrada.append(marca_entrada)
+        self.__salida.append(marca_salida)
+        self.__ids.append(id_registro if id_registro is not None else -1)
+        if id_registro is not None:
+            self.__fila_de_id[id_registro] = fila
+        if salida is None:
+            self.__abiertos[numero] = fila
+
+        horas = (marca_salida - marca_entrada) / 3600 if salida is not None else 0.0
+        dias = self.__dias_de[numero]
+        if not dias or dias[-1] <= ordinal:
+            dias.append(ordinal)
+            self.__horas_de[numero].append(horas)
+            self.__filas_de[numero].append(fila)
+        else:
+            # Turno de un día anterior (p. ej. importado tarde): se inserta en orden
+            posicion = bisect_right(dias, ordinal)
+            dias.insert(posicion, ordinal)
+            self.__horas_de[numero].insert(posicion, horas)
+            self.__filas_de[numero].insert(posicion, fila)
+        if salida is not None:
+            self.__notificar(numero, ordinal, horas)
+        return fila
+
+    def cerrar_turno(self, fila: int, salida: datetime) -> None:
+        """
+        Registra la salida de un turno abierto.
+
+        Args:
+            fila: Número de fila del turno
+            salida: Hora de salida
+        """
+        if not math.isnan(self.__salida[fila]):
+            raise ValueError(f"El turno {fila} ya tiene salida")
+        numero = self.__trabajador[fila]
+        marca = salida.timestamp()
+        self.__salida[fila] = marca
+        if self.__abiertos.get(numero) == fila:
+            del self.__abiertos[numero]
+        posicion = self.__posicion(numero, fila)
+        horas = (marca - self.__entrada[fila]) / 3600
+        self.__horas_de[numero][posicion] = horas
+        self.__notificar(numero, self.__dia[fila], horas)
+
+    def __posicion(self, numero: int, fila: int) -> int:
+        """Método privado: posición de una fila en los arreglos de su trabajador."""
+        dias = self.__dias_de[numero]
+        filas = self.__filas_de[numero]
+        ordinal = self.__dia[fila]
+        inicio = bisect_left(dias, ordinal)
+        fin = bisect_right(dias, ordinal)
+        return inicio + filas[inicio:fin].index(fila)
+
+    def registrar_entrada(self, username: str, ahora: datetime = None) -> int:
+        """
+        Abre un turno para un trabajador.
+
+        Returns:
+            Número de fila del turno
+
+        Raises:
+            ValueError: Si el trabajador ya tiene un turno abierto
+        """
+        return self.registrar_turno(username, ahora or datetime.now())
+
+    def registrar_salida(self, username: str, ahora: datetime = None) -> int:
+        """
+        Cierra el turno abierto de un trabajador.
+
+        Returns:
+            Número de fila del turno
+
+        Raises:
+            ValueError: Si el trabajador no tiene un turno abierto
+        """
+        fila = self.__abiertos.get(self.__numero_de.get(username))
+        if fila is None:
+            raise ValueError(f"{username} no tiene un turno abierto")
+        self.cerrar_turno(fila, ahora or datetime.now())
+        return fila
+
+    def agregar_registro(self, registro) -> None:
+        """
+        Agrega (o completa) el turno de un RegistroTiempo.
+
+        Los registros sin entrada o sin trabajador se ignoran; si el
+        registro ya estaba y ahora tiene salida, se cierra su turno.
+
+        Args:
+            registro: Instancia de RegistroTiempo
+
+        Raises:
+            ValueError: Si el registro está abierto y su trabajador ya tiene otro abierto
+        """
+        entrada = registro.get_hora_entrada()
+        trabajador = registro.get_trabajador()
+        if entrada is None or trabajador is None:
+            return
+        salida = registro.get_hora_salida()
+        fila = self.__fila_de_id.get(registro.get_id())
+        if fila is None:
+            self.registrar_turno(trabajador.get_username(), entrada, salida,
+                                 registro.get_fecha_registro(), registro.get_id())
+        elif salida is not None and math.isnan(self.__salida[fila]):
+            self.cerrar_turno(fila, salida)
+
+    def cargar_registros(self, registros) -> None:
+        """Agrega varios RegistroTiempo."""
+        for registro in registros:
+            self.agregar_registro(registro)
+
+    def __registro_marcado(self, evento) -> None:
+        """Método privado que sigue las entradas y salidas publicadas."""
+        registro = evento.get_datos().get("registro")
+        if registro is not None and evento.get_nivel() == "info":
+            self.agregar_registro(registro)
+
+    # Consultas
+
+    def __rango(self, numero: int, desde: date, hasta: date) -> tuple:
+        """Método privado: posiciones [inicio, fin) de un trabajador en un rango de días."""
+        dias = self.__dias_de[numero]
+        inicio = bisect_left(dias, desde.toordinal()) if desde is not None else 0
+        fin = bisect_right(dias, hasta.toordinal()) if hasta is not None else len(dias)
+        return inicio, fin
+
+    def __numeros(self, username: str) -> list:
+        """Método privado: trabajadores consultados (uno o todos)."""
+        if username is None:
+            return range(len(self.__usernames))
+        numero = self.__numero_de.get(username)
+        return [] if numero is None else [numero]
+
+    def __horas_por_dia(self, numero: int, desde: date, hasta: date):
+        """Método privado: recorre (ordinal del día, horas del día) de un trabajador."""
+        inicio, fin = self.__rango(numero, desde, hasta)
+        pares = zip(self.__dias_de[numero][inicio:fin], self.__horas_de[numero][inicio:fin])
+        for ordinal, grupo in groupby(pares, key=lambda par: par[0]):
+            yield ordinal, math.fsum(horas for _, horas in grupo)
+
+    def calcular_horas(self, username: str = None, desde: date = None, hasta: date = None) -> float:
+        """
+        Suma las horas de los turnos cerrados en un rango de fechas.
+
+        Args:
+            username: Trabajador (None para todos)
+            desde: Primer día incluido (None sin límite)
+            hasta: Último día incluido (None sin límite)
+
+        Returns:
+            Horas trabajadas, redondeadas a 2 decimales
+        """
+        total = 0.0
+        for numero in self.__numeros(username):
+            inicio, fin = self.__rango(numero, desde, hasta)
+            total += math.fsum(self.__horas_de[numero][inicio:fin])
+        return round(total, 2)
+
+    def obtener_horas_por_trabajador(self, desde: date = None, hasta: date = None) -> dict:
+        """Retorna {username: horas} de todos los trabajadores en el rango."""
+        resultado = {}
+        for numero, username in enumerate(self.__usernames):
+            inicio, fin = self.__rango(numero, desde, hasta)
+            resultado[username] = round(math.fsum(self.__horas_de[numero][inicio:fin]), 2)
+        return resultado
+
+    def obtener_horas_por_dia(self, username: str, desde: date = None, hasta: date = None) -> dict:
+        """Retorna {día: horas} de un trabajador (un día puede tener varios turnos)."""
+        numero = self.__numero_de.get(username)
+        if numero is None:
+            return {}
+        return {date.fromordinal(ordinal): round(horas, 2)
+                for ordinal, horas in self.__horas_por_dia(numero, desde, hasta)}
+
+    def obtener_horas_por_semana(self, username: str, desde: date = None, hasta: date = None) -> dict:
+        """Retorna {(año, semana ISO): horas} de un trabajador."""
+        semanas = {}
+        for dia, horas in self.obtener_horas_por_dia(username, desde, hasta).items():
+            clave = tuple(dia.isocalendar())[:2]
+            semanas[clave] = round(semanas.get(clave, 0.0) + horas, 2)
+        return semanas
+
+    def es_jornada_completa(self, username: str, dia: date, horas_esperadas: float = 8.0) -> bool:
+        """Indica si un trabajador completó la jornada de un día."""
+        return self.obtener_horas_por_dia(username, dia, dia).get(dia, 0.0) >= horas_esperadas
+
+    def contar_jornadas_completas(self, username: str = None, desde: date = None,
+                                  hasta: date = None, horas_esperadas: float = 8.0) -> int:
+        """Cuenta los días con al menos 'horas_esperadas' en el rango."""
+        return sum(1 for numero in self.__numeros(username)
+                   for _, horas in self.__horas_por_dia(numero, desde, hasta)
+                   if round(horas, 2) >= horas_esperadas)
+
+    def detectar_horas_extra(self, username: str = None, desde: date = None,
+                             hasta: date = None, jornada_normal: float = 8.0) -> float:
+        """
+        Suma las horas extra (lo que pasa de 'jornada_normal' cada día).
+
+        Returns:
+            Horas extra, redondeadas a 2 decimales
+        """
+        return round(math.fsum(max(0.0, horas - jornada_normal)
+                               for numero in self.__numeros(username)
+                               for _, horas in self.__horas_por_dia(numero, desde, hasta)), 2)
+
+    def obtener_horas_extra_por_trabajador(self, desde: date = None, hasta: date = None,
+                                           jornada_normal: float = 8.0) -> dict:
+        """Retorna {username: horas extra} de los trabajadores con horas extra en el rango."""
+        resultado = {}
+        for username in self.__usernames:
+            extra = self.detectar_horas_extra(username, desde, hasta, jornada_normal)
+            if extra:
+                resultado[username] = extra
+        return resultado
+
+    def get_turnos_abiertos(self) -> dict:
+        """Retorna {username: hora de entrada} de los turnos sin salida."""
+        return {self.__usernames[numero]: datetime.fromtimestamp(self.__entrada[fila])
+                for numero, fila in self.__abiertos.items()}
+
+    def get_usernames(self) -> list:
+        """Retorna los trabajadores con turnos en el libro."""
+        return list(self.__usernames)
+
+    def __len__(self) -> int:
+        """Retorna el número de turnos del libro."""
+        return len(self.__dia)
+
+    def __repr__(self) -> str:
+        """Representación técnica del libro."""
+        return (f"LibroRegistros(turnos={len(self.__dia)}, trabajadores={len(self.__usernames)}, "
+                f"abiertos={len(self.__abiertos)})")
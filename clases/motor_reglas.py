@@ -0,0 +1,424 @@
+"""
+Clases Regla y MotorReglas - Alertas automáticas a partir de los cambios
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import heapq
+import re
+import time
+from abc import ABC, abstractmethod
+from clases import eventos
+from clases.alerta import Alerta
+from clases.estanteria import Estanteria, ObservadorEstanteria
+
+
+class Regla(ABC):
+    """
+    Clase abstracta de una regla que genera alertas.
+
+    Cada regla indica qué cambios pueden afectarla, para que el motor solo
+    la evalúe cuando ocurre uno de ellos.
+
+    Demuestra:
+    - Abstracción: Define la interfaz común de las reglas
+    - Polimorfismo: Cada regla evalúa una condición distinta
+    """
+
+    TIPO_ALERTA = "sistema"
+    # True si la regla se evalúa por piso, False si por estantería
+    POR_PISO = False
+    # Mensaje de sus alertas, con los grupos "codigo" (y "piso" si es por piso);
+    # permite reconocer las alertas guardadas de la regla
+    PATRON = None
+
+    def __init__(self, nombre: str):
+        """
+        Constructor de Regla.
+
+        Args:
+            nombre: Nombre único de la regla
+        """
+        self.__nombre = nombre
+
+    def get_nombre(self) -> str:
+        """Retorna el nombre de la regla."""
+        return self.__nombre
+
+    def afectada_por_tubulares(self, anterior: str, nuevo: str) -> bool:
+        """Indica si un cambio de estado de tubulares puede cambiar el resultado."""
+        return False
+
+    def clave_alerta(self, alerta: Alerta):
+        """
+        Reconoce una alerta guardada generada por esta regla.
+
+        Args:
+            alerta: Instancia de Alerta
+
+        Returns:
+            Tupla (nombre de regla, código, piso) como la usa MotorReglas,
+            o None si la alerta no es de esta regla
+        """
+        if self.PATRON is None or alerta.get_tipo() != self.TIPO_ALERTA:
+            return None
+        coincidencia = self.PATRON.match(alerta.get_mensaje())
+        if coincidencia is None:
+            return None
+        estanteria = alerta.get_estanteria()
+        codigo = estanteria.get_codigo() if estanteria is not None else coincidencia.group("codigo")
+        piso = int(coincidencia.group("piso")) if self.POR_PISO else None
+        return (self.__nombre, codigo, piso)
+
+    def proximo_vencimiento(self, estanteria: Estanteria):
+        """
+        Para reglas que dependen del tiempo: marca de tiempo en la que la
+        regla empezaría a cumplirse si nada cambia (None si no aplica).
+        """
+        return None
+
+    @abstractmethod
+    def evaluar(self, estanteria: Estanteria, numero_piso: int, ahora: float):
+        """
+        Evalúa la regla.
+
+        Args:
+            estanteria: Estantería evaluada
+            numero_piso: Piso evaluado (None en reglas por estantería)
+            ahora: Marca de tiempo actual
+
+        Returns:
+            Mensaje de la alerta si la condición se cumple, None si no
+        """
+        pass
+
+    def __repr__(self) -> str:
+        """Representación técnica de la regla."""
+        return f"{type(self).__name__}(nombre='{self.__nombre}')"
+
+
+class ReglaDefectosPiso(Regla):
+    """Alerta cuando un piso tiene más tubulares defectuosos que el máximo."""
+
+    TIPO_ALERTA = "defecto"
+    POR_PISO = True
+    PATRON = re.compile(r"Estantería (?P<codigo>.+), piso (?P<piso>\d+): \d+ tubulares defectuosos")
+
+    def __init__(self, maximo: int = 10):
+        """
+        Args:
+            maximo: Defectuosos permitidos por piso (10 es el umbral "crítico" del piso)
+        """
+        super().__init__("defectos_piso")
+        self.__maximo = maximo
+
+    def afectada_por_tubulares(self, anterior: str, nuevo: str) -> bool:
+        """Solo los cambios que entran o salen de "defectuoso"."""
+        return "defectuoso" in (anterior, nuevo)
+
+    def evaluar(self, estanteria: Estanteria, numero_piso: int, ahora: float):
+        """Compara el contador de defectuosos del piso contra el máximo."""
+        defectuosos = estanteria.get_piso(numero_piso).contar_tubulares_defectuosos()
+        if defectuosos > self.__maximo:
+            return (f"Estantería {estanteria.get_codigo()}, piso {numero_piso}: "
+                    f"{defectuosos} tubulares defectuosos (máximo {self.__maximo})")
+        return None
+
+
+class ReglaEficiencia(Regla):
+    """Alerta cuando la eficiencia de una estantería baja del mínimo."""
+
+    TIPO_ALERTA = "produccion"
+    PATRON = re.compile(r"Estantería (?P<codigo>.+): eficiencia ")
+
+    def __init__(self, minimo: float = 95.0):
+        """
+        Args:
+            minimo: Eficiencia mínima en porcentaje
+        """
+        super().__init__("eficiencia")
+        self.__minimo = minimo
+
+    def afectada_por_tubulares(self, anterior: str, nuevo: str) -> bool:
+        """La eficiencia solo depende de los defectuosos."""
+        return "defectuoso" in (anterior, nuevo)
+
+    def evaluar(self, estanteria: Estanteria, numero_piso: int, ahora: float):
+        """Compara la eficiencia de la estantería contra el mínimo."""
+        eficiencia = estanteria.calcular_eficiencia_total()
+        if eficiencia < self.__minimo:
+            return (f"Estantería {estanteria.get_codigo()}: eficiencia {eficiencia}% "
+                    f"(mínimo {self.__minimo}%)")
+        return None
+
+
+class ReglaRevisionVencida(Regla):
+    """Alerta cuando una estantería activa lleva demasiado sin revisión."""
+
+    TIPO_ALERTA = "tiempo"
+    PATRON = re.compile(r"Estantería (?P<codigo>.+): [\d.]+ días sin revisión")
+
+    def __init__(self, dias: float = 7):
+        """
+        Args:
+            dias: Días permitidos entre revisiones
+        """
+        super().__init__("revision_vencida")
+        self.__dias = dias
+
+    def __ultima_revision(self, estanteria: Estanteria):
+        """Método privado: última revisión o, si no hay, el inicio de producción."""
+        if not estanteria.esta_activa():
+            return None
+        return estanteria.get_fecha_ultima_revision() or estanteria.get_fecha_inicio()
+
+    def proximo_vencimiento(self, estanteria: Estanteria):
+        """La revisión vence 'dias' después de la última."""
+        ultima = self.__ultima_revision(estanteria)
+        return ultima.timestamp() + self.__dias * 86400 if ultima else None
+
+    def evaluar(self, estanteria: Estanteria, numero_piso: int, ahora: float):
+        """Compara el tiempo desde la última revisión contra el máximo."""
+        vencimiento = self.proximo_vencimiento(estanteria)
+        if vencimiento is not None and ahora >= vencimiento:
+            dias = (ahora - vencimiento) / 86400 + self.__dias
+            return f"Estantería {estanteria.get_codigo()}: {dias:.1f} días sin revisión"
+        return None
+
+
+class MotorReglas(ObservadorEstanteria):
+    """
+    Clase que evalúa reglas de forma incremental y genera alertas.
+
+    Observa las estanterías registradas y, ante cada cambio, evalúa solo
+    las reglas que ese cambio puede afectar (y solo en el piso afectado
+    para las reglas por piso). Las reglas que dependen del tiempo dejan un
+    vencimiento en un heap y revisar_vencimientos() evalúa solo los que
+    ya vencieron, sin recorrer todas las estanterías.
+
+    Hay como mucho una alerta abierta por (regla, estantería, piso); si la
+    condición deja de cumplirse, la alerta se marca como resuelta.
+
+    Demuestra:
+    - Herencia: extends ObservadorEstanteria
+    - Composición: Contiene objetos Regla
+    - Asociación: Crea objetos Alerta ligados a su Estanteria
+    """
+
+    def __init__(self, reglas: list = None):
+        """
+        Constructor de MotorReglas.
+
+        Args:
+            reglas: Reglas iniciales (por defecto: defectos por piso,
+                    eficiencia y revisión vencida)
+        """
+        if reglas is None:
+            reglas = [ReglaDefectosPiso(), ReglaEficiencia(), ReglaRevisionVencida()]
+        self.__reglas = {}
+        self.__estanterias = {}
+        # (nombre de regla, código, piso) -> Alerta abierta
+        self.__abiertas = {}
+        self.__alertas = []
+        # Entradas (vencimiento, código, nombre de regla) y el vencimiento vigente de cada una
+        self.__heap = []
+        self.__vencimientos = {}
+        for regla in reglas:
+            self.agregar_regla(regla)
+
+    def agregar_regla(self, regla: Regla) -> None:
+        """
+        Agrega una regla y la evalúa en las estanterías registradas.
+
+        Args:
+            regla: Instancia de Regla
+        """
+        if regla.get_nombre() in self.__reglas:
+            raise ValueError(f"Ya existe una regla llamada {regla.get_nombre()}")
+        self.__reglas[regla.get_nombre()] = regla
+        ahora = time.time()
+        for estanteria in self.__estanterias.values():
+            self.__evaluar_completa(regla, estanteria, ahora)
+
+    def get_reglas(self) -> list:
+        """Retorna la lista de reglas."""
+        return list(self.__reglas.values())
+
+    def registrar_estanteria(self, estanteria: Estanteria) -> None:
+        """
+        Empieza a observar una estantería y evalúa todas las reglas una vez.
+
+        Args:
+            estanteria: Instancia de Estanteria
+        """
+        self.__estanterias[estanteria.get_codigo()] = estanteria
+        estanteria.agregar_observador(self)
+        ahora = time.time()
+        for regla in self.__reglas.values():
+            self.__evaluar_completa(regla, estanteria, ahora)
+
+    def cargar_alertas_abiertas(self, alertas) -> int:
+        """
+        Retoma las alertas pendientes guardadas (por ejemplo, al iniciar el sistema).
+
+        Cada alerta que una regla reconoce (ver Regla.clave_alerta) pasa a
+        ser la alerta abierta de su (regla, estantería, piso), así no se
+        abre otra igual y se resuelve sola si la condición ya no se cumple.
+        Si hay varias pendientes para la misma clave, se conserva la más
+        antigua y las demás se marcan como resueltas. Debe llamarse antes
+        de registrar las estanterías.
+
+        Args:
+            alertas: Alertas guardadas (las resueltas se ignoran)
+
+        Returns:
+            Número de alertas retomadas
+        """
+        retomadas = 0
+        for alerta in sorted(alertas, key=lambda alerta: alerta.get_id()):
+            if alerta.esta_resuelta():
+                continue
+            for regla in self.__reglas.values():
+                clave = regla.clave_alerta(alerta)
+                if clave is None:
+                    continue
+                if clave in self.__abiertas:
+                    alerta.marcar_resuelta()
+                else:
+                    self.__abiertas[clave] = alerta
+                    self.__alertas.append(alerta)
+                    retomadas += 1
+                break
+        return retomadas
+
+    def registrar_planta(self, planta) -> None:
+        """Observa todas las estanterías de una planta."""
+        for estanteria in planta:
+            self.registrar_estanteria(estanteria)
+
+    def quitar_estanteria(self, estanteria: Estanteria) -> None:
+        """Deja de observar una estantería (sus alertas se conservan)."""
+        codigo = estanteria.get_codigo()
+        estanteria.quitar_observador(self)
+        self.__estanterias.pop(codigo, None)
+        for clave in [clave for clave in self.__abiertas if clave[1] == codigo]:
+            del self.__abiertas[clave]
+        for clave in [clave for clave in self.__vencimientos if clave[0] == codigo]:
+            del self.__vencimientos[clave]
+
+    # Avisos de las estanterías (ObservadorEstanteria)
+
+    def tubulares_cambiados(self, estanteria, numero_piso: int, anterior: str,
+                            nuevo: str, cantidad: int) -> None:
+        """Evalúa las reglas afectadas por el cambio, solo en el piso afectado."""
+        ahora = None
+        for regla in self.__reglas.values():
+            if regla.afectada_por_tubulares(anterior, nuevo):
+                ahora = ahora or time.time()
+                self.__evaluar(regla, estanteria, numero_piso if regla.POR_PISO else None, ahora)
+
+    def fase_cambiada(self, estanteria, fase_anterior: str, fase_nueva: str) -> None:
+        """Reprograma las reglas de tiempo de la estantería."""
+        self.__reprogramar(estanteria)
+
+    def estanteria_activada(self, estanteria) -> None:
+        """Reprograma las reglas de tiempo de la estantería."""
+        self.__reprogramar(estanteria)
+
+    def revision_registrada(self, estanteria) -> None:
+        """Reprograma las reglas de tiempo de la estantería."""
+        self.__reprogramar(estanteria)
+
+    # Evaluación
+
+    def __evaluar_completa(self, regla: Regla, estanteria: Estanteria, ahora: float) -> None:
+        """Método privado: evalúa una regla en todos sus pisos y programa su vencimiento."""
+        if regla.POR_PISO:
+            for numero in range(1, Estanteria.NUMERO_PISOS + 1):
+                self.__evaluar(regla, estanteria, numero, ahora)
+        else:
+            self.__evaluar(regla, estanteria, None, ahora)
+        self.__programar(regla, estanteria)
+
+    def __reprogramar(self, estanteria: Estanteria) -> None:
+        """Método privado: reevalúa y reprograma las reglas que dependen del tiempo."""
+        ahora = time.time()
+        for regla in self.__reglas.values():
+            if (estanteria.get_codigo(), regla.get_nombre()) in self.__vencimientos or \
+                    regla.proximo_vencimiento(estanteria) is not None:
+                self.__evaluar_completa(regla, estanteria, ahora)
+
+    def __programar(self, regla: Regla, estanteria: Estanteria) -> None:
+        """Método privado que deja (o quita) el vencimiento de una regla."""
+        clave = (estanteria.get_codigo(), regla.get_nombre())
+        vencimiento = regla.proximo_vencimiento(estanteria)
+        if vencimiento is None:
+            self.__vencimientos.pop(clave, None)
+        elif self.__vencimientos.get(clave) != vencimiento:
+            self.__vencimientos[clave] = vencimiento
+            heapq.heappush(self.__heap, (vencimiento, clave[0], clave[1]))
+
+    def __evaluar(self, regla: Regla, estanteria: Estanteria, numero_piso, ahora: float) -> None:
+        """Método privado: evalúa una regla y abre o resuelve su alerta."""
+        clave = (regla.get_nombre(), estanteria.get_codigo(), numero_piso)
+        mensaje = regla.evaluar(estanteria, numero_piso, ahora)
+        alerta = self.__abiertas.get(clave)
+        if alerta is not None and alerta.esta_resuelta():
+            # Resuelta a mano: si la condición sigue, se abre una nueva
+            del self.__abiertas[clave]
+            alerta = None
+
+        if mensaje is not None and alerta is None:
+            alerta = Alerta(regla.TIPO_ALERTA, mensaje, estanteria)
+            self.__abiertas[clave] = alerta
+            self.__alertas.append(alerta)
+            eventos.publicar(eventos.ALERTA_CREADA, f"🔔 Alerta #{alerta.get_id()}: {mensaje}",
+                             "aviso", alerta=alerta, regla=regla.get_nombre())
+        elif mensaje is None and alerta is not None:
+            del self.__abiertas[clave]
+            alerta.marcar_resuelta()
+
+    def revisar_vencimientos(self, ahora: float = None) -> int:
+        """
+        Evalúa las reglas de tiempo cuyo vencimiento ya llegó.
+
+        Args:
+            ahora: Marca de tiempo de referencia (por defecto, la actual)
+
+        Returns:
+            Número de reglas evaluadas
+        """
+        if ahora is None:
+            ahora = time.time()
+        evaluadas = 0
+        heap = self.__heap
+        while heap and heap[0][0] <= ahora:
+            vencimiento, codigo, nombre = heapq.heappop(heap)
+            if self.__vencimientos.get((codigo, nombre)) != vencimiento:
+                continue
+            del self.__vencimientos[(codigo, nombre)]
+            regla = self.__reglas[nombre]
+            estanteria = self.__estanterias[codigo]
+            if regla.POR_PISO:
+                for numero in range(1, Estanteria.NUMERO_PISOS + 1):
+                    self.__evaluar(regla, estanteria, numero, ahora)
+            else:
+                self.__evaluar(regla, estanteria, None, ahora)
+            evaluadas += 1
+        return evaluadas
+
+    # Consultas
+
+    def get_alertas(self) -> list:
+        """Retorna todas las alertas generadas por el motor (copia)."""
+        return list(self.__alertas)
+
+    def get_alertas_abiertas(self) -> list:
+        """Retorna las alertas que siguen abiertas."""
+        return [alerta for alerta in self.__abiertas.values() if not alerta.esta_resuelta()]
+
+    def __repr__(self) -> str:
+        """Representación técnica del motor."""
+        return (f"MotorReglas(reglas={len(self.__reglas)}, estanterias={len(self.__estanterias)}, "
+                f"abiertas={len(self.__abiertas)})")
@@ -0,0 +1,429 @@
+"""
+Canales y DespachadorNotificaciones - Envío asíncrono de alertas
+Sistema de Gestión de Producción de Orellanas
+
+Las alertas se encolan sin esperar y un bucle asyncio, en un hilo
+aparte, las reparte a los canales (archivo, webhook, funciones del
+proceso). Un canal lento solo atrasa su propia cola.
+
+Fecha: Noviembre 2025
+"""
+
+import asyncio
+import json
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import deque
+from clases import eventos
+
+
+class CanalNotificacion(ABC):
+    """
+    Clase abstracta de un destino de notificaciones.
+
+    Demuestra:
+    - Abstracción: Define cómo se envía un lote de alertas
+    - Polimorfismo: Cada canal envía a su manera
+    """
+
+    def __init__(self, nombre: str):
+        """
+        Constructor de CanalNotificacion.
+
+        Args:
+            nombre: Nombre único del canal
+        """
+        self.__nombre = nombre
+
+    def get_nombre(self) -> str:
+        """Retorna el nombre del canal."""
+        return self.__nombre
+
+    @abstractmethod
+    async def enviar(self, alertas: list) -> None:
+        """
+        Envía un lote de alertas (lanza una excepción si falla).
+
+        Args:
+            alertas: Lista de Alerta
+        """
+        pass
+
+    def cerrar(self) -> None:
+        """Libera los recursos del canal."""
+        pass
+
+    def __repr__(self) -> str:
+        """Representación técnica del canal."""
+        return f"{type(self).__name__}(nombre='{self.__nombre}')"
+
+
+class CanalArchivo(CanalNotificacion):
+    """Canal que agrega las alertas a un archivo de texto, una por línea."""
+
+    def __init__(self, ruta: str, nombre: str = "archivo"):
+        """
+        Constructor de CanalArchivo.
+
+        Args:
+            ruta: Ruta del archivo (se abre en modo agregar)
+            nombre: Nombre del canal
+        """
+        super().__init__(nombre)
+        self.__ruta = ruta
+        self.__archivo = open(ruta, "a", encoding="utf-8")
+
+    def get_ruta(self) -> str:
+        """Retorna la ruta del archivo."""
+        return self.__ruta
+
+    async def enviar(self, alertas: list) -> None:
+        """Escribe el lote en un hilo para no bloquear el bucle."""
+        await asyncio.to_thread(self.__escribir, alertas)
+
+    def __escribir(self, alertas: list) -> None:
+        """Método privado: fecha, nivel, tipo, ID y mensaje de cada alerta."""
+        self.__archivo.write("".join(
+            f"{alerta.get_fecha_creacion().isoformat()}\t{alerta.get_nivel()}\t"
+            f"{alerta.get_tipo()}\t#{alerta.get_id()}\t{alerta.get_mensaje()}\n"
+            for alerta in alertas))
+        self.__archivo.flush()
+
+    def cerrar(self) -> None:
+        """Cierra el archivo."""
+        if not self.__archivo.closed:
+            self.__archivo.close()
+
+
+class CanalWebhook(CanalNotificacion):
+    """Canal que envía las alertas como JSON por HTTP POST (p. ej. a un servicio local)."""
+
+    def __init__(self, url: str, timeout: float = 5.0, nombre: str = "webhook"):
+        """
+        Constructor de CanalWebhook.
+
+        Args:
+            url: Dirección que recibe el POST
+            timeout: Segundos máximos por petición
+            nombre: Nombre del canal
+        """
+        super().__init__(nombre)
+        self.__url = url
+        self.__timeout = timeout
+
+    def get_url(self) -> str:
+        """Retorna la dirección del webhook."""
+        return self.__url
+
+    async def enviar(self, alertas: list) -> None:
+        """Hace el POST en un hilo para no bloquear el bucle."""
+        await asyncio.to_thread(self.__publicar, alertas)
+
+    def __publicar(self, alertas: list) -> None:
+        """Método privado: envía {"alertas": [...]} con las estadísticas de cada alerta."""
+        cuerpo = [dict(alerta.obtener_estadisticas(), mensaje=alerta.get_mensaje())
+                  for alerta in alertas]
+        peticion = urllib.request.Request(
+            self.__url, data=json.dumps({"alertas": cuerpo}, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(peticion, timeout=self.__timeout) as respuesta:
+            respuesta.read()
+
+
+class CanalSuscriptores(CanalNotificacion):
+    """Canal que entrega las alertas a funciones del propio proceso."""
+
+    def __init__(self, nombre: str = "suscriptores"):
+        """
+        Constructor de CanalSuscriptores.
+
+        Args:
+            nombre: Nombre del canal
+        """
+        super().__init__(nombre)
+        self.__funciones = []
+
+    def suscribir(self, funcion) -> None:
+        """
+        Registra una función que recibe cada lote (puede ser async).
+
+        Args:
+            funcion: Función que recibe una lista de Alerta
+        """
+        self.__funciones.append(funcion)
+
+    def desuscribir(self, funcion) -> None:
+        """Quita una función registrada."""
+        if funcion in self.__funciones:
+            self.__funciones.remove(funcion)
+
+    async def enviar(self, alertas: list) -> None:
+        """Llama a cada función con el lote."""
+        for funcion in list(self.__funciones):
+            resultado = funcion(alertas)
+            if asyncio.iscoroutine(resultado):
+                await resultado
+
+
+class _ColaCanal:
+    """Colas y contadores de un canal dentro del despachador."""
+
+    __slots__ = ("canal", "critica", "normal", "limite", "senal",
+                 "enviadas", "fallidas", "descartadas", "ultimo_error")
+
+    def __init__(self, canal: CanalNotificacion):
+        self.canal = canal
+        self.critica = deque()
+        self.normal = deque()
+        # Momento (time.monotonic) en que el lote normal pendiente debe salir
+        self.limite = None
+        self.senal = None
+        self.enviadas = 0
+        self.fallidas = 0
+        self.descartadas = 0
+        self.ultimo_error = None
+
+
+class DespachadorNotificaciones:
+    """
+    Clase que reparte alertas a varios canales sin bloquear a quien las genera.
+
+    - Cada canal tiene dos colas acotadas: la de alertas "critico" (se
+      envían una a una, antes que las demás) y la normal, cuyas alertas se
+      juntan en lotes de hasta 'tam_lote' o 'intervalo' segundos.
+    - Si una cola se llena se descarta la alerta más vieja de esa cola y se
+      cuenta: quien notifica nunca espera.
+    - Un envío que falla se reintenta con espera exponencial.
+    - Los canales corren en tareas separadas de un bucle asyncio en su
+      propio hilo, así uno lento no atrasa a los demás.
+
+    Demuestra:
+    - Agregación: Tiene objetos CanalNotificacion
+    - Encapsulación: Colas, hilo y bucle son privados
+    """
+
+    def __init__(self, canales: list = None, capacidad: int = 1000, tam_lote: int = 50,
+                 intervalo: float = 2.0, reintentos: int = 3, espera_reintento: float = 0.5):
+        """
+        Constructor de DespachadorNotificaciones.
+
+        Args:
+            canales: Canales iniciales
+            capacidad: Alertas máximas por cola de cada canal
+            tam_lote: Alertas no críticas máximas por envío
+            intervalo: Segundos máximos que una alerta no crítica espera su lote
+            reintentos: Reintentos de un envío fallido
+            espera_reintento: Segundos antes del primer reintento (se duplica en cada uno)
+        """
+        self.__capacidad = capacidad
+        self.__tam_lote = tam_lote
+        self.__intervalo = intervalo
+        self.__reintentos = reintentos
+        self.__espera_reintento = espera_reintento
+        self.__colas = {}
+        self.__cerrojo = threading.Lock()
+        self.__bucle = None
+        self.__hilo = None
+        self.__activo = False
+        self.__listo = threading.Event()
+        self.__tipos_bus = ()
+        for canal in canales or []:
+            self.agregar_canal(canal)
+
+    def agregar_canal(self, canal: CanalNotificacion) -> None:
+        """
+        Agrega un canal (antes de iniciar el despachador).
+
+        Args:
+            canal: Instancia de CanalNotificacion
+        """
+        if self.__activo:
+            raise RuntimeError("No se pueden agregar canales con el despachador en marcha")
+        if canal.get_nombre() in self.__colas:
+            raise ValueError(f"Ya existe un canal llamado {canal.get_nombre()}")
+        self.__colas[canal.get_nombre()] = _ColaCanal(canal)
+
+    def get_canales(self) -> list:
+        """Retorna los canales configurados."""
+        return [cola.canal for cola in self.__colas.values()]
+
+    # Entrada de alertas (desde cualquier hilo)
+
+    def notificar(self, alerta) -> None:
+        """
+        Encola una alerta en todos los canales y retorna de inmediato.
+
+        Args:
+            alerta: Instancia de Alerta
+        """
+        critica = alerta.get_nivel() == "critico"
+        ahora = time.monotonic()
+        with self.__cerrojo:
+            for cola in self.__colas.values():
+                destino = cola.critica if critica else cola.normal
+                if len(destino) >= self.__capacidad:
+                    destino.popleft()
+                    cola.descartadas += 1
+                if not critica and not destino:
+                    cola.limite = ahora + self.__intervalo
+                destino.append(alerta)
+        self.__despertar()
+
+    def conectar_bus(self, tipos: tuple = (eventos.ALERTA_CREADA, eventos.ALERTA_URGENTE)) -> None:
+        """
+        Notifica automáticamente las alertas de los eventos indicados.
+
+        Args:
+            tipos: Tipos de evento con una alerta en sus datos
+        """
+        self.desconectar_bus()
+        self.__tipos_bus = tuple(tipos)
+        for tipo in self.__tipos_bus:
+            eventos.bus_eventos.suscribir(self.__evento_alerta, tipo)
+
+    def desconectar_bus(self) -> None:
+        """Deja de recibir alertas del bus de eventos."""
+        for tipo in self.__tipos_bus:
+            eventos.bus_eventos.desuscribir(self.__evento_alerta, tipo)
+        self.__tipos_bus = ()
+
+    def __evento_alerta(self, evento) -> None:
+        """Método privado que encola la alerta de un evento del bus."""
+        alerta = evento.get_datos().get("alerta")
+        if alerta is not None:
+            self.notificar(alerta)
+
+    def __despertar(self) -> None:
+        """Método privado que avisa a las tareas de los canales que hay trabajo."""
+        bucle = self.__bucle
+        if bucle is not None and self.__listo.is_set():
+            try:
+                bucle.call_soon_threadsafe(self.__senalar)
+            except RuntimeError:
+                # El bucle ya se cerró
+                pass
+
+    def __senalar(self) -> None:
+        """Método privado (en el bucle): activa la señal de cada canal."""
+        for cola in self.__colas.values():
+            cola.senal.set()
+
+    # Ciclo de vida
+
+    def iniciar(self) -> None:
+        """Arranca el hilo con el bucle asyncio y una tarea por canal."""
+        if self.__activo:
+            return
+        self.__activo = True
+        self.__listo.clear()
+        self.__hilo = threading.Thread(target=self.__ejecutar_bucle, name="notificaciones",
+                                       daemon=True)
+        self.__hilo.start()
+        self.__listo.wait()
+
+    def detener(self, timeout: float = 10.0) -> None:
+        """
+        Envía lo pendiente, detiene el hilo y cierra los canales.
+
+        Args:
+            timeout: Segundos máximos de espera
+        """
+        if not self.__activo:
+            return
+        self.__activo = False
+        self.__despertar()
+        self.__hilo.join(timeout)
+        self.__hilo = None
+        for cola in self.__colas.values():
+            cola.canal.cerrar()
+
+    def esta_activo(self) -> bool:
+        """Indica si el despachador está en marcha."""
+        return self.__activo
+
+    def __ejecutar_bucle(self) -> None:
+        """Método privado: cuerpo del hilo del despachador."""
+        asyncio.run(self.__principal())
+
+    async def __principal(self) -> None:
+        """Método privado: crea una tarea por canal y espera a que terminen."""
+        self.__bucle = asyncio.get_running_loop()
+        for cola in self.__colas.values():
+            cola.senal = asyncio.Event()
+            cola.senal.set()
+        self.__listo.set()
+        try:
+            await asyncio.gather(*(self.__atender(cola) for cola in self.__colas.values()))
+        finally:
+            self.__listo.clear()
+            self.__bucle = None
+
+    async def __atender(self, cola: _ColaCanal) -> None:
+        """Método privado: envía las alertas de un canal mientras haya o siga activo."""
+        while True:
+            cola.senal.clear()
+            ahora = time.monotonic()
+            with self.__cerrojo:
+                if cola.critica:
+                    lote = [cola.critica.popleft()]
+                elif cola.normal and (len(cola.normal) >= self.__tam_lote
+                                      or ahora >= cola.limite or not self.__activo):
+                    lote = [cola.normal.popleft()
+                            for _ in range(min(self.__tam_lote, len(cola.normal)))]
+                    cola.limite = ahora + self.__intervalo if cola.normal else None
+                else:
+                    lote = None
+                espera = max(0.0, cola.limite - ahora) if cola.normal else None
+            if lote:
+                await self.__enviar(cola, lote)
+                continue
+            if not self.__activo:
+                return
+            try:
+                await asyncio.wait_for(cola.senal.wait(), espera)
+            except asyncio.TimeoutError:
+                pass
+
+    async def __enviar(self, cola: _ColaCanal, lote: list) -> None:
+        """Método privado: envía un lote con reintentos y espera exponencial."""
+        espera = self.__espera_reintento
+        for intento in range(self.__reintentos + 1):
+            try:
+                await cola.canal.enviar(lote)
+                cola.enviadas += len(lote)
+                return
+            except Exception as error:
+                cola.ultimo_error = f"{type(error).__name__}: {error}"
+                if intento < self.__reintentos and self.__activo:
+                    await asyncio.sleep(espera)
+                    espera *= 2
+        cola.fallidas += len(lote)
+
+    # Estadísticas
+
+    def contar_pendientes(self) -> int:
+        """Retorna las alertas que esperan envío en todos los canales."""
+        with self.__cerrojo:
+            return sum(len(cola.critica) + len(cola.normal) for cola in self.__colas.values())
+
+    def obtener_estadisticas(self) -> dict:
+        """
+        Obtiene los contadores de cada canal.
+
+        Returns:
+            Diccionario {canal: {enviadas, fallidas, descartadas, pendientes, ultimo_error}}
+        """
+        with self.__cerrojo:
+            return {nombre: {"enviadas": cola.enviadas,
+                             "fallidas": cola.fallidas,
+                             "descartadas": cola.descartadas,
+                             "pendientes": len(cola.critica) + len(cola.normal),
+                             "ultimo_error": cola.ultimo_error}
+                    for nombre, cola in self.__colas.items()}
+
+    def __repr__(self) -> str:
+        """Representación técnica del despachador."""
+        return (f"DespachadorNotificaciones(canales={len(self.__colas)}, "
+                f"activo={self.__activo}, pendientes={self.contar_pendientes()})")
@@ -6,7 +6,11 @@ Autor: [Tu nombre]
 Fecha: Noviembre 2024
 """
 
+import time
+from datetime import datetime
+from clases import eventos
 from clases.tubular import Tubular
+from clases.almacen_tubulares import AlmacenTubulares
 
 
 class Piso:
@@ -17,21 +21,36 @@ class Piso:
     Demuestra:
     - Encapsulación: Atributos privados
     - Composición: Contiene objetos Tubular
+
+    El estado de los tubulares se guarda en un AlmacenTubulares: el piso
+    ocupa un segmento de 80 posiciones del almacén que recibe, y sus
+    conteos se leen de los contadores de ese segmento. Los objetos Tubular
+    se crean solo cuando se accede a ellos por primera vez. El estado
+    general también se calcula de esos contadores en cada consulta, así
+    refleja cualquier cambio, incluso los hechos tubular por tubular.
     """
     
 
     TUBULARES_POR_PISO = 80
+    ESTADOS_VALIDOS = ["vacío", "inoculado", "en_desarrollo", "producción", "cosechado"]
     
-    def __init__(self, numero: int):
+    def __init__(self, numero: int, almacen: AlmacenTubulares = None, segmento: int = 0):
         """
         Constructor de Piso.
         
         Args:
             numero: Número del piso (1-4)
+            almacen: Almacén compartido con la estantería (uno propio si es None)
+            segmento: Segmento del almacén que ocupa el piso
         """
         self.__numero = numero
-        self.__tubulares = [Tubular(i + 1) for i in range(self.TUBULARES_POR_PISO)]
-        self.__estado_general = "vacío"
+        if almacen is None:
+            almacen = AlmacenTubulares(self.TUBULARES_POR_PISO)
+        self.__almacen = almacen
+        self.__segmento = segmento
+        self.__inicio = segmento * self.TUBULARES_POR_PISO
+        # Vistas Tubular ya creadas (None hasta el primer acceso)
+        self.__tubulares = None
     
     def get_numero(self) -> int:
         """Retorna el número del piso."""
@@ -39,11 +58,11 @@ class Piso:
     
     def get_tubulares(self) -> list:
         """Retorna la lista de tubulares (copia)."""
-        return self.__tubulares.copy()
+        return [self.get_tubular_por_numero(numero) for numero in range(1, self.TUBULARES_POR_PISO + 1)]
     
     def get_estado_general(self) -> str:
         """Retorna el estado general del piso."""
-        return self.__estado_general
+        return self.calcular_estado_general(self.contar_tubulares_por_estado())
     
     def get_tubular_por_numero(self, numero: int):
         """
@@ -56,7 +75,13 @@ class Piso:
             Instancia de Tubular o None si no existe
         """
         if 1 <= numero <= self.TUBULARES_POR_PISO:
-            return self.__tubulares[numero - 1]
+            if self.__tubulares is None:
+                self.__tubulares = [None] * self.TUBULARES_POR_PISO
+            tubular = self.__tubulares[numero - 1]
+            if tubular is None:
+                tubular = Tubular(numero, self.__almacen, self.__inicio + numero - 1)
+                self.__tubulares[numero - 1] = tubular
+            return tubular
         return None
     
     def contar_tubulares_por_estado(self) -> dict:
@@ -66,23 +91,7 @@ class Piso:
         Returns:
             Diccionario con conteo por estado
         """
-        conteo = {
-            "vacío": 0,
-            "inoculado": 0,
-            "en_desarrollo": 0,
-            "producción": 0,
-            "cosechado": 0,
-            "defectuoso": 0
-        }
-        
-        for tubular in self.__tubulares:
-            estado = tubular.get_estado()
-            if tubular.es_defectuoso():
-                conteo["defectuoso"] += 1
-            elif estado in conteo:
-                conteo[estado] += 1
-        
-        return conteo
+        return self.__almacen.contar_por_estado(self.__segmento)
     
     def contar_tubulares_defectuosos(self) -> int:
         """
@@ -91,23 +100,64 @@ class Piso:
         Returns:
             Número de tubulares defectuosos
         """
-        return sum(1 for tubular in self.__tubulares if tubular.es_defectuoso())
+        return self.__almacen.contar_defectuosos(self.__segmento)
     
     def inocular_piso(self) -> None:
         """
         Inocula todos los tubulares vacíos del piso.
         """
-        inoculados = 0
-        for tubular in self.__tubulares:
-            if tubular.get_estado() == "vacío":
-                tubular.inocular()
-                inoculados += 1
+        inoculados = self.__almacen.transicionar("inoculado", "vacío", self.__inicio,
+                                                 self.__inicio + self.TUBULARES_POR_PISO,
+                                                 fecha_inoculacion=datetime.now())
         
         if inoculados > 0:
-            print(f"✓ Piso {self.__numero}: {inoculados} tubulares inoculados")
-            self.__actualizar_estado_general()
+            eventos.publicar(eventos.PISO_INOCULADO,
+                             f"✓ Piso {self.__numero}: {inoculados} tubulares inoculados",
+                             piso=self.__numero, cantidad=inoculados)
         else:
-            print(f"ℹ️ Piso {self.__numero}: No hay tubulares vacíos para inocular")
+            eventos.publicar(eventos.PISO_INOCULADO,
+                             f"ℹ️ Piso {self.__numero}: No hay tubulares vacíos para inocular",
+                             "aviso", piso=self.__numero, cantidad=0)
+    
+    def transicionar_tubulares(self, nuevo_estado: str, estado: str = None,
+                               dias_minimos: float = None, dias_maximos: float = None) -> int:
+        """
+        Cambia de estado, en una sola pasada, los tubulares del piso que
+        cumplan el filtro. Los tubulares defectuosos no se modifican.
+        
+        Args:
+            nuevo_estado: Estado destino
+            estado: Estado de origen requerido (None para cualquiera)
+            dias_minimos: Solo tubulares inoculados hace al menos estos días
+            dias_maximos: Solo tubulares inoculados hace como mucho estos días
+            
+        Returns:
+            Número de tubulares que cambiaron de estado
+        """
+        if nuevo_estado not in self.ESTADOS_VALIDOS or (estado is not None and estado not in self.ESTADOS_VALIDOS):
+            raise ValueError(f"Estado inválido. Debe ser: {', '.join(self.ESTADOS_VALIDOS)}")
+        
+        ahora = time.time()
+        inoculado_antes = ahora - dias_minimos * 86400 if dias_minimos is not None else None
+        inoculado_despues = ahora - dias_maximos * 86400 if dias_maximos is not None else None
+        
+        return self.__almacen.transicionar(nuevo_estado, estado, self.__inicio,
+                                           self.__inicio + self.TUBULARES_POR_PISO,
+                                           inoculado_antes, inoculado_despues)
+    
+    def get_primera_inoculacion(self, estado: str):
+        """
+        Retorna la marca de tiempo de inoculación más antigua de los
+        tubulares del piso que están en un estado.
+        
+        Args:
+            estado: Estado buscado
+            
+        Returns:
+            Marca de tiempo (epoch) o None si no hay tubulares con fecha en ese estado
+        """
+        return self.__almacen.primera_inoculacion(estado, self.__inicio,
+                                                  self.__inicio + self.TUBULARES_POR_PISO)
     
     def marcar_tubular_defectuoso(self, numero_tubular: int, observacion: str = "") -> bool:
         """
@@ -126,28 +176,46 @@ class Piso:
                 tubular.marcar_defectuoso()
                 if observacion:
                     tubular.agregar_observacion(observacion)
-                self.__actualizar_estado_general()
                 return True
             else:
-                print(f"ℹ️ Tubular {numero_tubular} ya estaba defectuoso")
+                eventos.publicar(eventos.PISO_AVISO,
+                                 f"ℹ️ Tubular {numero_tubular} ya estaba defectuoso",
+                                 "aviso", piso=self.__numero, numero=numero_tubular)
         else:
-            print(f"✗ Tubular {numero_tubular} no existe en el piso {self.__numero}")
+            eventos.publicar(eventos.PISO_AVISO,
+                             f"✗ Tubular {numero_tubular} no existe en el piso {self.__numero}",
+                             "error", piso=self.__numero, numero=numero_tubular)
         return False
     
-    def __actualizar_estado_general(self) -> None:
-        """Método privado para actualizar el estado general del piso."""
-        conteo = self.contar_tubulares_por_estado()
+    def verificar_consistencia(self) -> None:
+        """
+        Verifica los contadores del piso contra un reconteo completo.
+
+        Raises:
+            RuntimeError: Si los contadores no coinciden
+        """
+        self.__almacen.verificar_consistencia()
+    
+    @classmethod
+    def calcular_estado_general(cls, conteo: dict) -> str:
+        """
+        Calcula el estado general de un piso a partir de su conteo por estado.
         
+        Args:
+            conteo: Diccionario con conteo por estado (ver contar_tubulares_por_estado)
+            
+        Returns:
+            'crítico', 'óptimo', 'en desarrollo', 'vacío' o 'mixto'
+        """
         if conteo["defectuoso"] > 10:
-            self.__estado_general = "crítico"
+            return "crítico"
         elif conteo["producción"] > 30:
-            self.__estado_general = "óptimo"
+            return "óptimo"
         elif conteo["en_desarrollo"] > 40:
-            self.__estado_general = "en desarrollo"
-        elif conteo["vacío"] == self.TUBULARES_POR_PISO:
-            self.__estado_general = "vacío"
-        else:
-            self.__estado_general = "mixto"
+            return "en desarrollo"
+        elif conteo["vacío"] == cls.TUBULARES_POR_PISO:
+            return "vacío"
+        return "mixto"
     
     def calcular_porcentaje_ocupacion(self) -> float:
         """
@@ -156,8 +224,7 @@ class Piso:
         Returns:
             Porcentaje de ocupación (0-100)
         """
-        conteo = self.contar_tubulares_por_estado()
-        ocupados = sum(conteo[estado] for estado in ["inoculado", "en_desarrollo", "producción", "cosechado", "defectuoso"])
+        ocupados = self.__almacen.contar_ocupados(self.__segmento)
         return (ocupados / self.TUBULARES_POR_PISO) * 100
     
     def generar_reporte_piso(self) -> str:
@@ -175,7 +242,7 @@ class Piso:
 ========================================
 REPORTE PISO {self.__numero}
 ========================================
-Estado general: {self.__estado_general}
+Estado general: {self.calcular_estado_general(conteo)}
 Ocupación: {porcentaje_ocupacion:.1f}%
 Tubulares totales: {self.TUBULARES_POR_PISO}
 Tubulares defectuosos: {defectuosos}
@@ -201,7 +268,7 @@ DISTRIBUCIÓN POR ESTADO:
         
         return {
             "numero_piso": self.__numero,
-            "estado_general": self.__estado_general,
+            "estado_general": self.calcular_estado_general(conteo),
             "tubulares_totales": self.TUBULARES_POR_PISO,
             "porcentaje_ocupacion": self.calcular_porcentaje_ocupacion(),
             "distribucion_estados": conteo,
@@ -211,8 +278,8 @@ DISTRIBUCIÓN POR ESTADO:
     def __str__(self) -> str:
         """Representación en string del piso."""
         defectuosos = self.contar_tubulares_defectuosos()
-        return f"Piso {self.__numero} [{self.__estado_general}] - Defectuosos: {defectuosos}"
+        return f"Piso {self.__numero} [{self.get_estado_general()}] - Defectuosos: {defectuosos}"
     
     def __repr__(self) -> str:
         """Representación técnica del piso."""
-        return f"Piso(numero={self.__numero}, estado='{self.__estado_general}')"
+        return f"Piso(numero={self.__numero}, estado='{self.get_estado_general()}')"
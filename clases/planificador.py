@@ -0,0 +1,235 @@
+"""
+Clase PlanificadorCiclo - Avanza automáticamente el ciclo de los tubulares
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import heapq
+import time
+from clases import eventos
+from clases.estanteria import Estanteria, ObservadorEstanteria
+
+
+class PlanificadorCiclo(ObservadorEstanteria):
+    """
+    Clase que avanza los tubulares por su ciclo cuando se cumple su tiempo.
+
+    Ciclo: inoculado -> en_desarrollo -> producción -> cosechado. Cada
+    estado dura un número de días (configurable por fase de la estantería)
+    contado de forma acumulada desde la fecha de inoculación: con 14 días
+    de inoculado y 7 de desarrollo, un tubular pasa a producción 21 días
+    después de inocularse.
+
+    Los vencimientos se guardan en un heap, uno por (estantería, piso,
+    estado): el del tubular más antiguo de ese piso en ese estado. Se
+    programan cuando el piso recibe tubulares en un estado (aviso del
+    observador) y al vencer se hace una transición masiva del piso con
+    filtro de edad, así el costo depende del número de transiciones y no
+    del tamaño de la planta. Los tubulares sin fecha de inoculación o
+    defectuosos no se avanzan.
+
+    Demuestra:
+    - Herencia: extends ObservadorEstanteria
+    - Encapsulación: El heap y la configuración son privados
+    """
+
+    SIGUIENTE = {"inoculado": "en_desarrollo", "en_desarrollo": "producción",
+                 "producción": "cosechado"}
+    # Días en cada estado antes de pasar al siguiente
+    DURACIONES_POR_DEFECTO = {"inoculado": 14, "en_desarrollo": 7, "producción": 21}
+
+    def __init__(self, duraciones_por_fase: dict = None):
+        """
+        Constructor de PlanificadorCiclo.
+
+        Args:
+            duraciones_por_fase: {fase: {estado: días}} que reemplaza las
+                                 duraciones por defecto en esa fase (días None
+                                 para no avanzar ese estado automáticamente)
+        """
+        self.__duraciones = {fase: dict(self.DURACIONES_POR_DEFECTO) for fase in Estanteria.FASES}
+        self.__estanterias = {}
+        # Entradas (vencimiento, codigo, piso, estado); las que no coinciden con
+        # __pendientes quedaron reemplazadas y se descartan al salir
+        self.__heap = []
+        self.__pendientes = {}
+        for fase, duraciones in (duraciones_por_fase or {}).items():
+            for estado, dias in duraciones.items():
+                self.set_duracion(fase, estado, dias)
+
+    # Configuración
+
+    def set_duracion(self, fase: str, estado: str, dias: float) -> None:
+        """
+        Cambia los días que dura un estado en una fase.
+
+        Args:
+            fase: Fase de la estantería
+            estado: 'inoculado', 'en_desarrollo' o 'producción'
+            dias: Días en el estado (None para no avanzarlo automáticamente)
+        """
+        if fase not in self.__duraciones:
+            raise ValueError(f"Fase inválida. Debe ser: {', '.join(Estanteria.FASES)}")
+        if estado not in self.SIGUIENTE:
+            raise ValueError(f"Estado sin siguiente: {estado}")
+        if dias is not None and dias < 0:
+            raise ValueError("Los días no pueden ser negativos")
+        self.__duraciones[fase][estado] = dias
+        for estanteria in self.__estanterias.values():
+            if estanteria.get_fase() == fase:
+                self.__programar_estanteria(estanteria)
+
+    def get_duracion(self, fase: str, estado: str):
+        """Retorna los días que dura un estado en una fase (None si no avanza)."""
+        return self.__duraciones[fase].get(estado)
+
+    def calcular_edad_salida(self, fase: str, estado: str):
+        """
+        Calcula la edad (días desde la inoculación) a la que un tubular sale
+        de un estado en una fase.
+
+        Returns:
+            Días acumulados o None si algún estado del camino no avanza
+        """
+        total = 0
+        for paso in self.SIGUIENTE:
+            dias = self.__duraciones[fase].get(paso)
+            if dias is None:
+                return None
+            total += dias
+            if paso == estado:
+                return total
+        return None
+
+    # Registro de estanterías
+
+    def registrar_estanteria(self, estanteria: Estanteria) -> None:
+        """
+        Empieza a planificar una estantería (programa lo que ya tiene).
+
+        Args:
+            estanteria: Instancia de Estanteria
+        """
+        self.__estanterias[estanteria.get_codigo()] = estanteria
+        estanteria.agregar_observador(self)
+        self.__programar_estanteria(estanteria)
+
+    def registrar_planta(self, planta) -> None:
+        """Empieza a planificar todas las estanterías de una planta."""
+        for estanteria in planta:
+            self.registrar_estanteria(estanteria)
+
+    def quitar_estanteria(self, estanteria: Estanteria) -> None:
+        """Deja de planificar una estantería."""
+        codigo = estanteria.get_codigo()
+        estanteria.quitar_observador(self)
+        self.__estanterias.pop(codigo, None)
+        for clave in [clave for clave in self.__pendientes if clave[0] == codigo]:
+            del self.__pendientes[clave]
+
+    # Avisos de las estanterías (ObservadorEstanteria)
+
+    def tubulares_cambiados(self, estanteria, numero_piso: int, anterior: str,
+                            nuevo: str, cantidad: int) -> None:
+        """Programa el vencimiento de los tubulares que entraron a un estado."""
+        if nuevo in self.SIGUIENTE:
+            self.__programar(estanteria, numero_piso, nuevo)
+
+    def fase_cambiada(self, estanteria, fase_anterior: str, fase_nueva: str) -> None:
+        """Reprograma la estantería con las duraciones de su nueva fase."""
+        self.__programar_estanteria(estanteria)
+
+    # Programación
+
+    def __programar_estanteria(self, estanteria: Estanteria) -> None:
+        """Método privado que programa todos los pisos de una estantería."""
+        conteo = estanteria.contar_tubulares_por_estado()
+        estados = [estado for estado in self.SIGUIENTE if conteo[estado]]
+        if not estados:
+            return
+        for numero in range(1, Estanteria.NUMERO_PISOS + 1):
+            for estado in estados:
+                self.__programar(estanteria, numero, estado)
+
+    def __programar(self, estanteria: Estanteria, numero_piso: int, estado: str) -> None:
+        """Método privado: (re)programa el vencimiento de un estado en un piso."""
+        codigo = estanteria.get_codigo()
+        if codigo not in self.__estanterias:
+            return
+        clave = (codigo, numero_piso, estado)
+        edad = self.calcular_edad_salida(estanteria.get_fase(), estado)
+        marca = estanteria.get_piso(numero_piso).get_primera_inoculacion(estado)
+        if edad is None or marca is None:
+            self.__pendientes.pop(clave, None)
+            return
+        vencimiento = marca + edad * 86400
+        if self.__pendientes.get(clave) != vencimiento:
+            self.__pendientes[clave] = vencimiento
+            heapq.heappush(self.__heap, (vencimiento, codigo, numero_piso, estado))
+
+    def proximo_vencimiento(self):
+        """Retorna la marca de tiempo del próximo vencimiento (None si no hay)."""
+        heap = self.__heap
+        while heap:
+            vencimiento, codigo, numero_piso, estado = heap[0]
+            if self.__pendientes.get((codigo, numero_piso, estado)) == vencimiento:
+                return vencimiento
+            heapq.heappop(heap)
+        return None
+
+    def contar_pendientes(self) -> int:
+        """Retorna el número de vencimientos programados."""
+        return len(self.__pendientes)
+
+    def ejecutar_vencidos(self, ahora: float = None) -> int:
+        """
+        Avanza los tubulares cuyo tiempo en su estado ya se cumplió.
+
+        Args:
+            ahora: Marca de tiempo de referencia (por defecto, la actual)
+
+        Returns:
+            Número de tubulares que cambiaron de estado
+        """
+        if ahora is None:
+            ahora = time.time()
+        vencidos = []
+        heap = self.__heap
+        while heap and heap[0][0] <= ahora:
+            vencimiento, codigo, numero_piso, estado = heapq.heappop(heap)
+            if self.__pendientes.get((codigo, numero_piso, estado)) == vencimiento:
+                del self.__pendientes[(codigo, numero_piso, estado)]
+                vencidos.append((codigo, numero_piso, estado))
+
+        total = 0
+        for codigo, numero_piso, estado in vencidos:
+            estanteria = self.__estanterias.get(codigo)
+            if estanteria is None:
+                continue
+            edad = self.calcular_edad_salida(estanteria.get_fase(), estado)
+            if edad is None:
+                continue
+            # La transición avisa al observador y eso programa el siguiente estado
+            piso = estanteria.get_piso(numero_piso)
+            dias = edad + (time.time() - ahora) / 86400
+            cambiados = piso.transicionar_tubulares(self.SIGUIENTE[estado], estado, dias_minimos=dias)
+            if cambiados:
+                total += cambiados
+                eventos.publicar(eventos.PISO_CICLO_AVANZADO,
+                                 f"✓ Estantería {codigo}, piso {numero_piso}: {cambiados} tubulares "
+                                 f"pasaron de '{estado}' a '{self.SIGUIENTE[estado]}'",
+                                 codigo=codigo, piso=numero_piso, estado=estado,
+                                 nuevo_estado=self.SIGUIENTE[estado], cantidad=cambiados)
+            # Los tubulares del piso que aún no cumplen su tiempo
+            self.__programar(estanteria, numero_piso, estado)
+        return total
+
+    def __len__(self) -> int:
+        """Retorna el número de vencimientos programados."""
+        return len(self.__pendientes)
+
+    def __repr__(self) -> str:
+        """Representación técnica del planificador."""
+        return (f"PlanificadorCiclo(estanterias={len(self.__estanterias)}, "
+                f"pendientes={len(self.__pendientes)})")
@@ -0,0 +1,365 @@
+"""
+Clase Planta - Representa la planta completa con todas sus estanterías
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+from clases.estanteria import Estanteria, ObservadorEstanteria
+from clases.almacen_tubulares import AlmacenTubulares
+from clases.indice_inoculacion import IndiceInoculacion
+from itertools import islice
+
+
+class Planta(ObservadorEstanteria):
+    """
+    Clase que agrupa todas las estanterías de la planta.
+
+    Mantiene totales acumulados (por estado, por fase, activas, defectuosos)
+    que se actualizan con los cambios que notifica cada estantería, de modo
+    que los totales de la planta se leen en tiempo constante sin importar
+    cuántas estanterías haya.
+
+    Demuestra:
+    - Agregación: Contiene objetos Estanteria
+    - Herencia: extends ObservadorEstanteria
+    - Encapsulación: Atributos privados
+    """
+
+    def __init__(self, nombre: str = "Planta principal"):
+        """
+        Constructor de Planta.
+
+        Args:
+            nombre: Nombre de la planta
+        """
+        self.__nombre = nombre
+        self.__estanterias = {}
+        self.__conteo = self.__conteo_vacio()
+        self.__activas = 0
+        self.__por_fase = {fase: {"estanterias": 0, "tubulares": self.__conteo_vacio()}
+                           for fase in Estanteria.FASES}
+        # Índice por fecha de inoculación de toda la planta (se construye en el primer uso)
+        self.__indice_inoculacion = None
+
+    @staticmethod
+    def __conteo_vacio() -> dict:
+        """Método privado que crea un diccionario de conteo en cero."""
+        return {estado: 0 for estado in AlmacenTubulares.ESTADOS}
+
+    def get_nombre(self) -> str:
+        """Retorna el nombre de la planta."""
+        return self.__nombre
+
+    def get_estanteria(self, codigo: str):
+        """
+        Obtiene una estantería por su código.
+
+        Args:
+            codigo: Código de la estantería
+
+        Returns:
+            Instancia de Estanteria o None si no existe
+        """
+        return self.__estanterias.get(codigo)
+
+    def get_estanterias(self) -> list:
+        """Retorna la lista de estanterías (copia)."""
+        return list(self.__estanterias.values())
+
+    def agregar_estanteria(self, estanteria: Estanteria) -> None:
+        """
+        Agrega una estantería a la planta y suma sus conteos a los totales.
+
+        Args:
+            estanteria: Instancia de Estanteria
+        """
+        codigo = estanteria.get_codigo()
+        if codigo in self.__estanterias:
+            raise ValueError(f"Ya existe una estantería con código {codigo}")
+
+        self.__estanterias[codigo] = estanteria
+        self.__sumar_estanteria(estanteria, 1)
+        if self.__indice_inoculacion is not None:
+            self.__indexar_estanteria(estanteria)
+        estanteria.agregar_observador(self)
+
+    def quitar_estanteria(self, codigo: str) -> bool:
+        """
+        Quita una estantería de la planta.
+
+        Args:
+            codigo: Código de la estantería
+
+        Returns:
+            True si se quitó, False si no existía
+        """
+        estanteria = self.__estanterias.pop(codigo, None)
+        if estanteria is None:
+            return False
+        estanteria.quitar_observador(self)
+        self.__sumar_estanteria(estanteria, -1)
+        if self.__indice_inoculacion is not None:
+            self.__desindexar_estanteria(codigo)
+        return True
+
+    def __sumar_estanteria(self, estanteria: Estanteria, signo: int) -> None:
+        """Método privado que suma (o resta) los conteos de una estantería."""
+        conteo = estanteria.contar_tubulares_por_estado()
+        fase = self.__por_fase[estanteria.get_fase()]
+        fase["estanterias"] += signo
+        for estado, cantidad in conteo.items():
+            self.__conteo[estado] += signo * cantidad
+            fase["tubulares"][estado] += signo * cantidad
+        if estanteria.esta_activa():
+            self.__activas += signo
+
+    # Propagación de cambios (ObservadorEstanteria)
+
+    def tubulares_cambiados(self, estanteria, numero_piso: int, anterior: str,
+                            nuevo: str, cantidad: int) -> None:
+        """Actualiza los totales con el cambio de estado de unos tubulares."""
+        self.__conteo[anterior] -= cantidad
+        self.__conteo[nuevo] += cantidad
+        tubulares_fase = self.__por_fase[estanteria.get_fase()]["tubulares"]
+        tubulares_fase[anterior] -= cantidad
+        tubulares_fase[nuevo] += cantidad
+
+    def fase_cambiada(self, estanteria, fase_anterior: str, fase_nueva: str) -> None:
+        """Mueve los conteos de la estantería de una fase a otra."""
+        if fase_anterior == fase_nueva:
+            return
+        origen = self.__por_fase[fase_anterior]
+        destino = self.__por_fase[fase_nueva]
+        origen["estanterias"] -= 1
+        destino["estanterias"] += 1
+        for estado, cantidad in estanteria.contar_tubulares_por_estado().items():
+            origen["tubulares"][estado] -= cantidad
+            destino["tubulares"][estado] += cantidad
+
+    def estanteria_activada(self, estanteria) -> None:
+        """Suma una estantería activa."""
+        self.__activas += 1
+
+    def fechas_cambiadas(self, estanteria, posiciones: list, marca: float) -> None:
+        """Actualiza el índice de inoculación de la planta."""
+        indice = self.__indice_inoculacion
+        if indice is None:
+            return
+        codigo = estanteria.get_codigo()
+        if posiciones is None:
+            self.__desindexar_estanteria(codigo)
+            self.__indexar_estanteria(estanteria)
+        elif marca:
+            indice.agregar_varios([(codigo, posicion) for posicion in posiciones], marca)
+        else:
+            indice.quitar_varios([(codigo, posicion) for posicion in posiciones])
+
+    # Índice de inoculación
+
+    def __indexar_estanteria(self, estanteria: Estanteria) -> None:
+        """Método privado que agrega los tubulares fechados de una estantería al índice."""
+        codigo = estanteria.get_codigo()
+        self.__indice_inoculacion.cargar(((codigo, posicion), marca)
+                                         for posicion, marca in estanteria.listar_fechas_inoculacion())
+
+    def __desindexar_estanteria(self, codigo: str) -> None:
+        """Método privado que quita del índice los tubulares de una estantería."""
+        self.__indice_inoculacion.quitar_varios((codigo, posicion)
+                                                for posicion in range(Estanteria.TUBULARES_TOTALES))
+
+    def get_indice_inoculacion(self) -> IndiceInoculacion:
+        """
+        Retorna el índice por fecha de inoculación de toda la planta.
+
+        Se construye en el primer uso y luego se mantiene con los cambios
+        que notifican las estanterías. Las claves son (código, posición).
+        """
+        if self.__indice_inoculacion is None:
+            self.__indice_inoculacion = IndiceInoculacion()
+            for estanteria in self.__estanterias.values():
+                self.__indexar_estanteria(estanteria)
+        return self.__indice_inoculacion
+
+    def buscar_tubulares_por_edad(self, dias_minimos: float = None, dias_maximos: float = None,
+                                  estado: str = None) -> list:
+        """
+        Busca en toda la planta los tubulares inoculados hace entre
+        dias_minimos y dias_maximos, sin recorrer todas las estanterías.
+
+        Ejemplo: buscar_tubulares_por_edad(dias_minimos=14, estado="inoculado")
+
+        Args:
+            dias_minimos: Inoculados hace al menos estos días
+            dias_maximos: Inoculados hace como mucho estos días
+            estado: Solo tubulares en este estado (None para cualquiera)
+
+        Returns:
+            Lista de tuplas (Estanteria, Tubular), del más antiguo al más reciente
+        """
+        desde, hasta = IndiceInoculacion.limites_por_edad(dias_minimos, dias_maximos)
+        return list(self.__resolver(self.get_indice_inoculacion().rango(desde, hasta), estado))
+
+    def tubulares_mas_antiguos(self, cantidad: int, estado: str = None) -> list:
+        """
+        Retorna los tubulares de la planta inoculados hace más tiempo.
+
+        Args:
+            cantidad: Número máximo de tubulares
+            estado: Solo tubulares en este estado (None para cualquiera)
+
+        Returns:
+            Lista de tuplas (Estanteria, Tubular), del más antiguo al más reciente
+        """
+        return list(islice(self.__resolver(self.get_indice_inoculacion().rango(), estado), cantidad))
+
+    def __resolver(self, pares, estado: str):
+        """Método privado: convierte pares (marca, (código, posición)) en (Estanteria, Tubular)."""
+        for _, (codigo, posicion) in pares:
+            estanteria = self.__estanterias[codigo]
+            tubular = estanteria.get_tubular_en(posicion)
+            if estado is None or tubular.get_estado() == estado:
+                yield estanteria, tubular
+
+    # Operaciones masivas
+
+    def transicionar_tubulares(self, nuevo_estado: str, estado: str = None,
+                               dias_minimos: float = None, dias_maximos: float = None,
+                               piso_desde: int = 1, piso_hasta: int = Estanteria.NUMERO_PISOS,
+                               codigos: list = None, fase: str = None) -> dict:
+        """
+        Cambia de estado los tubulares que cumplan el filtro en varias estanterías.
+
+        Ejemplo: transicionar_tubulares("en_desarrollo", "inoculado",
+                                        dias_minimos=14, fase="germinación")
+
+        Args:
+            nuevo_estado: Estado destino
+            estado: Estado de origen requerido (None para cualquiera)
+            dias_minimos: Solo tubulares inoculados hace al menos estos días
+            dias_maximos: Solo tubulares inoculados hace como mucho estos días
+            piso_desde: Primer piso incluido (1-4)
+            piso_hasta: Último piso incluido (1-4)
+            codigos: Códigos de estanterías a incluir (None para todas)
+            fase: Solo estanterías en esta fase (None para cualquiera)
+
+        Returns:
+            Diccionario {codigo: tubulares cambiados} de las estanterías modificadas
+        """
+        if codigos is None:
+            estanterias = self.__estanterias.values()
+        else:
+            estanterias = [self.__estanterias[c] for c in codigos if c in self.__estanterias]
+
+        resultado = {}
+        for estanteria in estanterias:
+            if fase is not None and estanteria.get_fase() != fase:
+                continue
+            cambiados = estanteria.transicionar_tubulares(nuevo_estado, estado, dias_minimos,
+                                                          dias_maximos, piso_desde, piso_hasta)
+            if cambiados:
+                resultado[estanteria.get_codigo()] = cambiados
+        return resultado
+
+    # Consultas de totales
+
+    def contar_estanterias(self) -> int:
+        """Retorna el número de estanterías de la planta."""
+        return len(self.__estanterias)
+
+    def contar_estanterias_activas(self) -> int:
+        """Retorna el número de estanterías activas."""
+        return self.__activas
+
+    def contar_tubulares_total(self) -> int:
+        """Retorna el total de tubulares de la planta."""
+        return len(self.__estanterias) * Estanteria.TUBULARES_TOTALES
+
+    def contar_tubulares_por_estado(self) -> dict:
+        """Retorna el conteo de tubulares por estado en toda la planta."""
+        return self.__conteo.copy()
+
+    def contar_defectuosos_total(self) -> int:
+        """Retorna el total de tubulares defectuosos de la planta."""
+        return self.__conteo["defectuoso"]
+
+    def calcular_eficiencia_total(self) -> float:
+        """
+        Calcula la eficiencia general de la planta.
+
+        Returns:
+            Porcentaje de eficiencia (0-100)
+        """
+        total_tubulares = self.contar_tubulares_total()
+        if total_tubulares == 0:
+            return 100.0
+        eficiencia = ((total_tubulares - self.contar_defectuosos_total()) / total_tubulares) * 100
+        return round(eficiencia, 2)
+
+    def contar_por_fase(self) -> dict:
+        """
+        Retorna los totales agrupados por fase.
+
+        Returns:
+            Diccionario {fase: {"estanterias": n, "tubulares": conteo por estado}}
+        """
+        return {fase: {"estanterias": datos["estanterias"], "tubulares": datos["tubulares"].copy()}
+                for fase, datos in self.__por_fase.items()}
+
+    def verificar_consistencia(self) -> None:
+        """
+        Compara los totales acumulados contra un recorrido de todas las estanterías.
+
+        Raises:
+            RuntimeError: Si algún total no coincide
+        """
+        conteo = self.__conteo_vacio()
+        por_fase = {fase: {"estanterias": 0, "tubulares": self.__conteo_vacio()}
+                    for fase in Estanteria.FASES}
+        activas = 0
+        for estanteria in self.__estanterias.values():
+            estanteria.verificar_consistencia()
+            fase = por_fase[estanteria.get_fase()]
+            fase["estanterias"] += 1
+            for estado, cantidad in estanteria.contar_tubulares_por_estado().items():
+                conteo[estado] += cantidad
+                fase["tubulares"][estado] += cantidad
+            if estanteria.esta_activa():
+                activas += 1
+        if conteo != self.__conteo or activas != self.__activas or por_fase != self.__por_fase:
+            raise RuntimeError(f"Totales inconsistentes en la planta {self.__nombre}")
+
+    def obtener_estadisticas(self) -> dict:
+        """
+        Obtiene las estadísticas generales de la planta.
+
+        Returns:
+            Diccionario con estadísticas
+        """
+        return {
+            "nombre": self.__nombre,
+            "estanterias_totales": self.contar_estanterias(),
+            "estanterias_activas": self.__activas,
+            "tubulares_totales": self.contar_tubulares_total(),
+            "tubulares_defectuosos": self.contar_defectuosos_total(),
+            "eficiencia": self.calcular_eficiencia_total(),
+            "distribucion_estados": self.contar_tubulares_por_estado(),
+            "por_fase": self.contar_por_fase()
+        }
+
+    def __iter__(self):
+        """Permite recorrer las estanterías de la planta."""
+        return iter(list(self.__estanterias.values()))
+
+    def __len__(self) -> int:
+        """Retorna el número de estanterías."""
+        return len(self.__estanterias)
+
+    def __str__(self) -> str:
+        """Representación en string de la planta."""
+        return (f"Planta '{self.__nombre}' - Estanterías: {len(self.__estanterias)} "
+                f"(activas: {self.__activas}) - Defectuosos: {self.contar_defectuosos_total()}")
+
+    def __repr__(self) -> str:
+        """Representación técnica de la planta."""
+        return f"Planta(nombre='{self.__nombre}', estanterias={len(self.__estanterias)})"
@@ -8,6 +8,7 @@ Fecha: Noviembre 2024
 """
 
 from datetime import datetime
+from clases.asignador_ids import siguiente_id
 
 
 class Publicacion:
@@ -19,7 +20,8 @@ class Publicacion:
     - Agregación: Tiene una relación con Usuario (autor)
     """
     
-    _contador_id = 0
+    __slots__ = ("__id", "__titulo", "__contenido", "__autor", "__fecha_publicacion",
+                 "__prioridad", "__activa")
     
     def __init__(self, titulo: str, contenido: str, autor):
         """
@@ -30,8 +32,7 @@ class Publicacion:
             contenido: Contenido/cuerpo de la publicación
             autor: Instancia de Usuario que crea la publicación
         """
-        Publicacion._contador_id += 1
-        self.__id = Publicacion._contador_id
+        self.__id = siguiente_id("publicacion")
         self.__titulo = titulo
         self.__contenido = contenido
         self.__autor = autor  
@@ -6,6 +6,8 @@ Fecha: Noviembre 2025
 """
 
 from datetime import datetime
+from clases.asignador_ids import siguiente_id
+from clases import eventos
 
 
 class RegistroTiempo:
@@ -18,7 +20,8 @@ class RegistroTiempo:
     - Agregación: Tiene una relación con Trabajador
     """
     
-    _contador_id = 0
+    __slots__ = ("__id", "__trabajador", "__fecha_registro", "__hora_entrada",
+                 "__hora_salida", "__horas_trabajadas", "__completo")
     
     def __init__(self, trabajador):
         """
@@ -27,8 +30,7 @@ class RegistroTiempo:
         Args:
             trabajador: Instancia de Trabajador
         """
-        RegistroTiempo._contador_id += 1
-        self.__id = RegistroTiempo._contador_id
+        self.__id = siguiente_id("registro_tiempo")
         self.__trabajador = trabajador  
         self.__fecha_registro = datetime.now().date()
         self.__hora_entrada = None
@@ -36,6 +38,34 @@ class RegistroTiempo:
         self.__horas_trabajadas = 0.0
         self.__completo = False
     
+    @classmethod
+    def restaurar(cls, id_registro: int, trabajador, fecha_registro, hora_entrada=None,
+                  hora_salida=None, horas_trabajadas: float = 0.0, completo: bool = False):
+        """
+        Reconstruye un registro guardado conservando su ID, sin publicar eventos.
+        
+        Args:
+            id_registro: ID original del registro
+            trabajador: Instancia de Trabajador (o None)
+            fecha_registro: Fecha (date) del registro
+            hora_entrada: Hora de entrada (datetime o None)
+            hora_salida: Hora de salida (datetime o None)
+            horas_trabajadas: Horas calculadas al registrar la salida
+            completo: Si el registro tiene entrada y salida
+            
+        Returns:
+            Instancia de RegistroTiempo
+        """
+        registro = cls.__new__(cls)
+        registro.__id = id_registro
+        registro.__trabajador = trabajador
+        registro.__fecha_registro = fecha_registro
+        registro.__hora_entrada = hora_entrada
+        registro.__hora_salida = hora_salida
+        registro.__horas_trabajadas = horas_trabajadas
+        registro.__completo = completo
+        return registro
+    
     def get_id(self) -> int:
         """Retorna el ID del registro."""
         return self.__id
@@ -68,16 +98,20 @@ class RegistroTiempo:
         """Registra la hora de entrada del trabajador."""
         if self.__hora_entrada is None:
             self.__hora_entrada = datetime.now()
-            print(f"Entrada registrada para {self.__trabajador.get_nombre_completo()}")
-            print(f" Fecha: {self.__fecha_registro}")
-            print(f" Hora: {self.__hora_entrada.strftime('%H:%M:%S')}")
+            eventos.publicar(eventos.REGISTRO_ENTRADA,
+                             f"Entrada registrada para {self.__trabajador.get_nombre_completo()}\n"
+                             f" Fecha: {self.__fecha_registro}\n"
+                             f" Hora: {self.__hora_entrada.strftime('%H:%M:%S')}",
+                             registro=self)
         else:
-            print(f" Ya existe una entrada registrada para hoy")
+            eventos.publicar(eventos.REGISTRO_ENTRADA, f" Ya existe una entrada registrada para hoy",
+                             "aviso", registro=self)
     
     def registrar_salida(self) -> None:
         """Registra la hora de salida del trabajador y calcula las horas."""
         if self.__hora_entrada is None:
-            print(f"✗ Error: No se ha registrado entrada")
+            eventos.publicar(eventos.REGISTRO_SALIDA, f"✗ Error: No se ha registrado entrada",
+                             "error", registro=self)
             return
         
         if self.__hora_salida is None:
@@ -85,13 +119,16 @@ class RegistroTiempo:
             self.__horas_trabajadas = self.calcular_horas()
             self.__completo = True
             
-            print(f"Salida registrada para {self.__trabajador.get_nombre_completo()}")
-            print(f"  Hora: {self.__hora_salida.strftime('%H:%M:%S')}")
-            print(f"  Horas trabajadas: {self.__horas_trabajadas:.2f}h")
+            eventos.publicar(eventos.REGISTRO_SALIDA,
+                             f"Salida registrada para {self.__trabajador.get_nombre_completo()}\n"
+                             f"  Hora: {self.__hora_salida.strftime('%H:%M:%S')}\n"
+                             f"  Horas trabajadas: {self.__horas_trabajadas:.2f}h",
+                             registro=self)
             
             self.__trabajador.agregar_horas(self.__horas_trabajadas)
         else:
-            print(f" Ya existe una salida registrada para hoy")
+            eventos.publicar(eventos.REGISTRO_SALIDA, f" Ya existe una salida registrada para hoy",
+                             "aviso", registro=self)
     
     def calcular_horas(self) -> float:
         """
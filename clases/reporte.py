@@ -6,6 +6,11 @@ Fecha: Noviembre 2025
 """
 
 from datetime import datetime
+from clases.asignador_ids import siguiente_id
+from types import MappingProxyType
+from clases import eventos
+from clases.exportador import ExportadorReporte
+from clases.serie_numerica import AcumuladorEstadistico, SerieNumerica
 
 
 class Reporte:
@@ -15,9 +20,14 @@ class Reporte:
     Demuestra:
     - Encapsulación: Atributos privados
     - Agregación: Tiene una relación con Usuario (generador)
+    - Composición: Contiene objetos SerieNumerica (series fechadas)
     """
     
-    _contador_id = 0
+    __slots__ = ("__id", "__tipo", "__fecha_generacion", "__periodo", "__datos",
+                 "__generado_por", "__finalizado", "__series")
+    
+    # Datos compartidos (de solo lectura) hasta que se agrega el primer dato
+    _DATOS_VACIOS = MappingProxyType({})
     
     def __init__(self, tipo: str, periodo: str, usuario):
         """
@@ -28,16 +38,45 @@ class Reporte:
             periodo: Periodo del reporte (ej: "Noviembre 2024", "Semana 45")
             usuario: Instancia de Usuario que genera el reporte
         """
-        Reporte._contador_id += 1
-        self.__id = Reporte._contador_id
+        self.__id = siguiente_id("reporte")
         self.__tipo = tipo
         self.__fecha_generacion = datetime.now()
         self.__periodo = periodo
-        self.__datos = {}  
+        self.__datos = Reporte._DATOS_VACIOS
         self.__generado_por = usuario 
         self.__finalizado = False
+        self.__series = {}
     
 
+    @classmethod
+    def restaurar(cls, id_reporte: int, tipo: str, periodo: str, usuario,
+                  fecha_generacion: datetime, datos: dict = None, finalizado: bool = False):
+        """
+        Reconstruye un reporte guardado conservando su ID, sin publicar eventos.
+        
+        Args:
+            id_reporte: ID original del reporte
+            tipo: Tipo de reporte
+            periodo: Periodo del reporte
+            usuario: Instancia de Usuario que lo generó (o None)
+            fecha_generacion: Fecha de generación original
+            datos: Datos del reporte
+            finalizado: Si el reporte estaba finalizado
+            
+        Returns:
+            Instancia de Reporte
+        """
+        reporte = cls.__new__(cls)
+        reporte.__id = id_reporte
+        reporte.__tipo = tipo
+        reporte.__fecha_generacion = fecha_generacion
+        reporte.__periodo = periodo
+        reporte.__datos = dict(datos) if datos else Reporte._DATOS_VACIOS
+        reporte.__generado_por = usuario
+        reporte.__finalizado = finalizado
+        reporte.__series = {}
+        return reporte
+    
     def get_id(self) -> int:
         """Retorna el ID del reporte."""
         return self.__id
@@ -56,7 +95,7 @@ class Reporte:
     
     def get_datos(self) -> dict:
         """Retorna una copia de los datos del reporte."""
-        return self.__datos.copy()
+        return dict(self.__datos)
     
     def get_generado_por(self):
         """Retorna el usuario que generó el reporte."""
@@ -76,10 +115,16 @@ class Reporte:
             valor: Valor del dato
         """
         if not self.__finalizado:
+            if self.__datos is Reporte._DATOS_VACIOS:
+                self.__datos = {}
             self.__datos[clave] = valor
-            print(f" Dato '{clave}' agregado al reporte #{self.__id}")
+            eventos.publicar(eventos.REPORTE_DATOS,
+                             f" Dato '{clave}' agregado al reporte #{self.__id}",
+                             id=self.__id, claves=[clave])
         else:
-            print(f" No se puede modificar reporte #{self.__id}: ya está finalizado")
+            eventos.publicar(eventos.REPORTE_DATOS,
+                             f" No se puede modificar reporte #{self.__id}: ya está finalizado",
+                             "error", id=self.__id, claves=[clave])
     
     def agregar_datos_multiples(self, datos: dict) -> None:
         """
@@ -89,10 +134,51 @@ class Reporte:
             datos: Diccionario con los datos a agregar
         """
         if not self.__finalizado:
+            if self.__datos is Reporte._DATOS_VACIOS:
+                self.__datos = {}
             self.__datos.update(datos)
-            print(f"✓ {len(datos)} datos agregados al reporte #{self.__id}")
+            eventos.publicar(eventos.REPORTE_DATOS,
+                             f"✓ {len(datos)} datos agregados al reporte #{self.__id}",
+                             id=self.__id, claves=list(datos))
         else:
-            print(f"✗ No se puede modificar reporte #{self.__id}: ya está finalizado")
+            eventos.publicar(eventos.REPORTE_DATOS,
+                             f"✗ No se puede modificar reporte #{self.__id}: ya está finalizado",
+                             "error", id=self.__id, claves=list(datos))
+    
+    def agregar_serie(self, nombre: str, fechas=(), valores=(), unidad: str = "") -> SerieNumerica:
+        """
+        Agrega valores a una serie numérica del reporte (la crea si no existe).
+        
+        Args:
+            nombre: Nombre de la serie (ej: "kg_diarios")
+            fechas: Día de cada valor (date, datetime u ordinal)
+            valores: Valores de la serie
+            unidad: Unidad de los valores (solo al crearla)
+            
+        Returns:
+            La SerieNumerica (None si el reporte está finalizado)
+        """
+        if self.__finalizado:
+            eventos.publicar(eventos.REPORTE_DATOS,
+                             f"✗ No se puede modificar reporte #{self.__id}: ya está finalizado",
+                             "error", id=self.__id, claves=[nombre])
+            return None
+        serie = self.__series.get(nombre)
+        if serie is None:
+            serie = self.__series[nombre] = SerieNumerica(nombre, unidad)
+        serie.extender(fechas, valores)
+        eventos.publicar(eventos.REPORTE_DATOS,
+                         f"✓ Serie '{nombre}' del reporte #{self.__id}: {len(serie)} valores",
+                         id=self.__id, claves=[nombre])
+        return serie
+    
+    def get_serie(self, nombre: str) -> SerieNumerica:
+        """Retorna una serie del reporte (None si no existe)."""
+        return self.__series.get(nombre)
+    
+    def get_series(self) -> dict:
+        """Retorna una copia del diccionario {nombre: SerieNumerica}."""
+        return dict(self.__series)
     
     def obtener_dato(self, clave: str, default=None):
         """
@@ -127,7 +213,9 @@ class Reporte:
     def finalizar_reporte(self) -> None:
         """Marca el reporte como finalizado (no se puede editar más)."""
         self.__finalizado = True
-        print(f"✓ Reporte #{self.__id} finalizado y cerrado para edición")
+        eventos.publicar(eventos.REPORTE_FINALIZADO,
+                         f"✓ Reporte #{self.__id} finalizado y cerrado para edición",
+                         id=self.__id)
     
     def generar_resumen(self) -> str:
         """
@@ -166,20 +254,52 @@ class Reporte:
             Nombre del archivo PDF generado
         """
         archivo = f"reporte_{self.__id}_{self.__tipo}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        print(f"📄 Reporte exportado a: {archivo}")
+        eventos.publicar(eventos.REPORTE_EXPORTADO, f"📄 Reporte exportado a: {archivo}",
+                         id=self.__id, archivo=archivo)
         return archivo
     
-    def exportar_excel(self) -> str:
+    def __nombre_archivo(self, extension: str) -> str:
+        """Método privado: nombre por defecto del archivo exportado."""
+        return f"reporte_{self.__id}_{self.__tipo}_{datetime.now().strftime('%Y%m%d')}.{extension}"
+    
+    def exportar_excel(self, archivo: str = None, estanterias=None,
+                       incluir_tubulares: bool = False) -> str:
         """
-        Simula la exportación del reporte a Excel.
+        Exporta el reporte a un libro Excel (.xlsx).
         
+        Args:
+            archivo: Ruta del archivo (por defecto, reporte_<id>_<tipo>_<fecha>.xlsx)
+            estanterias: Estanterías (o Planta) cuyo detalle se agrega (opcional)
+            incluir_tubulares: Si se agrega una hoja con cada tubular
+            
         Returns:
-            Nombre del archivo Excel generado
+            Ruta del archivo generado
         """
-        archivo = f"reporte_{self.__id}_{self.__tipo}_{datetime.now().strftime('%Y%m%d')}.xlsx"
-        print(f" Reporte exportado a: {archivo}")
+        archivo = archivo or self.__nombre_archivo("xlsx")
+        ExportadorReporte(self, estanterias, incluir_tubulares).exportar_xlsx(archivo)
+        eventos.publicar(eventos.REPORTE_EXPORTADO, f" Reporte exportado a: {archivo}",
+                         id=self.__id, archivo=archivo)
         return archivo
     
+    def exportar_csv(self, archivo: str = None, estanterias=None,
+                     incluir_tubulares: bool = False) -> list:
+        """
+        Exporta el reporte a archivos CSV, uno por hoja (ver ExportadorReporte).
+        
+        Args:
+            archivo: Ruta base (por defecto, reporte_<id>_<tipo>_<fecha>.csv)
+            estanterias: Estanterías (o Planta) cuyo detalle se agrega (opcional)
+            incluir_tubulares: Si se agrega un archivo con cada tubular
+            
+        Returns:
+            Rutas de los archivos generados
+        """
+        archivo = archivo or self.__nombre_archivo("csv")
+        rutas = ExportadorReporte(self, estanterias, incluir_tubulares).exportar_csv(archivo)
+        eventos.publicar(eventos.REPORTE_EXPORTADO, f" Reporte exportado a: {', '.join(rutas)}",
+                         id=self.__id, archivo=rutas[0])
+        return rutas
+    
     def obtener_estadisticas(self) -> dict:
         """
         Calcula estadísticas básicas del reporte.
@@ -199,17 +319,24 @@ class Reporte:
         }
         
       
-        valores_numericos = []
+        acumulador = AcumuladorEstadistico()
         for valor in self.__datos.values():
-            try:
-                valores_numericos.append(float(valor))
-            except (ValueError, TypeError):
-                pass
-        
-        if valores_numericos:
-            estadisticas["promedio"] = sum(valores_numericos) / len(valores_numericos)
-            estadisticas["maximo"] = max(valores_numericos)
-            estadisticas["minimo"] = min(valores_numericos)
+            if not isinstance(valor, (int, float)):
+                try:
+                    valor = float(valor)
+                except (ValueError, TypeError):
+                    continue
+            acumulador.agregar(valor)
+        
+        if acumulador.contar():
+            resumen = acumulador.resumir()
+            estadisticas["promedio"] = resumen["media"]
+            estadisticas["maximo"] = resumen["maximo"]
+            estadisticas["minimo"] = resumen["minimo"]
+        
+        if self.__series:
+            estadisticas["series"] = {nombre: serie.calcular_estadisticas()
+                                      for nombre, serie in self.__series.items()}
         
         return estadisticas
     
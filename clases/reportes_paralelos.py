@@ -0,0 +1,164 @@
+"""
+Clase GeneradorReportesParalelo - Reportes de muchas estanterías en varios procesos
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from clases.estanteria import Estanteria
+
+
+def serializar_estanteria(estanteria: Estanteria) -> tuple:
+    """
+    Retorna el estado compacto de una estantería para enviarlo a otro proceso.
+
+    Solo lleva lo que usan los reportes: metadatos, estados y defectos
+    (320 bytes cada uno, None si todos los tubulares están vacíos). Las
+    fechas de inoculación no se envían.
+
+    Returns:
+        Tupla (código, fase, activa, ubicación, inicio, revisión, estados, defectos)
+        con las fechas como marca de tiempo (0.0 si no hay)
+    """
+    inicio = estanteria.get_fecha_inicio()
+    revision = estanteria.get_fecha_ultima_revision()
+    columnas = estanteria.exportar_tubulares()
+    return (estanteria.get_codigo(), estanteria.get_fase(), estanteria.esta_activa(),
+            estanteria.get_ubicacion(),
+            inicio.timestamp() if inicio else 0.0,
+            revision.timestamp() if revision else 0.0,
+            columnas[0] if columnas else None,
+            bytes(columnas[1]) if columnas else None)
+
+
+def deserializar_estanteria(estado: tuple) -> Estanteria:
+    """
+    Reconstruye una estantería desde serializar_estanteria, sin publicar eventos.
+
+    Returns:
+        Instancia de Estanteria
+    """
+    codigo, fase, activa, ubicacion, inicio, revision, estados, defectos = estado
+    estanteria = Estanteria.restaurar(codigo, fase, activa, ubicacion,
+                                      datetime.fromtimestamp(inicio) if inicio else None,
+                                      datetime.fromtimestamp(revision) if revision else None)
+    if estados is not None:
+        estanteria.cargar_tubulares(estados, defectos,
+                                    array("d", bytes(8 * Estanteria.TUBULARES_TOTALES)))
+    return estanteria
+
+
+def _procesar_lote(metodo: str, lote: list) -> list:
+    """Función de los procesos: reconstruye un lote de estanterías y calcula el resultado."""
+    return [getattr(deserializar_estanteria(estado), metodo)() for estado in lote]
+
+
+class GeneradorReportesParalelo:
+    """
+    Clase que calcula los reportes de muchas estanterías repartiéndolas entre procesos.
+
+    Cada estantería viaja como su estado compacto (ver
+    serializar_estanteria), no como el grafo de objetos; los procesos la
+    reconstruyen, llaman al mismo método de Estanteria y devuelven los
+    resultados, que se juntan en el orden de entrada. Incluso con un solo
+    proceso el cálculo sale del proceso actual (por ejemplo, el de la
+    interfaz). Con pocas estanterías (menos que 'minimo_paralelo') se
+    calcula en el proceso actual, donde se aprovecha la memoria de
+    resultados de cada estantería.
+
+    El grupo de procesos se crea en el primer uso y se reutiliza hasta
+    cerrar(); el generador también puede usarse con 'with'.
+
+    Demuestra:
+    - Encapsulación: El grupo de procesos es privado
+    - Abstracción: Oculta el reparto en lotes y la serialización
+    """
+
+    def __init__(self, procesos: int = None, lotes_por_proceso: int = 4,
+                 minimo_paralelo: int = 200):
+        """
+        Constructor de GeneradorReportesParalelo.
+
+        Args:
+            procesos: Número de procesos (None para todos los núcleos)
+            lotes_por_proceso: Lotes en que se reparte el trabajo de cada proceso
+            minimo_paralelo: Estanterías a partir de las cuales se usan procesos
+        """
+        self.__procesos = max(1, procesos or os.cpu_count() or 1)
+        self.__lotes_por_proceso = max(1, lotes_por_proceso)
+        self.__minimo_paralelo = minimo_paralelo
+        self.__grupo = None
+
+    def get_procesos(self) -> int:
+        """Retorna el número de procesos."""
+        return self.__procesos
+
+    def generar_resumenes(self, estanterias) -> list:
+        """
+        Genera el resumen de cada estantería (ver Estanteria.generar_resumen).
+
+        Args:
+            estanterias: Lista de estanterías o Planta
+
+        Returns:
+            Lista de strings en el orden de las estanterías
+        """
+        return self.__calcular("generar_resumen", estanterias)
+
+    def obtener_estados_generales(self, estanterias) -> list:
+        """Retorna el estado general de cada estantería (ver Estanteria.obtener_estado_general)."""
+        return self.__calcular("obtener_estado_general", estanterias)
+
+    def obtener_estadisticas_detalladas(self, estanterias) -> list:
+        """Retorna las estadísticas de cada estantería (ver Estanteria.obtener_estadisticas_detalladas)."""
+        return self.__calcular("obtener_estadisticas_detalladas", estanterias)
+
+    def __calcular(self, metodo: str, estanterias) -> list:
+        """Método privado: calcula un método de Estanteria para todas las estanterías."""
+        if hasattr(estanterias, "get_estanterias"):
+            estanterias = estanterias.get_estanterias()
+        else:
+            estanterias = list(estanterias)
+        if len(estanterias) < self.__minimo_paralelo:
+            return [getattr(estanteria, metodo)() for estanteria in estanterias]
+
+        numero_lotes = min(len(estanterias), self.__procesos * self.__lotes_por_proceso)
+        tam_lote = -(-len(estanterias) // numero_lotes)
+        grupo = self.__obtener_grupo()
+        futuros = [grupo.submit(_procesar_lote, metodo,
+                                [serializar_estanteria(estanteria)
+                                 for estanteria in estanterias[inicio:inicio + tam_lote]])
+                   for inicio in range(0, len(estanterias), tam_lote)]
+        resultados = []
+        for futuro in futuros:
+            resultados.extend(futuro.result())
+        return resultados
+
+    def __obtener_grupo(self) -> ProcessPoolExecutor:
+        """Método privado que crea el grupo de procesos en el primer uso."""
+        if self.__grupo is None:
+            self.__grupo = ProcessPoolExecutor(max_workers=self.__procesos)
+        return self.__grupo
+
+    def cerrar(self) -> None:
+        """Termina los procesos (se vuelven a crear si se usa otra vez)."""
+        if self.__grupo is not None:
+            self.__grupo.shutdown()
+            self.__grupo = None
+
+    def __enter__(self):
+        """Permite usar el generador con 'with'."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Cierra el grupo de procesos al salir del bloque 'with'."""
+        self.cerrar()
+
+    def __repr__(self) -> str:
+        """Representación técnica del generador."""
+        return (f"GeneradorReportesParalelo(procesos={self.__procesos}, "
+                f"activo={self.__grupo is not None})")
@@ -0,0 +1,811 @@
+"""
+Clase RepositorioSQLite - Persistencia del sistema en una base SQLite
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, date
+from clases.almacen_tubulares import AlmacenTubulares
+from clases.asignador_ids import get_asignador
+from clases.estanteria import Estanteria, ObservadorEstanteria
+from clases.planta import Planta
+from clases.trabajador import Trabajador
+from clases.supervisor import Supervisor
+from clases.jefe_planta import JefePlanta
+from clases.administrador import Administrador
+from clases.alerta import Alerta
+from clases.agrupador_alertas import AlertaAgrupada
+from clases.reporte import Reporte
+from clases.registro_tiempo import RegistroTiempo
+
+
+class RepositorioSQLite(ObservadorEstanteria):
+    """
+    Clase que guarda y carga las entidades del sistema en SQLite.
+
+    La base se abre en modo WAL (las lecturas no bloquean a la escritura).
+    Las escrituras hechas dentro de unidad_de_trabajo() se acumulan y se
+    confirman juntas en una sola transacción al salir del bloque más
+    externo; fuera de una unidad de trabajo cada guardado es su propia
+    transacción.
+
+    Las estanterías seguidas con seguir_estanteria() se marcan como
+    modificadas cuando cambian sus tubulares o su fase, y se guardan en la
+    siguiente confirmación (al salir de una unidad de trabajo, al llamar a
+    confirmar() o al cerrar): una inoculación masiva se escribe en una sola
+    transacción con executemany en lugar de una escritura por tubular.
+
+    Los tubulares se guardan de forma dispersa: solo los que no están
+    vacíos (o tienen defecto o fecha), con su piso y número; sus
+    observaciones van en otra tabla con una fila por observación. Del mismo
+    modo, los datos propios de las alertas agrupadas (piso, cantidad,
+    primera y última ocurrencia) van en una tabla aparte que solo tiene
+    filas para ellas.
+
+    Demuestra:
+    - Herencia: extends ObservadorEstanteria
+    - Encapsulación: La conexión y las escrituras pendientes son privadas
+    """
+
+    ESQUEMA = """
+    CREATE TABLE IF NOT EXISTS estanterias (
+        codigo TEXT PRIMARY KEY,
+        fase TEXT NOT NULL,
+        activa INTEGER NOT NULL,
+        ubicacion TEXT,
+        fecha_inicio TEXT,
+        fecha_ultima_revision TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_estanterias_fase ON estanterias (fase, activa);
+
+    CREATE TABLE IF NOT EXISTS tubulares (
+        estanteria TEXT NOT NULL REFERENCES estanterias (codigo) ON DELETE CASCADE,
+        piso INTEGER NOT NULL,
+        numero INTEGER NOT NULL,
+        estado TEXT NOT NULL,
+        defectuoso INTEGER NOT NULL,
+        fecha_inoculacion REAL,
+        PRIMARY KEY (estanteria, piso, numero)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_tubulares_estado ON tubulares (estado, estanteria);
+
+    CREATE TABLE IF NOT EXISTS observaciones (
+        estanteria TEXT NOT NULL REFERENCES estanterias (codigo) ON DELETE CASCADE,
+        piso INTEGER NOT NULL,
+        numero INTEGER NOT NULL,
+        fecha TEXT NOT NULL,
+        texto TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_observaciones_estanteria ON observaciones (estanteria);
+
+    CREATE TABLE IF NOT EXISTS usuarios (
+        username TEXT PRIMARY KEY,
+        tipo TEXT NOT NULL,
+        nombre TEXT NOT NULL,
+        apellido TEXT NOT NULL,
+        email TEXT NOT NULL,
+        password TEXT NOT NULL,
+        extra TEXT
+    );
+
+    CREATE TABLE IF NOT EXISTS alertas (
+        id INTEGER PRIMARY KEY,
+        tipo TEXT NOT NULL,
+        mensaje TEXT NOT NULL,
+        fecha_creacion TEXT NOT NULL,
+        estanteria TEXT,
+        resuelta INTEGER NOT NULL,
+        fecha_resolucion TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_alertas_estanteria ON alertas (estanteria);
+    CREATE INDEX IF NOT EXISTS idx_alertas_resuelta ON alertas (resuelta);
+
+    CREATE TABLE IF NOT EXISTS alertas_agrupadas (
+        id INTEGER PRIMARY KEY REFERENCES alertas (id) ON DELETE CASCADE,
+        piso INTEGER,
+        cantidad INTEGER NOT NULL,
+        primera TEXT NOT NULL,
+        ultima TEXT NOT NULL,
+        mensaje_base TEXT NOT NULL
+    );
+
+    CREATE TABLE IF NOT EXISTS reportes (
+        id INTEGER PRIMARY KEY,
+        tipo TEXT NOT NULL,
+        periodo TEXT NOT NULL,
+        usuario TEXT,
+        fecha_generacion TEXT NOT NULL,
+        datos TEXT NOT NULL,
+        finalizado INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_reportes_usuario ON reportes (usuario);
+
+    CREATE TABLE IF NOT EXISTS registros_tiempo (
+        id INTEGER PRIMARY KEY,
+        trabajador TEXT,
+        fecha TEXT NOT NULL,
+        hora_entrada TEXT,
+        hora_salida TEXT,
+        horas REAL NOT NULL,
+        completo INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_registros_trabajador ON registros_tiempo (trabajador, fecha);
+    """
+
+    # Clases de usuario que se pueden reconstruir, por nombre de tipo
+    TIPOS_USUARIO = {
+        "Trabajador": Trabajador,
+        "Supervisor": Supervisor,
+        "JefePlanta": JefePlanta,
+        "Administrador": Administrador
+    }
+
+    def __init__(self, ruta: str = "orellanas.db"):
+        """
+        Constructor de RepositorioSQLite.
+
+        Args:
+            ruta: Archivo de la base de datos (":memory:" para una base temporal)
+        """
+        self.__ruta = ruta
+        # Las transacciones se manejan a mano (BEGIN/COMMIT)
+        self.__conexion = sqlite3.connect(ruta, isolation_level=None)
+        self.__conexion.execute("PRAGMA journal_mode=WAL")
+        self.__conexion.execute("PRAGMA synchronous=NORMAL")
+        self.__conexion.execute("PRAGMA foreign_keys=ON")
+        self.__conexion.executescript(self.ESQUEMA)
+        self.__profundidad = 0
+        # Lista de (sql, filas) a ejecutar en la próxima confirmación
+        self.__pendientes = []
+        self.__seguidas = {}
+        self.__modificadas = set()
+
+    def get_ruta(self) -> str:
+        """Retorna la ruta de la base de datos."""
+        return self.__ruta
+
+    # Unidad de trabajo
+
+    @contextmanager
+    def unidad_de_trabajo(self):
+        """
+        Agrupa las escrituras del bloque en una sola transacción.
+
+        Los bloques se pueden anidar; la transacción se confirma al salir del
+        más externo. Si ocurre una excepción se descartan las escrituras
+        acumuladas (los objetos en memoria no se revierten, y las estanterías
+        seguidas quedan marcadas para la siguiente confirmación).
+
+        Ejemplo:
+            with repositorio.unidad_de_trabajo():
+                planta.transicionar_tubulares("inoculado", "vacío")
+        """
+        self.__profundidad += 1
+        try:
+            yield self
+        except BaseException:
+            self.__profundidad -= 1
+            if self.__profundidad == 0:
+                self.__pendientes.clear()
+            raise
+        self.__profundidad -= 1
+        if self.__profundidad == 0:
+            self.confirmar()
+
+    def en_unidad_de_trabajo(self) -> bool:
+        """Indica si hay una unidad de trabajo abierta."""
+        return self.__profundidad > 0
+
+    def confirmar(self) -> None:
+        """
+        Escribe en una sola transacción las escrituras pendientes y las
+        estanterías seguidas que cambiaron.
+        """
+        for codigo in self.__modificadas:
+            estanteria = self.__seguidas.get(codigo)
+            if estanteria is not None:
+                self.__encolar_estanteria(estanteria)
+        if not self.__pendientes:
+            self.__modificadas.clear()
+            return
+
+        conexion = self.__conexion
+        conexion.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, filas in self.__pendientes:
+                conexion.executemany(sql, filas)
+        except BaseException:
+            conexion.execute("ROLLBACK")
+            self.__pendientes.clear()
+            raise
+        conexion.execute("COMMIT")
+        self.__pendientes.clear()
+        self.__modificadas.clear()
+
+    def __escribir(self, sql: str, filas: list) -> None:
+        """Método privado: acumula una escritura y la confirma si no hay unidad de trabajo."""
+        if filas:
+            self.__pendientes.append((sql, filas))
+        if self.__profundidad == 0:
+            self.confirmar()
+
+    # Seguimiento de estanterías (ObservadorEstanteria)
+
+    def seguir_estanteria(self, estanteria: Estanteria, guardar: bool = True) -> None:
+        """
+        Sigue una estantería para guardar sus cambios en cada confirmación.
+
+        Args:
+            estanteria: Instancia de Estanteria
+            guardar: Si se guarda ya la estantería completa; False para las
+                     recién cargadas (de la base o de una foto al día), que
+                     no hace falta reescribir
+        """
+        self.__seguidas[estanteria.get_codigo()] = estanteria
+        estanteria.agregar_observador(self)
+        if guardar:
+            self.guardar_estanteria(estanteria)
+
+    def seguir_planta(self, planta: Planta, guardar: bool = True) -> None:
+        """
+        Sigue todas las estanterías de una planta.
+
+        Args:
+            planta: Instancia de Planta
+            guardar: Si se guardan ya todas las estanterías (ver seguir_estanteria)
+        """
+        with self.unidad_de_trabajo():
+            for estanteria in planta:
+                self.seguir_estanteria(estanteria, guardar)
+
+    def dejar_de_seguir(self, estanteria: Estanteria) -> None:
+        """Deja de seguir una estantería (no borra lo guardado)."""
+        estanteria.quitar_observador(self)
+        self.__seguidas.pop(estanteria.get_codigo(), None)
+        self.__modificadas.discard(estanteria.get_codigo())
+
+    def marcar_modificada(self, estanteria: Estanteria) -> None:
+        """
+        Marca una estantería seguida para guardarla en la siguiente confirmación.
+
+        Necesario tras cambios que no pasan por los observadores (ubicación);
+        los cambios de tubulares, fase y revisión se marcan solos.
+        """
+        self.__modificadas.add(estanteria.get_codigo())
+
+    def tubulares_cambiados(self, estanteria, numero_piso: int, anterior: str,
+                            nuevo: str, cantidad: int) -> None:
+        """Marca la estantería como modificada."""
+        self.marcar_modificada(estanteria)
+
+    def fase_cambiada(self, estanteria, fase_anterior: str, fase_nueva: str) -> None:
+        """Marca la estantería como modificada."""
+        self.marcar_modificada(estanteria)
+
+    def estanteria_activada(self, estanteria) -> None:
+        """Marca la estantería como modificada."""
+        self.marcar_modificada(estanteria)
+
+    def fechas_cambiadas(self, estanteria, posiciones: list, marca: float) -> None:
+        """Marca la estantería como modificada."""
+        self.marcar_modificada(estanteria)
+
+    def revision_registrada(self, estanteria) -> None:
+        """Marca la estantería como modificada."""
+        self.marcar_modificada(estanteria)
+
+    def observacion_agregada(self, estanteria, posicion: int, observacion: dict) -> None:
+        """Marca la estantería como modificada."""
+        self.marcar_modificada(estanteria)
+
+    # Estanterías, pisos y tubulares
+
+    def guardar_estanteria(self, estanteria: Estanteria) -> None:
+        """
+        Guarda una estantería con el estado de todos sus tubulares.
+
+        Args:
+            estanteria: Instancia de Estanteria
+        """
+        self.__encolar_estanteria(estanteria)
+        if self.__profundidad == 0:
+            self.confirmar()
+
+    def guardar_planta(self, planta: Planta) -> None:
+        """Guarda todas las estanterías de una planta en una transacción."""
+        with self.unidad_de_trabajo():
+            for estanteria in planta:
+                self.guardar_estanteria(estanteria)
+
+    def __encolar_estanteria(self, estanteria: Estanteria) -> None:
+        """Método privado que acumula las escrituras de una estantería."""
+        codigo = estanteria.get_codigo()
+        self.__pendientes.append((
+            "INSERT OR REPLACE INTO estanterias VALUES (?, ?, ?, ?, ?, ?)",
+            [(codigo, estanteria.get_fase(), int(estanteria.esta_activa()),
+              estanteria.get_ubicacion(), self.__texto_fecha(estanteria.get_fecha_inicio()),
+              self.__texto_fecha(estanteria.get_fecha_ultima_revision()))]
+        ))
+        self.__pendientes.append(("DELETE FROM tubulares WHERE estanteria = ?", [(codigo,)]))
+        self.__pendientes.append(("DELETE FROM observaciones WHERE estanteria = ?", [(codigo,)]))
+
+        por_piso = Estanteria.TUBULARES_POR_PISO
+        observaciones = [(codigo, posicion // por_piso + 1, posicion % por_piso + 1,
+                          self.__texto_fecha(fecha), texto)
+                         for posicion, fecha, texto in estanteria.exportar_observaciones()]
+        if observaciones:
+            self.__pendientes.append(("INSERT INTO observaciones VALUES (?, ?, ?, ?, ?)",
+                                      observaciones))
+
+        columnas = estanteria.exportar_tubulares()
+        if columnas is None:
+            return
+        estados, defectos, fechas = columnas
+        nombres = AlmacenTubulares.ESTADOS
+        filas = [(codigo, indice // por_piso + 1, indice % por_piso + 1, nombres[estados[indice]],
+                  defectos[indice], fechas[indice] or None)
+                 for indice in range(len(estados))
+                 if estados[indice] or defectos[indice] or fechas[indice]]
+        if filas:
+            self.__pendientes.append(("INSERT INTO tubulares VALUES (?, ?, ?, ?, ?, ?)", filas))
+
+    def cargar_estanteria(self, codigo: str):
+        """
+        Carga una estantería guardada.
+
+        Args:
+            codigo: Código de la estantería
+
+        Returns:
+            Instancia de Estanteria o None si no existe
+        """
+        fila = self.__conexion.execute("SELECT * FROM estanterias WHERE codigo = ?",
+                                       (codigo,)).fetchone()
+        if fila is None:
+            return None
+        return self.__construir_estanterias([fila])[0]
+
+    def cargar_estanterias(self) -> list:
+        """Carga todas las estanterías guardadas, ordenadas por código."""
+        filas = self.__conexion.execute("SELECT * FROM estanterias ORDER BY codigo").fetchall()
+        return self.__construir_estanterias(filas)
+
+    def cargar_planta(self, nombre: str = "Planta principal") -> Planta:
+        """
+        Carga todas las estanterías guardadas en una planta nueva.
+
+        Args:
+            nombre: Nombre de la planta
+
+        Returns:
+            Instancia de Planta
+        """
+        planta = Planta(nombre)
+        for estanteria in self.cargar_estanterias():
+            planta.agregar_estanteria(estanteria)
+        return planta
+
+    def __construir_estanterias(self, filas: list) -> list:
+        """Método privado que reconstruye estanterías y sus tubulares."""
+        estanterias = {}
+        for codigo, fase, activa, ubicacion, fecha_inicio, fecha_revision in filas:
+            estanterias[codigo] = Estanteria.restaurar(codigo, fase, bool(activa), ubicacion,
+                                                       self.__leer_fecha(fecha_inicio),
+                                                       self.__leer_fecha(fecha_revision))
+        if not estanterias:
+            return []
+
+        columnas = {}
+        marcas = ",".join("?" * len(estanterias)) if len(estanterias) < 500 else None
+        consulta = self.__consultar_por_estanteria("tubulares", marcas, estanterias)
+        codigos = AlmacenTubulares.CODIGOS
+        por_piso = Estanteria.TUBULARES_POR_PISO
+        for codigo, piso, numero, estado, defectuoso, fecha in consulta:
+            if codigo not in estanterias:
+                continue
+            if codigo not in columnas:
+                total = Estanteria.TUBULARES_TOTALES
+                columnas[codigo] = (bytearray(total), bytearray(total), [0.0] * total)
+            estados, defectos, fechas = columnas[codigo]
+            indice = (piso - 1) * por_piso + numero - 1
+            estados[indice] = codigos[estado]
+            defectos[indice] = defectuoso
+            fechas[indice] = fecha or 0.0
+
+        for codigo, (estados, defectos, fechas) in columnas.items():
+            estanterias[codigo].cargar_tubulares(estados, defectos, fechas)
+
+        observaciones = {}
+        for codigo, piso, numero, fecha, texto in self.__consultar_por_estanteria(
+                "observaciones", marcas, estanterias, " ORDER BY rowid"):
+            if codigo in estanterias:
+                observaciones.setdefault(codigo, []).append(
+                    ((piso - 1) * por_piso + numero - 1, self.__leer_fecha(fecha), texto))
+        for codigo, lista in observaciones.items():
+            estanterias[codigo].cargar_observaciones(lista)
+        return list(estanterias.values())
+
+    def __consultar_por_estanteria(self, tabla: str, marcas: str, estanterias: dict, orden: str = ""):
+        """Método privado: filas de una tabla de las estanterías (o de todas si son muchas)."""
+        if marcas is None:
+            return self.__conexion.execute(f"SELECT * FROM {tabla}{orden}")
+        return self.__conexion.execute(
+            f"SELECT * FROM {tabla} WHERE estanteria IN ({marcas}){orden}", list(estanterias))
+
+    def borrar_estanteria(self, codigo: str) -> None:
+        """Borra una estantería y sus tubulares."""
+        self.__escribir("DELETE FROM estanterias WHERE codigo = ?", [(codigo,)])
+
+    def buscar_estanterias(self, fase: str = None, activa: bool = None) -> list:
+        """
+        Busca códigos de estanterías por fase y/o actividad (sin cargarlas).
+
+        Returns:
+            Lista de códigos
+        """
+        sql = "SELECT codigo FROM estanterias WHERE 1 = 1"
+        parametros = []
+        if fase is not None:
+            sql += " AND fase = ?"
+            parametros.append(fase)
+        if activa is not None:
+            sql += " AND activa = ?"
+            parametros.append(int(activa))
+        return [fila[0] for fila in self.__conexion.execute(sql + " ORDER BY codigo", parametros)]
+
+    def buscar_tubulares(self, estado: str, codigo: str = None) -> list:
+        """
+        Busca los tubulares guardados en un estado (consulta por índice).
+
+        Los tubulares vacíos no se guardan, así que no se pueden buscar.
+
+        Args:
+            estado: Estado buscado
+            codigo: Código de estantería (None para todas)
+
+        Returns:
+            Lista de tuplas (codigo, piso, numero, defectuoso, fecha_inoculacion)
+        """
+        if estado not in AlmacenTubulares.CODIGOS:
+            raise ValueError(f"Estado inválido: {estado}")
+        sql = ("SELECT estanteria, piso, numero, defectuoso, fecha_inoculacion "
+               "FROM tubulares WHERE estado = ?")
+        parametros = [estado]
+        if codigo is not None:
+            sql += " AND estanteria = ?"
+            parametros.append(codigo)
+        filas = self.__conexion.execute(sql + " ORDER BY estanteria, piso, numero", parametros)
+        return [(est, piso, numero, bool(defectuoso),
+                 datetime.fromtimestamp(fecha) if fecha else None)
+                for est, piso, numero, defectuoso, fecha in filas]
+
+    def contar_tubulares_por_estado(self, codigo: str = None) -> dict:
+        """
+        Cuenta en la base los tubulares por estado.
+
+        Un tubular con defecto cuenta como "defectuoso", igual que en memoria.
+
+        Args:
+            codigo: Código de estantería (None para todas)
+
+        Returns:
+            Diccionario con conteo por estado
+        """
+        sql = ("SELECT CASE WHEN defectuoso THEN 'defectuoso' ELSE estado END, COUNT(*) "
+               "FROM tubulares")
+        parametros = []
+        if codigo is not None:
+            sql += " WHERE estanteria = ?"
+            parametros.append(codigo)
+        conteo = {estado: 0 for estado in AlmacenTubulares.ESTADOS}
+        for estado, cantidad in self.__conexion.execute(sql + " GROUP BY 1", parametros):
+            conteo[estado] += cantidad
+
+        if codigo is None:
+            sql_estanterias = "SELECT COUNT(*) FROM estanterias"
+            parametros = []
+        else:
+            sql_estanterias = "SELECT COUNT(*) FROM estanterias WHERE codigo = ?"
+        estanterias = self.__conexion.execute(sql_estanterias, parametros).fetchone()[0]
+        conteo["vacío"] += estanterias * Estanteria.TUBULARES_TOTALES - sum(conteo.values())
+        return conteo
+
+    # Usuarios
+
+    def guardar_usuario(self, usuario) -> None:
+        """
+        Guarda un usuario (identificado por su username).
+
+        Args:
+            usuario: Instancia de Trabajador, Supervisor, JefePlanta o Administrador
+        """
+        self.guardar_usuarios([usuario])
+
+    def guardar_usuarios(self, usuarios) -> None:
+        """Guarda varios usuarios en una sola escritura."""
+        filas = []
+        for usuario in usuarios:
+            extra = {}
+            if isinstance(usuario, Trabajador):
+                extra["turno"] = usuario.get_turno()
+            elif isinstance(usuario, Supervisor):
+                extra["area"] = usuario.get_area()
+            filas.append((usuario.get_username(), type(usuario).__name__, usuario.get_nombre(),
+                          usuario.get_apellido(), usuario.get_email(), usuario._get_hash_password(),
+                          json.dumps(extra, ensure_ascii=False)))
+        self.__escribir("INSERT OR REPLACE INTO usuarios VALUES (?, ?, ?, ?, ?, ?, ?)", filas)
+
+    def cargar_usuarios(self) -> dict:
+        """
+        Carga los usuarios guardados.
+
+        La columna password guarda el hash de la contraseña. Las filas de
+        bases anteriores con la contraseña en texto plano se cargan
+        calculando su hash y se reescriben con él.
+
+        Returns:
+            Diccionario {username: usuario}
+        """
+        usuarios = {}
+        migrados = []
+        for username, tipo, nombre, apellido, email, password, extra in self.__conexion.execute(
+                "SELECT * FROM usuarios ORDER BY username").fetchall():
+            clase = self.TIPOS_USUARIO.get(tipo)
+            if clase is None:
+                continue
+            extra = json.loads(extra) if extra else {}
+            es_hash = clase.es_hash_password(password)
+            texto_plano = None if es_hash else password
+            if clase is Trabajador:
+                usuario = clase(nombre, apellido, username, texto_plano, email, extra.get("turno"))
+            elif clase is Supervisor:
+                usuario = clase(nombre, apellido, username, texto_plano, email, extra.get("area"))
+            else:
+                usuario = clase(nombre, apellido, username, texto_plano, email)
+            if es_hash:
+                usuario._set_hash_password(password)
+            else:
+                migrados.append(usuario)
+            usuarios[username] = usuario
+        if migrados:
+            self.guardar_usuarios(migrados)
+        return usuarios
+
+    # Alertas
+
+    def guardar_alertas(self, alertas) -> None:
+        """
+        Guarda (o actualiza) varias alertas en una sola escritura.
+
+        Args:
+            alertas: Instancias de Alerta
+        """
+        filas = []
+        agrupadas = []
+        for alerta in alertas:
+            estanteria = alerta.get_estanteria()
+            filas.append((alerta.get_id(), alerta.get_tipo(), alerta.get_mensaje(),
+                          self.__texto_fecha(alerta.get_fecha_creacion()),
+                          estanteria.get_codigo() if estanteria is not None else None,
+                          int(alerta.esta_resuelta()),
+                          self.__texto_fecha(alerta.get_fecha_resolucion())))
+            if isinstance(alerta, AlertaAgrupada):
+                agrupadas.append((alerta.get_id(), alerta.get_piso(), alerta.get_cantidad(),
+                                  self.__texto_fecha(alerta.get_primera()),
+                                  self.__texto_fecha(alerta.get_ultima()),
+                                  alerta.get_mensaje_base()))
+        with self.unidad_de_trabajo():
+            self.__escribir("INSERT OR REPLACE INTO alertas VALUES (?, ?, ?, ?, ?, ?, ?)", filas)
+            self.__escribir("INSERT OR REPLACE INTO alertas_agrupadas VALUES (?, ?, ?, ?, ?, ?)",
+                            agrupadas)
+
+    def guardar_alerta(self, alerta) -> None:
+        """Guarda (o actualiza) una alerta."""
+        self.guardar_alertas([alerta])
+
+    def cargar_alertas(self, planta: Planta = None, codigo: str = None,
+                       resuelta: bool = None) -> list:
+        """
+        Carga alertas guardadas, conservando sus IDs.
+
+        Args:
+            planta: Planta donde buscar las estanterías asociadas (opcional)
+            codigo: Solo alertas de esta estantería (None para todas)
+            resuelta: Solo alertas resueltas (True) o pendientes (False)
+
+        Returns:
+            Lista de Alerta (AlertaAgrupada para las agrupadas) ordenada por ID
+        """
+        sql = ("SELECT a.*, g.id, g.piso, g.cantidad, g.primera, g.ultima, g.mensaje_base "
+               "FROM alertas a LEFT JOIN alertas_agrupadas g ON g.id = a.id WHERE 1 = 1")
+        parametros = []
+        if codigo is not None:
+            sql += " AND a.estanteria = ?"
+            parametros.append(codigo)
+        if resuelta is not None:
+            sql += " AND a.resuelta = ?"
+            parametros.append(int(resuelta))
+        alertas = []
+        for (id_alerta, tipo, mensaje, creacion, est, resuelta_, resolucion,
+             agrupada, piso, cantidad, primera, ultima, base) in self.__conexion.execute(
+                sql + " ORDER BY a.id", parametros):
+            estanteria = planta.get_estanteria(est) if planta is not None and est else None
+            datos = (id_alerta, tipo, mensaje, self.__leer_fecha(creacion), estanteria,
+                     bool(resuelta_), self.__leer_fecha(resolucion))
+            if agrupada is None:
+                alertas.append(Alerta.restaurar(*datos))
+            else:
+                alertas.append(AlertaAgrupada.restaurar(*datos, piso, cantidad,
+                                                        self.__leer_fecha(primera),
+                                                        self.__leer_fecha(ultima), base))
+        self.__avanzar_ids("alerta", "alertas")
+        return alertas
+
+    # Reportes
+
+    def guardar_reporte(self, reporte) -> None:
+        """
+        Guarda (o actualiza) un reporte. Los datos se guardan como JSON
+        (los valores que no son JSON se guardan como texto).
+
+        Args:
+            reporte: Instancia de Reporte
+        """
+        usuario = reporte.get_generado_por()
+        self.__escribir("INSERT OR REPLACE INTO reportes VALUES (?, ?, ?, ?, ?, ?, ?)", [(
+            reporte.get_id(), reporte.get_tipo(), reporte.get_periodo(),
+            usuario.get_username() if usuario is not None else None,
+            self.__texto_fecha(reporte.get_fecha_generacion()),
+            json.dumps(reporte.get_datos(), ensure_ascii=False, default=str),
+            int(reporte.esta_finalizado())
+        )])
+
+    def cargar_reportes(self, usuarios: dict = None, username: str = None) -> list:
+        """
+        Carga reportes guardados, conservando sus IDs.
+
+        Args:
+            usuarios: Diccionario {username: usuario} para asociar el generador
+            username: Solo reportes de este usuario (None para todos)
+
+        Returns:
+            Lista de Reporte ordenada por ID
+        """
+        usuarios = usuarios or {}
+        sql = "SELECT * FROM reportes"
+        parametros = []
+        if username is not None:
+            sql += " WHERE usuario = ?"
+            parametros.append(username)
+        reportes = []
+        for id_reporte, tipo, periodo, usuario, fecha, datos, finalizado in self.__conexion.execute(
+                sql + " ORDER BY id", parametros):
+            reportes.append(Reporte.restaurar(id_reporte, tipo, periodo, usuarios.get(usuario),
+                                              self.__leer_fecha(fecha), json.loads(datos),
+                                              bool(finalizado)))
+        self.__avanzar_ids("reporte", "reportes")
+        return reportes
+
+    # Registros de tiempo
+
+    def guardar_registros_tiempo(self, registros) -> None:
+        """
+        Guarda (o actualiza) varios registros de tiempo en una sola escritura.
+
+        Args:
+            registros: Instancias de RegistroTiempo
+        """
+        filas = []
+        for registro in registros:
+            trabajador = registro.get_trabajador()
+            filas.append((registro.get_id(),
+                          trabajador.get_username() if trabajador is not None else None,
+                          registro.get_fecha_registro().isoformat(),
+                          self.__texto_fecha(registro.get_hora_entrada()),
+                          self.__texto_fecha(registro.get_hora_salida()),
+                          registro.get_horas_trabajadas(), int(registro.es_completo())))
+        self.__escribir("INSERT OR REPLACE INTO registros_tiempo VALUES (?, ?, ?, ?, ?, ?, ?)", filas)
+
+    def guardar_registro_tiempo(self, registro) -> None:
+        """Guarda (o actualiza) un registro de tiempo."""
+        self.guardar_registros_tiempo([registro])
+
+    def guardar_turnos(self, turnos: list) -> list:
+        """
+        Guarda turnos completos sin crear objetos RegistroTiempo (importaciones masivas).
+
+        Args:
+            turnos: Lista de tuplas (username, día, entrada, salida) con
+                    date y datetime; el día es el de la entrada aunque la
+                    salida caiga al día siguiente
+
+        Returns:
+            IDs asignados a los registros, en el mismo orden
+        """
+        if not turnos:
+            return []
+        self.__avanzar_ids("registro_tiempo", "registros_tiempo")
+        primero, _ = get_asignador().reservar_bloque("registro_tiempo", len(turnos))
+        filas = [(primero + i, username, dia.isoformat(), entrada.isoformat(), salida.isoformat(),
+                  round((salida - entrada).total_seconds() / 3600, 2), 1)
+                 for i, (username, dia, entrada, salida) in enumerate(turnos)]
+        self.__escribir("INSERT INTO registros_tiempo VALUES (?, ?, ?, ?, ?, ?, ?)", filas)
+        return list(range(primero, primero + len(turnos)))
+
+    def cargar_registros_tiempo(self, usuarios: dict = None, username: str = None,
+                                desde: date = None, hasta: date = None) -> list:
+        """
+        Carga registros de tiempo guardados, conservando sus IDs.
+
+        Args:
+            usuarios: Diccionario {username: usuario} para asociar el trabajador
+            username: Solo registros de este trabajador (None para todos)
+            desde: Primera fecha incluida
+            hasta: Última fecha incluida
+
+        Returns:
+            Lista de RegistroTiempo ordenada por fecha e ID
+        """
+        usuarios = usuarios or {}
+        sql = "SELECT * FROM registros_tiempo WHERE 1 = 1"
+        parametros = []
+        if username is not None:
+            sql += " AND trabajador = ?"
+            parametros.append(username)
+        if desde is not None:
+            sql += " AND fecha >= ?"
+            parametros.append(desde.isoformat())
+        if hasta is not None:
+            sql += " AND fecha <= ?"
+            parametros.append(hasta.isoformat())
+        registros = []
+        for id_registro, trabajador, fecha, entrada, salida, horas, completo in self.__conexion.execute(
+                sql + " ORDER BY fecha, id", parametros):
+            registros.append(RegistroTiempo.restaurar(
+                id_registro, usuarios.get(trabajador), date.fromisoformat(fecha),
+                self.__leer_fecha(entrada), self.__leer_fecha(salida), horas, bool(completo)))
+        self.__avanzar_ids("registro_tiempo", "registros_tiempo")
+        return registros
+
+    # Utilidades
+
+    def __avanzar_ids(self, secuencia: str, tabla: str) -> None:
+        """Método privado: evita que las entidades nuevas repitan IDs guardados."""
+        maximo = self.__conexion.execute(f"SELECT MAX(id) FROM {tabla}").fetchone()[0]
+        if maximo is not None:
+            get_asignador().avanzar(secuencia, maximo)
+
+    @staticmethod
+    def __texto_fecha(fecha):
+        """Método privado que convierte una fecha a texto ISO (o None)."""
+        return fecha.isoformat() if fecha is not None else None
+
+    @staticmethod
+    def __leer_fecha(texto):
+        """Método privado que convierte texto ISO a datetime (o None)."""
+        return datetime.fromisoformat(texto) if texto else None
+
+    def cerrar(self) -> None:
+        """Confirma lo pendiente y cierra la conexión."""
+        if self.__profundidad == 0:
+            self.confirmar()
+        for estanteria in list(self.__seguidas.values()):
+            estanteria.quitar_observador(self)
+        self.__seguidas.clear()
+        self.__conexion.close()
+
+    def __enter__(self):
+        """Permite usar el repositorio en un bloque with."""
+        return self
+
+    def __exit__(self, tipo, valor, traza) -> None:
+        """Cierra el repositorio al salir del bloque with."""
+        self.cerrar()
+
+    def __repr__(self) -> str:
+        """Representación técnica del repositorio."""
+        return f"RepositorioSQLite(ruta={self.__ruta!r})"
@@ -0,0 +1,172 @@
+"""
+Clase ResumenNomina - Horas pre-agregadas por día, semana y mes
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+from datetime import date
+
+
+class ResumenNomina:
+    """
+    Clase que mantiene los totales de nómina a medida que se cierran turnos.
+
+    Guarda una cubeta por trabajador y día con las horas del día. Cada
+    turno cerrado suma sus horas a la cubeta de su día y actualiza, con la
+    diferencia, los totales de la semana ISO y del mes de ese día: horas,
+    días trabajados, jornadas completas y horas extra (lo que pasa de la
+    jornada normal cada día). Así la nómina de fin de mes de todos los
+    trabajadores es leer un total por trabajador, sin recorrer registros.
+
+    Demuestra:
+    - Encapsulación: Las cubetas y totales son privados
+    - Asociación: Se alimenta de un LibroRegistros
+    """
+
+    def __init__(self, jornada_normal: float = 8.0):
+        """
+        Constructor de ResumenNomina.
+
+        Args:
+            jornada_normal: Horas de una jornada completa (el resto es extra)
+        """
+        self.__jornada = jornada_normal
+        # username -> {día: horas}
+        self.__dias = {}
+        # (username, ("mes", año, mes) o ("semana", año, semana)) -> [horas, días, completas, extra]
+        self.__periodos = {}
+
+    def get_jornada_normal(self) -> float:
+        """Retorna las horas de una jornada completa."""
+        return self.__jornada
+
+    def registrar_libro(self, libro) -> None:
+        """
+        Carga los turnos cerrados de un libro y sigue los que se cierren después.
+
+        Args:
+            libro: Instancia de LibroRegistros
+        """
+        for username in libro.get_usernames():
+            for dia, horas in libro.obtener_horas_por_dia(username).items():
+                if horas:
+                    self.sumar_horas(username, dia, horas)
+        libro.agregar_observador(self.sumar_horas)
+
+    def sumar_horas(self, username: str, dia: date, horas: float) -> None:
+        """
+        Suma las horas de un turno cerrado a la cubeta de su día.
+
+        Args:
+            username: Usuario del trabajador
+            dia: Día de la jornada
+            horas: Horas del turno
+        """
+        cubetas = self.__dias.setdefault(username, {})
+        anterior = cubetas.get(dia, 0.0)
+        nuevo = anterior + horas
+        cubetas[dia] = nuevo
+
+        jornada = self.__jornada
+        diferencia = (horas,
+                      (nuevo > 0) - (anterior > 0),
+                      (nuevo >= jornada) - (anterior >= jornada),
+                      max(0.0, nuevo - jornada) - max(0.0, anterior - jornada))
+        año_iso, semana, _ = dia.isocalendar()
+        for periodo in (("mes", dia.year, dia.month), ("semana", año_iso, semana)):
+            totales = self.__periodos.get((username, periodo))
+            if totales is None:
+                totales = self.__periodos[(username, periodo)] = [0.0, 0, 0, 0.0]
+            for i, valor in enumerate(diferencia):
+                totales[i] += valor
+
+    @staticmethod
+    def __formatear(totales) -> dict:
+        """Método privado que convierte unos totales en diccionario."""
+        horas, dias, completas, extra = totales
+        return {"horas": round(horas, 2), "dias_trabajados": dias,
+                "jornadas_completas": completas, "horas_extra": round(extra, 2)}
+
+    # Consultas
+
+    def obtener_dia(self, username: str, dia: date) -> float:
+        """Retorna las horas de un trabajador en un día."""
+        return round(self.__dias.get(username, {}).get(dia, 0.0), 2)
+
+    def obtener_mes(self, año: int, mes: int, username: str = None) -> dict:
+        """
+        Retorna los totales de un mes.
+
+        Args:
+            año: Año
+            mes: Mes (1-12)
+            username: Un trabajador (None para todos)
+
+        Returns:
+            {username: {horas, dias_trabajados, jornadas_completas, horas_extra}}
+        """
+        return self.__obtener_periodo(("mes", año, mes), username)
+
+    def obtener_semana(self, año: int, semana: int, username: str = None) -> dict:
+        """Retorna los totales de una semana ISO (como obtener_mes)."""
+        return self.__obtener_periodo(("semana", año, semana), username)
+
+    def __obtener_periodo(self, periodo: tuple, username: str) -> dict:
+        """Método privado: totales de un periodo por trabajador."""
+        usernames = [username] if username is not None else self.__dias
+        resultado = {}
+        for nombre in usernames:
+            totales = self.__periodos.get((nombre, periodo))
+            if totales is not None and totales[1]:
+                resultado[nombre] = self.__formatear(totales)
+        return resultado
+
+    def obtener_rango(self, desde: date, hasta: date, username: str = None) -> dict:
+        """
+        Retorna los totales de un rango de días cualquiera sumando las cubetas diarias.
+
+        Returns:
+            {username: {horas, dias_trabajados, jornadas_completas, horas_extra}}
+        """
+        jornada = self.__jornada
+        usernames = [username] if username is not None else self.__dias
+        resultado = {}
+        for nombre in usernames:
+            totales = [0.0, 0, 0, 0.0]
+            for dia, horas in self.__dias.get(nombre, {}).items():
+                if desde <= dia <= hasta and horas > 0:
+                    totales[0] += horas
+                    totales[1] += 1
+                    totales[2] += horas >= jornada
+                    totales[3] += max(0.0, horas - jornada)
+            if totales[1]:
+                resultado[nombre] = self.__formatear(totales)
+        return resultado
+
+    def generar_reporte_mes(self, año: int, mes: int) -> str:
+        """
+        Genera el reporte de nómina de un mes.
+
+        Returns:
+            String con una línea por trabajador y el total
+        """
+        totales_mes = self.obtener_mes(año, mes)
+        lineas = [f"\n{'='*60}", f"NÓMINA {mes:02d}/{año}", f"{'='*60}",
+                  f"{'Trabajador':<16}{'Horas':>10}{'Días':>8}{'Completas':>11}{'Extra':>10}"]
+        total_horas = total_extra = 0.0
+        for username in sorted(totales_mes):
+            datos = totales_mes[username]
+            total_horas += datos["horas"]
+            total_extra += datos["horas_extra"]
+            lineas.append(f"{username:<16}{datos['horas']:>10.2f}{datos['dias_trabajados']:>8}"
+                          f"{datos['jornadas_completas']:>11}{datos['horas_extra']:>10.2f}")
+        lineas.append(f"{'-'*60}")
+        lineas.append(f"{'Total':<16}{total_horas:>10.2f}{'':>19}{total_extra:>10.2f}")
+        lineas.append(f"{'='*60}\n")
+        return "\n".join(lineas)
+
+    def __repr__(self) -> str:
+        """Representación técnica del resumen."""
+        return (f"ResumenNomina(trabajadores={len(self.__dias)}, "
+                f"cubetas={sum(len(cubetas) for cubetas in self.__dias.values())})")
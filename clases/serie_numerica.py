@@ -0,0 +1,331 @@
+"""
+Clases AcumuladorEstadistico y SerieNumerica - Series numéricas de los reportes
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+
+class AcumuladorEstadistico:
+    """
+    Clase que acumula cantidad, media, varianza, mínimo y máximo en una sola pasada.
+
+    La media y la varianza se actualizan con el método de Welford (estable
+    aunque los valores sean grandes) y dos acumuladores se combinan con la
+    fórmula de Chan, así que los totales de una semana o un mes salen de
+    combinar los acumuladores de sus días sin volver a leer los valores.
+
+    Demuestra:
+    - Encapsulación: Los acumulados son privados
+    """
+
+    __slots__ = ("__cantidad", "__media", "__m2", "__minimo", "__maximo")
+
+    def __init__(self):
+        """Constructor de AcumuladorEstadistico (vacío)."""
+        self.__cantidad = 0
+        self.__media = 0.0
+        self.__m2 = 0.0
+        self.__minimo = math.inf
+        self.__maximo = -math.inf
+
+    def agregar(self, valor: float) -> None:
+        """
+        Agrega un valor.
+
+        Args:
+            valor: Valor numérico
+        """
+        self.__cantidad += 1
+        delta = valor - self.__media
+        self.__media += delta / self.__cantidad
+        self.__m2 += delta * (valor - self.__media)
+        if valor < self.__minimo:
+            self.__minimo = valor
+        if valor > self.__maximo:
+            self.__maximo = valor
+
+    def combinar(self, otro: "AcumuladorEstadistico") -> None:
+        """
+        Suma los valores de otro acumulador a este.
+
+        Args:
+            otro: Instancia de AcumuladorEstadistico
+        """
+        if not otro.__cantidad:
+            return
+        cantidad = self.__cantidad + otro.__cantidad
+        delta = otro.__media - self.__media
+        self.__media += delta * otro.__cantidad / cantidad
+        self.__m2 += otro.__m2 + delta * delta * self.__cantidad * otro.__cantidad / cantidad
+        self.__cantidad = cantidad
+        self.__minimo = min(self.__minimo, otro.__minimo)
+        self.__maximo = max(self.__maximo, otro.__maximo)
+
+    def contar(self) -> int:
+        """Retorna la cantidad de valores."""
+        return self.__cantidad
+
+    def calcular_media(self) -> float:
+        """Retorna la media (0 si está vacío)."""
+        return self.__media
+
+    def calcular_varianza(self, muestral: bool = True) -> float:
+        """
+        Retorna la varianza.
+
+        Args:
+            muestral: Si se divide por n - 1 (True) o por n (False)
+        """
+        divisor = self.__cantidad - 1 if muestral else self.__cantidad
+        return self.__m2 / divisor if divisor > 0 else 0.0
+
+    def calcular_suma(self) -> float:
+        """Retorna la suma de los valores."""
+        return self.__media * self.__cantidad
+
+    def resumir(self) -> dict:
+        """
+        Resume el acumulador.
+
+        Returns:
+            Diccionario con cantidad, suma, media, desviacion, minimo y maximo
+        """
+        if not self.__cantidad:
+            return {"cantidad": 0}
+        return {"cantidad": self.__cantidad,
+                "suma": self.calcular_suma(),
+                "media": self.__media,
+                "desviacion": math.sqrt(self.calcular_varianza()),
+                "minimo": self.__minimo,
+                "maximo": self.__maximo}
+
+    def __repr__(self) -> str:
+        """Representación técnica del acumulador."""
+        return f"AcumuladorEstadistico(cantidad={self.__cantidad}, media={self.__media:.4g})"
+
+
+class SerieNumerica:
+    """
+    Clase que guarda una serie numérica fechada (kg por día, defectos, horas).
+
+    Las fechas (como ordinal del día) y los valores se guardan en dos
+    arreglos tipados, sin un objeto por punto. Cada valor agregado
+    actualiza el acumulador total y el de su día, así que las estadísticas
+    de la serie y las agrupaciones por semana, mes o año combinan
+    acumuladores diarios en vez de recorrer los valores. Solo los
+    cuantiles necesitan los valores: se calculan ordenando una copia, que
+    se conserva hasta que la serie cambia.
+
+    Demuestra:
+    - Encapsulación: Los arreglos y acumuladores son privados
+    - Composición: Contiene objetos AcumuladorEstadistico
+    """
+
+    PERIODOS = ("dia", "semana", "mes", "año")
+
+    def __init__(self, nombre: str, unidad: str = ""):
+        """
+        Constructor de SerieNumerica.
+
+        Args:
+            nombre: Nombre de la serie (ej: "kg_diarios")
+            unidad: Unidad de los valores (ej: "kg")
+        """
+        self.__nombre = nombre
+        self.__unidad = unidad
+        self.__dias = array("l")
+        self.__valores = array("d")
+        self.__total = AcumuladorEstadistico()
+        # ordinal del día -> AcumuladorEstadistico
+        self.__por_dia = {}
+        # Si los días se agregaron en orden (permite cortar por rangos)
+        self.__ordenada = True
+        self.__ordenados = None
+
+    @staticmethod
+    def __ordinal(fecha) -> int:
+        """Método privado: ordinal del día de una fecha, datetime u ordinal."""
+        if isinstance(fecha, date):
+            return fecha.toordinal()
+        return int(fecha)
+
+    def get_nombre(self) -> str:
+        """Retorna el nombre de la serie."""
+        return self.__nombre
+
+    def get_unidad(self) -> str:
+        """Retorna la unidad de los valores."""
+        return self.__unidad
+
+    def agregar(self, fecha, valor: float) -> None:
+        """
+        Agrega un valor a la serie.
+
+        Args:
+            fecha: Día del valor (date, datetime u ordinal)
+            valor: Valor numérico
+        """
+        self.extender([fecha], [valor])
+
+    def extender(self, fechas, valores) -> None:
+        """
+        Agrega varios valores a la serie.
+
+        Args:
+            fechas: Iterable con el día de cada valor
+            valores: Iterable con los valores (mismo largo que fechas)
+        """
+        ordinal = self.__ordinal
+        dias_nuevos = array("l", [ordinal(fecha) for fecha in fechas])
+        valores_nuevos = array("d", valores)
+        if len(dias_nuevos) != len(valores_nuevos):
+            raise ValueError("Las fechas y los valores deben tener el mismo largo")
+        if not dias_nuevos:
+            return
+
+        ultimo = self.__dias[-1] if self.__dias else dias_nuevos[0]
+        if self.__ordenada:
+            for dia in dias_nuevos:
+                if dia < ultimo:
+                    self.__ordenada = False
+                    break
+                ultimo = dia
+
+        por_dia = self.__por_dia
+        total = self.__total
+        for dia, valor in zip(dias_nuevos, valores_nuevos):
+            acumulador = por_dia.get(dia)
+            if acumulador is None:
+                acumulador = por_dia[dia] = AcumuladorEstadistico()
+            acumulador.agregar(valor)
+            total.agregar(valor)
+        self.__dias.extend(dias_nuevos)
+        self.__valores.extend(valores_nuevos)
+        self.__ordenados = None
+
+    def __ordenar(self) -> None:
+        """Método privado: ordena los arreglos por día (una vez por cambio)."""
+        if self.__ordenada:
+            return
+        pares = sorted(zip(self.__dias, self.__valores), key=lambda par: par[0])
+        self.__dias = array("l", [dia for dia, _ in pares])
+        self.__valores = array("d", [valor for _, valor in pares])
+        self.__ordenada = True
+
+    @staticmethod
+    def __cuantiles(ordenados, cuantiles) -> dict:
+        """Método privado: cuantiles por interpolación lineal de valores ordenados."""
+        resultado = {}
+        ultimo = len(ordenados) - 1
+        for q in cuantiles:
+            posicion = q * ultimo
+            abajo = math.floor(posicion)
+            arriba = min(abajo + 1, ultimo)
+            fraccion = posicion - abajo
+            resultado[f"p{round(q * 100)}"] = (ordenados[abajo] * (1 - fraccion)
+                                               + ordenados[arriba] * fraccion)
+        return resultado
+
+    @staticmethod
+    def __clave_periodo(ordinal: int, periodo: str):
+        """Método privado: clave del periodo al que pertenece un día."""
+        dia = date.fromordinal(ordinal)
+        if periodo == "dia":
+            return dia
+        if periodo == "semana":
+            año_iso, semana, _ = dia.isocalendar()
+            return (año_iso, semana)
+        if periodo == "mes":
+            return (dia.year, dia.month)
+        return dia.year
+
+    # Consultas
+
+    def calcular_estadisticas(self, cuantiles: tuple = (0.5, 0.9)) -> dict:
+        """
+        Calcula las estadísticas de toda la serie.
+
+        Args:
+            cuantiles: Cuantiles a calcular (entre 0 y 1); vacío para omitirlos
+
+        Returns:
+            Diccionario con cantidad, suma, media, desviacion, minimo, maximo y p<q>
+        """
+        resumen = self.__total.resumir()
+        if cuantiles and self.__valores:
+            if self.__ordenados is None:
+                self.__ordenados = sorted(self.__valores)
+            resumen.update(self.__cuantiles(self.__ordenados, cuantiles))
+        return resumen
+
+    def agrupar(self, periodo: str = "mes", desde=None, hasta=None, cuantiles: tuple = ()) -> dict:
+        """
+        Calcula las estadísticas por periodo.
+
+        Args:
+            periodo: 'dia', 'semana' (ISO), 'mes' o 'año'
+            desde: Primer día incluido (None para el inicio)
+            hasta: Último día incluido (None para el final)
+            cuantiles: Cuantiles a calcular por periodo (recorre los valores)
+
+        Returns:
+            {clave: estadísticas} ordenado por clave; la clave es un date, (año, semana),
+            (año, mes) o el año
+        """
+        if periodo not in self.PERIODOS:
+            raise ValueError(f"Periodo inválido: {periodo} (use {', '.join(self.PERIODOS)})")
+        inicio = self.__ordinal(desde) if desde is not None else -math.inf
+        fin = self.__ordinal(hasta) if hasta is not None else math.inf
+
+        grupos = {}
+        claves = {}
+        for dia in sorted(self.__por_dia):
+            if inicio <= dia <= fin:
+                clave = claves[dia] = self.__clave_periodo(dia, periodo)
+                acumulador = grupos.get(clave)
+                if acumulador is None:
+                    acumulador = grupos[clave] = AcumuladorEstadistico()
+                acumulador.combinar(self.__por_dia[dia])
+        resultado = {clave: acumulador.resumir() for clave, acumulador in grupos.items()}
+
+        if cuantiles and claves:
+            self.__ordenar()
+            dias = self.__dias
+            izquierda = bisect_left(dias, min(claves))
+            derecha = bisect_right(dias, max(claves))
+            valores_por_grupo = {}
+            for dia, valor in zip(dias[izquierda:derecha], self.__valores[izquierda:derecha]):
+                valores_por_grupo.setdefault(claves[dia], []).append(valor)
+            for clave, valores in valores_por_grupo.items():
+                valores.sort()
+                resultado[clave].update(self.__cuantiles(valores, cuantiles))
+        return resultado
+
+    def obtener_valores(self, desde=None, hasta=None) -> list:
+        """
+        Retorna los puntos de la serie ordenados por día.
+
+        Returns:
+            Lista de tuplas (date, valor)
+        """
+        self.__ordenar()
+        dias = self.__dias
+        izquierda = bisect_left(dias, self.__ordinal(desde)) if desde is not None else 0
+        derecha = bisect_right(dias, self.__ordinal(hasta)) if hasta is not None else len(dias)
+        return [(date.fromordinal(dia), valor)
+                for dia, valor in zip(dias[izquierda:derecha], self.__valores[izquierda:derecha])]
+
+    def __len__(self) -> int:
+        """Retorna la cantidad de valores."""
+        return len(self.__valores)
+
+    def __repr__(self) -> str:
+        """Representación técnica de la serie."""
+        return (f"SerieNumerica(nombre='{self.__nombre}', valores={len(self.__valores)}, "
+                f"dias={len(self.__por_dia)})")
@@ -0,0 +1,212 @@
+"""
+Clase SnapshotPlanta - Guarda y carga la planta completa en un archivo binario
+Sistema de Gestión de Producción de Orellanas
+
+Fecha: Noviembre 2025
+"""
+
+import os
+import struct
+import sys
+from array import array
+from datetime import datetime
+from clases.estanteria import Estanteria
+from clases.planta import Planta
+
+
+class SnapshotPlanta:
+    """
+    Clase que escribe y lee una foto binaria de toda la planta.
+
+    El archivo se escribe y se lee con una sola operación secuencial. Su
+    formato (little-endian) es:
+
+    - Cabecera: firma "ORELLANA", versión, nombre de la planta y número
+      de estanterías.
+    - Metadatos de cada estantería: código, fase, activa, ubicación,
+      fechas (marca de tiempo, 0 si no hay), si tiene tubulares cargados
+      y las posiciones de los tubulares con defecto (lista dispersa, ya
+      que son pocos), seguidas de sus observaciones (también dispersas:
+      cantidad y, por cada una, posición, marca de tiempo y texto).
+    - Columnas de estados (1 byte por tubular) de las estanterías con
+      tubulares cargados, una tras otra.
+    - Columnas de fechas de inoculación (8 bytes por tubular) de las
+      mismas estanterías.
+
+    Las estanterías en las que todos los tubulares están vacíos solo
+    ocupan sus metadatos.
+
+    Demuestra:
+    - Abstracción: Oculta el formato binario del archivo
+    """
+
+    FIRMA = b"ORELLANA"
+    VERSION = 2
+
+    __CABECERA = struct.Struct("<8sBI")
+    __METADATOS = struct.Struct("<BBddBH")
+    __LARGO = struct.Struct("<H")
+    __OBSERVACION = struct.Struct("<Hd")
+    __CANTIDAD = struct.Struct("<I")
+
+    @classmethod
+    def guardar(cls, planta: Planta, ruta: str) -> int:
+        """
+        Escribe la foto de la planta.
+
+        El archivo se escribe primero en un temporal y luego se reemplaza,
+        así un corte a mitad de escritura no deja una foto incompleta.
+
+        Args:
+            planta: Instancia de Planta
+            ruta: Archivo de destino
+
+        Returns:
+            Número de bytes escritos
+        """
+        estanterias = planta.get_estanterias()
+        partes = [cls.__CABECERA.pack(cls.FIRMA, cls.VERSION, len(estanterias)),
+                  cls.__texto(planta.get_nombre())]
+        estados = []
+        fechas = []
+        for estanteria in estanterias:
+            columnas = estanteria.exportar_tubulares()
+            defectuosos = []
+            if columnas is not None:
+                estados.append(columnas[0])
+                fechas.append(columnas[2])
+                defectos = columnas[1]
+                posicion = defectos.find(1)
+                while posicion != -1:
+                    defectuosos.append(posicion)
+                    posicion = defectos.find(1, posicion + 1)
+
+            partes.append(cls.__texto(estanteria.get_codigo()))
+            partes.append(cls.__texto(estanteria.get_ubicacion()))
+            partes.append(cls.__METADATOS.pack(
+                Estanteria.FASES.index(estanteria.get_fase()), estanteria.esta_activa(),
+                cls.__marca(estanteria.get_fecha_inicio()),
+                cls.__marca(estanteria.get_fecha_ultima_revision()),
+                columnas is not None, len(defectuosos)))
+            partes.append(cls.__little_endian(array('H', defectuosos)).tobytes())
+            observaciones = estanteria.exportar_observaciones()
+            partes.append(cls.__CANTIDAD.pack(len(observaciones)))
+            for posicion, fecha, texto in observaciones:
+                partes.append(cls.__OBSERVACION.pack(posicion, cls.__marca(fecha)))
+                partes.append(cls.__texto(texto))
+
+        partes.extend(estados)
+        partes.extend(cls.__little_endian(columna).tobytes() for columna in fechas)
+        contenido = b"".join(partes)
+
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, ruta)
+        return len(contenido)
+
+    @classmethod
+    def cargar(cls, ruta: str) -> Planta:
+        """
+        Lee una foto y reconstruye la planta.
+
+        Args:
+            ruta: Archivo de la foto
+
+        Returns:
+            Instancia de Planta con todas sus estanterías
+
+        Raises:
+            ValueError: Si el archivo no es una foto válida
+        """
+        with open(ruta, "rb") as archivo:
+            datos = memoryview(archivo.read())
+
+        firma, version, numero = cls.__CABECERA.unpack_from(datos, 0)
+        if firma != cls.FIRMA:
+            raise ValueError(f"{ruta} no es una foto de la planta")
+        if version != cls.VERSION:
+            raise ValueError(f"Versión de foto no soportada: {version}")
+        posicion = cls.__CABECERA.size
+        nombre, posicion = cls.__leer_texto(datos, posicion)
+
+        fases = Estanteria.FASES
+        estanterias = []
+        for _ in range(numero):
+            codigo, posicion = cls.__leer_texto(datos, posicion)
+            ubicacion, posicion = cls.__leer_texto(datos, posicion)
+            fase, activa, inicio, revision, cargada, numero_defectos = \
+                cls.__METADATOS.unpack_from(datos, posicion)
+            posicion += cls.__METADATOS.size
+            defectuosos = cls.__columna('H', datos[posicion:posicion + 2 * numero_defectos])
+            posicion += 2 * numero_defectos
+            numero_observaciones, = cls.__CANTIDAD.unpack_from(datos, posicion)
+            posicion += cls.__CANTIDAD.size
+            observaciones = []
+            for _ in range(numero_observaciones):
+                tubular, marca = cls.__OBSERVACION.unpack_from(datos, posicion)
+                texto, posicion = cls.__leer_texto(datos, posicion + cls.__OBSERVACION.size)
+                observaciones.append((tubular, cls.__fecha(marca), texto))
+            estanteria = Estanteria.restaurar(codigo, fases[fase], bool(activa), ubicacion,
+                                              cls.__fecha(inicio), cls.__fecha(revision))
+            if observaciones:
+                estanteria.cargar_observaciones(observaciones)
+            estanterias.append((estanteria, cargada, defectuosos))
+
+        total = Estanteria.TUBULARES_TOTALES
+        cargadas = sum(1 for _, cargada, _ in estanterias if cargada)
+        inicio_fechas = posicion + cargadas * total
+        if len(datos) != inicio_fechas + cargadas * total * 8:
+            raise ValueError(f"Foto incompleta o dañada: {ruta}")
+
+        planta = Planta(nombre)
+        indice = 0
+        for estanteria, cargada, defectuosos in estanterias:
+            if cargada:
+                estados = datos[posicion + indice * total:posicion + (indice + 1) * total]
+                desde = inicio_fechas + indice * total * 8
+                fechas = cls.__columna('d', datos[desde:desde + total * 8])
+                defectos = bytearray(total)
+                for defectuoso in defectuosos:
+                    defectos[defectuoso] = 1
+                estanteria.cargar_tubulares(estados, defectos, fechas)
+                indice += 1
+            planta.agregar_estanteria(estanteria)
+        return planta
+
+    @classmethod
+    def __texto(cls, texto: str) -> bytes:
+        """Método privado: texto UTF-8 precedido de su largo."""
+        codificado = (texto or "").encode("utf-8")
+        return cls.__LARGO.pack(len(codificado)) + codificado
+
+    @classmethod
+    def __leer_texto(cls, datos, posicion: int) -> tuple:
+        """Método privado que lee un texto y retorna (texto, nueva posición)."""
+        largo, = cls.__LARGO.unpack_from(datos, posicion)
+        posicion += cls.__LARGO.size
+        return str(datos[posicion:posicion + largo], "utf-8"), posicion + largo
+
+    @staticmethod
+    def __marca(fecha) -> float:
+        """Método privado: datetime a marca de tiempo (0.0 si es None)."""
+        return fecha.timestamp() if fecha is not None else 0.0
+
+    @staticmethod
+    def __fecha(marca: float):
+        """Método privado: marca de tiempo a datetime (None si es 0.0)."""
+        return datetime.fromtimestamp(marca) if marca else None
+
+    @classmethod
+    def __columna(cls, tipo: str, datos) -> array:
+        """Método privado que lee un arreglo numérico guardado en el archivo."""
+        columna = array(tipo)
+        columna.frombytes(datos)
+        return cls.__little_endian(columna)
+
+    @staticmethod
+    def __little_endian(columna: array) -> array:
+        """Método privado: el archivo siempre guarda los números en little-endian."""
+        if sys.byteorder == "big":
+            columna.byteswap()
+        return columna
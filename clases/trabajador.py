@@ -8,6 +8,7 @@ Fecha: Noviembre 2025
 
 from clases.usuario import Usuario
 from datetime import datetime
+from clases import eventos
 
 
 class Trabajador(Usuario):
@@ -67,9 +68,12 @@ class Trabajador(Usuario):
         """
         if horas > 0:
             self.__horas_trabajadas += horas
-            print(f"✓ {horas}h agregadas a {self.get_nombre_completo()}. Total: {self.__horas_trabajadas}h")
+            eventos.publicar(eventos.TRABAJADOR_HORAS,
+                             f"✓ {horas}h agregadas a {self.get_nombre_completo()}. Total: {self.__horas_trabajadas}h",
+                             id=self.get_id(), horas=horas, total=self.__horas_trabajadas)
         else:
-            print("✗ Las horas deben ser mayores a 0")
+            eventos.publicar(eventos.TRABAJADOR_HORAS, "✗ Las horas deben ser mayores a 0",
+                             "error", id=self.get_id(), horas=horas)
     
     def asignar_tarea(self, tarea: str) -> None:
         """
@@ -85,7 +89,9 @@ class Trabajador(Usuario):
             "fecha_completada": None
         }
         self.__tareas_asignadas.append(tarea_con_fecha)
-        print(f"✓ Tarea asignada a {self.get_nombre_completo()}: {tarea}")
+        eventos.publicar(eventos.TRABAJADOR_TAREA,
+                         f"✓ Tarea asignada a {self.get_nombre_completo()}: {tarea}",
+                         id=self.get_id(), tarea=tarea, completada=False)
     
     def completar_tarea(self, indice: int) -> bool:
         """
@@ -101,9 +107,12 @@ class Trabajador(Usuario):
             self.__tareas_asignadas[indice]["completada"] = True
             self.__tareas_asignadas[indice]["fecha_completada"] = datetime.now()
             tarea = self.__tareas_asignadas[indice]["descripcion"]
-            print(f"✓ Tarea completada por {self.get_nombre_completo()}: {tarea}")
+            eventos.publicar(eventos.TRABAJADOR_TAREA,
+                             f"✓ Tarea completada por {self.get_nombre_completo()}: {tarea}",
+                             id=self.get_id(), tarea=tarea, completada=True)
             return True
-        print(f"✗ Índice de tarea inválido: {indice}")
+        eventos.publicar(eventos.TRABAJADOR_TAREA, f"✗ Índice de tarea inválido: {indice}",
+                         "error", id=self.get_id(), indice=indice)
         return False
     
     def asignar_estanteria(self, estanteria) -> None:
@@ -115,9 +124,13 @@ class Trabajador(Usuario):
         """
         if estanteria not in self.__estanterias_asignadas:
             self.__estanterias_asignadas.append(estanteria)
-            print(f"✓ Estantería {estanteria.get_codigo()} asignada a {self.get_nombre_completo()}")
+            eventos.publicar(eventos.TRABAJADOR_ESTANTERIA,
+                             f"✓ Estantería {estanteria.get_codigo()} asignada a {self.get_nombre_completo()}",
+                             id=self.get_id(), codigo=estanteria.get_codigo())
         else:
-            print(f"ℹ️ Estantería ya asignada a {self.get_nombre_completo()}")
+            eventos.publicar(eventos.TRABAJADOR_ESTANTERIA,
+                             f"ℹ️ Estantería ya asignada a {self.get_nombre_completo()}",
+                             "aviso", id=self.get_id(), codigo=estanteria.get_codigo())
     
     def obtener_tareas_pendientes(self) -> list:
         """
@@ -7,6 +7,9 @@ Fecha: Noviembre 2024
 """
 
 from datetime import datetime
+from clases.asignador_ids import siguiente_id
+from clases import eventos
+from clases.almacen_tubulares import AlmacenTubulares
 
 
 class Tubular:
@@ -16,24 +19,27 @@ class Tubular:
     Demuestra:
     - Encapsulación: Todos los atributos son privados
     - Abstracción: Representa solo lo importante de un tubular
+
+    El estado, la bandera de defecto, la fecha de inoculación y las
+    observaciones viven en un AlmacenTubulares compartido; el Tubular es
+    una vista sobre su posición y usa __slots__.
     """
     
-    _contador_id = 0
+    __slots__ = ("__id", "__numero", "__almacen", "__indice")
     
-    def __init__(self, numero: int):
+    def __init__(self, numero: int, almacen: AlmacenTubulares = None, indice: int = 0):
         """
         Constructor de Tubular.
         
         Args:
             numero: Número identificador del tubular en el piso (1-80)
+            almacen: Almacén columnar donde vive su estado (uno propio si es None)
+            indice: Posición del tubular dentro del almacén
         """
-        Tubular._contador_id += 1
-        self.__id = Tubular._contador_id
+        self.__id = siguiente_id("tubular")
         self.__numero = numero
-        self.__estado = "vacío"  
-        self.__fecha_inoculacion = None
-        self.__observaciones = []
-        self.__defectuoso = False
+        self.__almacen = almacen if almacen is not None else AlmacenTubulares(1)
+        self.__indice = indice
     
 
     def get_id(self) -> int:
@@ -46,19 +52,19 @@ class Tubular:
     
     def get_estado(self) -> str:
         """Retorna el estado actual del tubular."""
-        return self.__estado
+        return self.__almacen.get_estado(self.__indice)
     
     def get_fecha_inoculacion(self):
         """Retorna la fecha de inoculación."""
-        return self.__fecha_inoculacion
+        return self.__almacen.get_fecha_inoculacion(self.__indice)
     
     def get_observaciones(self) -> list:
         """Retorna la lista de observaciones."""
-        return self.__observaciones.copy()
+        return self.__almacen.get_observaciones(self.__indice)
     
     def es_defectuoso(self) -> bool:
         """Indica si el tubular está defectuoso."""
-        return self.__defectuoso
+        return self.__almacen.es_defectuoso(self.__indice)
     
 
     def set_estado(self, nuevo_estado: str) -> None:
@@ -70,16 +76,19 @@ class Tubular:
         """
         estados_validos = ["vacío", "inoculado", "en_desarrollo", "producción", "cosechado"]
         if nuevo_estado.lower() in estados_validos:
-            self.__estado = nuevo_estado.lower()
-            print(f"Tubular {self.__numero}: Estado cambiado a '{nuevo_estado}'")
+            self.__almacen.set_estado(self.__indice, nuevo_estado.lower())
+            eventos.publicar(eventos.TUBULAR_ESTADO_CAMBIADO,
+                             f"Tubular {self.__numero}: Estado cambiado a '{nuevo_estado}'",
+                             id=self.__id, numero=self.__numero, estado=nuevo_estado.lower())
         else:
             raise ValueError(f"Estado inválido. Debe ser: {', '.join(estados_validos)}")
     
     def marcar_defectuoso(self) -> None:
         """Marca el tubular como defectuoso."""
-        self.__defectuoso = True
-        self.__estado = "defectuoso"
-        print(f"⚠️ Tubular {self.__numero} marcado como defectuoso")
+        self.__almacen.marcar_defectuoso(self.__indice)
+        eventos.publicar(eventos.TUBULAR_DEFECTUOSO,
+                         f"⚠️ Tubular {self.__numero} marcado como defectuoso", "aviso",
+                         id=self.__id, numero=self.__numero)
     
     def agregar_observacion(self, observacion: str) -> None:
         """
@@ -89,21 +98,23 @@ class Tubular:
             observacion: Texto de la observación
         """
         if observacion and len(observacion) > 0:
-            obs = {
-                "fecha": datetime.now(),
-                "texto": observacion
-            }
-            self.__observaciones.append(obs)
-            print(f"Observación agregada a tubular {self.__numero}")
+            self.__almacen.agregar_observacion(self.__indice, observacion)
+            eventos.publicar(eventos.TUBULAR_OBSERVACION,
+                             f"Observación agregada a tubular {self.__numero}",
+                             id=self.__id, numero=self.__numero, texto=observacion)
     
     def inocular(self) -> None:
         """Registra la inoculación del tubular."""
-        if self.__estado == "vacío":
-            self.__fecha_inoculacion = datetime.now()
-            self.__estado = "inoculado"
-            print(f"✓ Tubular {self.__numero} inoculado exitosamente")
+        if self.get_estado() == "vacío":
+            self.__almacen.set_fecha_inoculacion(self.__indice, datetime.now())
+            self.__almacen.set_estado(self.__indice, "inoculado")
+            eventos.publicar(eventos.TUBULAR_INOCULADO,
+                             f"✓ Tubular {self.__numero} inoculado exitosamente",
+                             id=self.__id, numero=self.__numero)
         else:
-            print(f"✗ Error: Tubular {self.__numero} no está vacío")
+            eventos.publicar(eventos.TUBULAR_INOCULADO,
+                             f"✗ Error: Tubular {self.__numero} no está vacío", "error",
+                             id=self.__id, numero=self.__numero)
     
     def calcular_tiempo_desarrollo(self) -> float:
         """
@@ -112,16 +123,17 @@ class Tubular:
         Returns:
             Días transcurridos desde la inoculación, 0 si no ha sido inoculado
         """
-        if self.__fecha_inoculacion:
-            diferencia = datetime.now() - self.__fecha_inoculacion
+        fecha_inoculacion = self.get_fecha_inoculacion()
+        if fecha_inoculacion:
+            diferencia = datetime.now() - fecha_inoculacion
             return diferencia.days + (diferencia.seconds / 86400)
         return 0.0
     
     def __str__(self) -> str:
         """Representación en string del tubular."""
-        defectuoso_str = " DEFECTUOSO" if self.__defectuoso else ""
-        return f"Tubular #{self.__numero} [{self.__estado}]{defectuoso_str}"
+        defectuoso_str = " DEFECTUOSO" if self.es_defectuoso() else ""
+        return f"Tubular #{self.__numero} [{self.get_estado()}]{defectuoso_str}"
     
     def __repr__(self) -> str:
         """Representación técnica del tubular."""
-        return f"Tubular(id={self.__id}, num={self.__numero}, estado='{self.__estado}')"
+        return f"Tubular(id={self.__id}, num={self.__numero}, estado='{self.get_estado()}')"
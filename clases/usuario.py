@@ -6,8 +6,12 @@ Autor: [Juan David Valencia Vera]
 Fecha: Noviembre 2024
 """
 
+import hashlib
+import hmac
+import os
 from abc import ABC, abstractmethod
 from datetime import datetime
+from clases.asignador_ids import siguiente_id
 
 
 class Usuario(ABC):
@@ -18,10 +22,13 @@ class Usuario(ABC):
     - Abstracción: Define la estructura común para todos los usuarios
     - Encapsulación: Atributos privados con getters y setters
     - Polimorfismo: Métodos abstractos que deben implementar las clases hijas
+
+    La contraseña nunca se guarda: solo su hash PBKDF2-SHA256 con una sal
+    aleatoria por usuario.
     """
-    
 
-    _contador_id = 0
+    ALGORITMO_HASH = "pbkdf2_sha256"
+    ITERACIONES_HASH = 200000
     
     def __init__(self, nombre: str, apellido: str, username: str, 
                  password: str, email: str, rol: str):
@@ -32,17 +39,16 @@ class Usuario(ABC):
             nombre: Nombre del usuario
             apellido: Apellido del usuario
             username: Nombre de usuario único
-            password: Contraseña del usuario
+            password: Contraseña del usuario (None si el hash se asigna después)
             email: Correo electrónico
             rol: Rol del usuario en el sistema
         """
         
-        Usuario._contador_id += 1
-        self.__id = Usuario._contador_id
+        self.__id = siguiente_id("usuario")
         self.__nombre = nombre
         self.__apellido = apellido
         self.__username = username
-        self.__password = password
+        self.__hash_password = self.__calcular_hash(password) if password is not None else None
         self.__email = email
         self.__rol = rol
         self.__fecha_creacion = datetime.now()
@@ -101,6 +107,38 @@ class Usuario(ABC):
         else:
             raise ValueError("El email no es válido")
     
+    @classmethod
+    def __calcular_hash(cls, password: str, sal: bytes = None, iteraciones: int = None) -> str:
+        """Método privado: hash de la contraseña como 'algoritmo$iteraciones$sal$hash'."""
+        sal = sal if sal is not None else os.urandom(16)
+        iteraciones = iteraciones or cls.ITERACIONES_HASH
+        resumen = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), sal, iteraciones)
+        return f"{cls.ALGORITMO_HASH}${iteraciones}${sal.hex()}${resumen.hex()}"
+
+    def __verificar_password(self, password: str) -> bool:
+        """Método privado que compara una contraseña con el hash guardado."""
+        if self.__hash_password is None or password is None:
+            return False
+        _, iteraciones, sal, _ = self.__hash_password.split("$")
+        calculado = self.__calcular_hash(password, bytes.fromhex(sal), int(iteraciones))
+        return hmac.compare_digest(calculado, self.__hash_password)
+
+    @classmethod
+    def es_hash_password(cls, texto: str) -> bool:
+        """Retorna True si el texto tiene el formato de un hash de contraseña."""
+        partes = texto.split("$") if texto else []
+        return len(partes) == 4 and partes[0] == cls.ALGORITMO_HASH and partes[1].isdigit()
+
+    def _get_hash_password(self) -> str:
+        """Retorna el hash de la contraseña (uso interno, para la persistencia)."""
+        return self.__hash_password
+
+    def _set_hash_password(self, hash_password: str) -> None:
+        """Asigna un hash guardado (uso interno, al cargar usuarios)."""
+        if not self.es_hash_password(hash_password):
+            raise ValueError("El hash de la contraseña no es válido")
+        self.__hash_password = hash_password
+
     def validar_credenciales(self, username: str, password: str) -> bool:
         """
         Valida las credenciales del usuario.
@@ -112,7 +150,7 @@ class Usuario(ABC):
         Returns:
             True si las credenciales son correctas, False en caso contrario
         """
-        return self.__username == username and self.__password == password
+        return self.__username == username and self.__verificar_password(password)
     
     def cambiar_password(self, password_actual: str, password_nueva: str) -> bool:
         """
@@ -125,9 +163,9 @@ class Usuario(ABC):
         Returns:
             True si el cambio fue exitoso, False en caso contrario
         """
-        if self.__password == password_actual:
+        if self.__verificar_password(password_actual):
             if len(password_nueva) >= 6:
-                self.__password = password_nueva
+                self.__hash_password = self.__calcular_hash(password_nueva)
                 return True
             else:
                 raise ValueError("La contraseña debe tener al menos 6 caracteres")
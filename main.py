@@ -29,6 +29,7 @@ from clases.publicacion import Publicacion
 from clases.reporte import Reporte
 from clases.registro_tiempo import RegistroTiempo
 from clases.alerta import Alerta
+from clases.planta import Planta
 
 
 def imprimir_separador(titulo=""):
@@ -131,8 +132,12 @@ DEMOSTRACIÓN DE POO EN CONSOLA
 
 """)
 
-trabajador1, estanteria1, supervisor1 = crear_instancias_estudiante_1()
-trabajador2, jefe1, estanteria2 = crear_instancias_estudiante_2()
+    trabajador1, estanteria1, supervisor1 = crear_instancias_estudiante_1()
+    trabajador2, jefe1, estanteria2 = crear_instancias_estudiante_2()
+
+    planta = Planta()
+    planta.agregar_estanteria(estanteria1)
+    planta.agregar_estanteria(estanteria2)
 
 # SECCIÓN 2: ASIGNACIÓN DE TRABAJADORES
     # ======================================
@@ -256,9 +261,10 @@ trabajador2, jefe1, estanteria2 = crear_instancias_estudiante_2()
     
     print(f"""
 
-Tubulares totales: {estanteria1.contar_tubulares_total() + estanteria2.contar_tubulares_total()}
-  - En producción: {estanteria1.obtener_estado_general()['tubulares_totales'] + estanteria2.obtener_estado_general()['tubulares_totales']}
-  - Defectuosos: {estanteria1.contar_defectuosos_total() + estanteria2.contar_defectuosos_total()}
+Tubulares totales: {planta.contar_tubulares_total()}
+  - En producción: {planta.contar_tubulares_por_estado()['producción']}
+  - Defectuosos: {planta.contar_defectuosos_total()}
+  - Eficiencia: {planta.calcular_eficiencia_total()}%
 
 Tareas asignadas: 3
 Tareas completadas: 1
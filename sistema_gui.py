@@ -2,6 +2,7 @@
 SISTEMA_GUI.PY - Sistema de Gestión de Orellanas con Interfaz Gráfica
 """
 
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from clases.usuario import Usuario
@@ -9,12 +10,24 @@ from clases.trabajador import Trabajador
 from clases.supervisor import Supervisor
 from clases.jefe_planta import JefePlanta
 from clases.estanteria import Estanteria
+from clases.planta import Planta
 from clases.publicacion import Publicacion
 from clases.reporte import Reporte
 from clases.alerta import Alerta
+from clases.repositorio import RepositorioSQLite
+from clases.snapshot import SnapshotPlanta
+from clases.historial_produccion import HistorialProduccion
+from clases.planificador import PlanificadorCiclo
+from clases.almacen_alertas import AlmacenAlertas
+from clases.estadisticas_resolucion import EstadisticasResolucion
+from clases.motor_reglas import MotorReglas
+from clases.agrupador_alertas import AgrupadorAlertas
+from clases.notificador import DespachadorNotificaciones, CanalArchivo
+from clases import eventos
 
 class SistemaOrellanas:
-    def __init__(self):
+    def __init__(self, ruta_bd="orellanas.db", ruta_snapshot="planta.snap", ruta_alertas="alertas.log",
+                 ruta_historial="historial.bin"):
         self.root = tk.Tk()
         self.root.title("Sistema de Gestión de Orellanas")
         self.root.geometry("1000x700")
@@ -23,11 +36,54 @@ class SistemaOrellanas:
         # Usuario actual
         self.usuario_actual = None
         
-        # Base de datos de usuarios (simulada)
-        self.usuarios = self._crear_usuarios_ejemplo()
-        
-        # Estanterías de ejemplo
-        self.estanterias = self._crear_estanterias_ejemplo()
+        # Base de datos local: los datos se conservan entre ejecuciones
+        self.repositorio = RepositorioSQLite(ruta_bd)
+        self.ruta_snapshot = ruta_snapshot
+        
+        # Usuarios guardados (o de ejemplo la primera vez)
+        self.usuarios = self.repositorio.cargar_usuarios()
+        if not self.usuarios:
+            self.usuarios = self._crear_usuarios_ejemplo()
+            self.repositorio.guardar_usuarios(self.usuarios.values())
+        
+        # Planta guardada (o con estanterías de ejemplo la primera vez)
+        self.planta, guardada = self._cargar_planta()
+        if len(self.planta) == 0:
+            self.planta = self._crear_estanterias_ejemplo()
+            guardada = False
+        # Lo que ya está en la base solo se sigue, sin reescribirlo
+        self.repositorio.seguir_planta(self.planta, guardar=not guardada)
+        
+        # Avance automático del ciclo de los tubulares
+        self.planificador = PlanificadorCiclo()
+        self.planificador.registrar_planta(self.planta)
+        
+        # Una foto diaria de cada estantería para ver tendencias
+        self.historial = HistorialProduccion(ruta_historial)
+        
+        # Alertas guardadas, indexadas para consultarlas sin recorrer el historial
+        self.alertas = AlmacenAlertas(self.repositorio.cargar_alertas(self.planta))
+        # Tiempos de resolución (se actualizan solos al resolver o reabrir)
+        self.tiempos_resolucion = EstadisticasResolucion(self.alertas)
+        
+        # Alertas automáticas; las nuevas se indexan y se guardan en la base
+        eventos.bus_eventos.suscribir(self._alerta_creada, eventos.ALERTA_CREADA)
+        eventos.bus_eventos.suscribir(self._alerta_cambiada, eventos.ALERTA_RESUELTA)
+        eventos.bus_eventos.suscribir(self._alerta_cambiada, eventos.ALERTA_REABIERTA)
+        self.motor_reglas = MotorReglas()
+        # Las alertas pendientes guardadas siguen siendo las abiertas de cada regla
+        self.motor_reglas.cargar_alertas_abiertas(self.alertas.get_abiertas())
+        self.motor_reglas.registrar_planta(self.planta)
+        
+        # Los defectos de un mismo piso en 15 minutos generan una sola alerta
+        self.agrupador_alertas = AgrupadorAlertas(ventana=900)
+        self.agrupador_alertas.registrar_planta(self.planta)
+        
+        # Notificaciones de alertas en segundo plano (no frenan la interfaz)
+        self.notificaciones = DespachadorNotificaciones([CanalArchivo(ruta_alertas)])
+        self.notificaciones.conectar_bus()
+        self.notificaciones.iniciar()
+        self._ejecutar_planificador()
         
         self._crear_interfaz_login()
     
@@ -42,13 +98,50 @@ class SistemaOrellanas:
     
     def _crear_estanterias_ejemplo(self):
         """Crear estanterías de ejemplo"""
-        estanterias = []
+        planta = Planta()
         for i in range(3):
             est = Estanteria(f"00{i+1}")
             if i < 2:
                 est.iniciar_produccion()
-            estanterias.append(est)
-        return estanterias
+            planta.agregar_estanteria(est)
+        return planta
+    
+    def _ejecutar_planificador(self):
+        """Avanzar los tubulares cuyo tiempo se cumplió, revisar alertas vencidas y repetir en un minuto"""
+        self.planificador.ejecutar_vencidos()
+        self.historial.registrar_si_corresponde(self.planta)
+        self.motor_reglas.revisar_vencimientos()
+        self.alertas.actualizar_urgentes()
+        # Guardar la cantidad final de los grupos cerrados
+        self.repositorio.guardar_alertas(self.agrupador_alertas.cerrar_vencidos())
+        self.root.after(60000, self._ejecutar_planificador)
+    
+    def _alerta_creada(self, evento):
+        """Indexar y guardar una alerta generada por el motor de reglas"""
+        alerta = evento.get_datos()["alerta"]
+        self.alertas.agregar(alerta)
+        self.repositorio.guardar_alerta(alerta)
+    
+    def _alerta_cambiada(self, evento):
+        """Guardar el nuevo estado de una alerta resuelta o reabierta"""
+        alerta = evento.get_datos()["alerta"]
+        if alerta in self.alertas:
+            self.repositorio.guardar_alerta(alerta)
+    
+    def _cargar_planta(self):
+        """Cargar la planta de la foto binaria si está al día, si no de la base.
+        Retorna (planta, si ya está guardada en la base)"""
+        rutas_bd = [ruta for ruta in (self.repositorio.get_ruta(), self.repositorio.get_ruta() + "-wal")
+                    if os.path.exists(ruta)]
+        if os.path.exists(self.ruta_snapshot):
+            modificada_bd = max((os.path.getmtime(ruta) for ruta in rutas_bd), default=0)
+            if os.path.getmtime(self.ruta_snapshot) >= modificada_bd:
+                try:
+                    # Sin archivo de base, la foto es la única copia
+                    return SnapshotPlanta.cargar(self.ruta_snapshot), bool(rutas_bd)
+                except ValueError:
+                    pass
+        return self.repositorio.cargar_planta(), True
     
     def _crear_interfaz_login(self):
         """Crear interfaz de login"""
@@ -172,14 +265,17 @@ class SistemaOrellanas:
                 font=('Arial', 16, 'bold')).pack(pady=20)
         
         # Información del usuario
+        resolucion = self.tiempos_resolucion.obtener_resumen()
         info_text = f"""
 Rol: {self.usuario_actual.get_rol()}
 Permisos: {', '.join(self.usuario_actual.obtener_permisos())}
 
 Resumen del sistema:
-• Estanterías activas: {sum(1 for e in self.estanterias if e.esta_activa())}
-• Total de tubulares: {sum(e.contar_tubulares_total() for e in self.estanterias)}
-• Estanterías en producción: {sum(1 for e in self.estanterias if e.esta_activa())}
+• Estanterías activas: {self.planta.contar_estanterias_activas()}
+• Total de tubulares: {self.planta.contar_tubulares_total()}
+• Estanterías en producción: {self.planta.contar_estanterias_activas()}
+• Alertas abiertas: {self.alertas.contar(resuelta=False)} (urgentes: {self.alertas.contar(resuelta=False, urgente=True)})
+• Tiempo de resolución: media {resolucion['media_horas']} h, p90 {resolucion['p90']} h
 """
         
         tk.Label(frame, text=info_text, font=('Arial', 12), justify='left').pack(pady=20)
@@ -241,7 +337,7 @@ Resumen del sistema:
             tree.delete(item)
         
         # Agregar estanterías
-        for estanteria in self.estanterias:
+        for estanteria in self.planta:
             estado = "Activa" if estanteria.esta_activa() else "Inactiva"
             tree.insert('', 'end', values=(
                 estanteria.get_codigo(),
@@ -263,7 +359,7 @@ Resumen del sistema:
         codigo = item['values'][0]
         
         # Encontrar la estantería
-        for estanteria in self.estanterias:
+        for estanteria in self.planta:
             if estanteria.get_codigo() == codigo:
                 detalles = estanteria.generar_resumen()
                 messagebox.showinfo(f"Detalles - {codigo}", detalles)
@@ -398,24 +494,24 @@ Resumen del sistema:
     def _generar_reporte_estanterias(self):
         """Generar reporte de estanterías"""
         reporte = "REPORTE DE ESTANTERÍAS\n" + "="*30 + "\n"
-        for estanteria in self.estanterias:
+        for estanteria in self.planta:
             reporte += f"\n{estanteria.get_codigo()}: {estanteria.get_fase()} - Defectuosos: {estanteria.contar_defectuosos_total()}\n"
         
         messagebox.showinfo("Reporte de Estanterías", reporte)
     
     def _generar_reporte_general(self):
         """Generar reporte general"""
-        total_tubulares = sum(e.contar_tubulares_total() for e in self.estanterias)
-        total_defectuosos = sum(e.contar_defectuosos_total() for e in self.estanterias)
+        total_tubulares = self.planta.contar_tubulares_total()
+        total_defectuosos = self.planta.contar_defectuosos_total()
         
         reporte = f"""
 REPORTE GENERAL DEL SISTEMA
 ==========================
-Estanterías totales: {len(self.estanterias)}
-Estanterías activas: {sum(1 for e in self.estanterias if e.esta_activa())}
+Estanterías totales: {self.planta.contar_estanterias()}
+Estanterías activas: {self.planta.contar_estanterias_activas()}
 Tubulares totales: {total_tubulares}
 Tubulares defectuosos: {total_defectuosos}
-Eficiencia general: {(total_tubulares - total_defectuosos) / total_tubulares * 100:.1f}%
+Eficiencia general: {self.planta.calcular_eficiencia_total():.1f}%
 =========================="""
         
         messagebox.showinfo("Reporte General", reporte)
@@ -423,11 +519,16 @@ Eficiencia general: {(total_tubulares - total_defectuosos) / total_tubulares * 1
     def _logout(self):
         """Cerrar sesión"""
         self.usuario_actual = None
+        self.repositorio.confirmar()
         self._crear_interfaz_login()
     
     def ejecutar(self):
         """Ejecutar la aplicación"""
         self.root.mainloop()
+        self.notificaciones.detener()
+        self.repositorio.cerrar()
+        # Foto de la planta para que el próximo inicio sea rápido
+        SnapshotPlanta.guardar(self.planta, self.ruta_snapshot)
 
 
 # Ejecutar el sistema
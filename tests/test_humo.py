@@ -0,0 +1,238 @@
+"""
+TEST_HUMO.PY - Pruebas de humo de la capa de datos
+Sistema de Gestión de Producción de Orellanas
+
+Recorre los caminos que deben dar el mismo resultado por dos vías:
+- contadores del almacén contra un reconteo completo (modo verificación)
+- reportes en serie contra reportes en varios procesos
+- planta original contra la cargada de la foto binaria y de SQLite
+- historial en memoria contra el leído del archivo
+
+Uso:
+    python -m unittest discover tests
+    python -m pytest tests
+
+Fecha: Noviembre 2025
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from clases.agrupador_alertas import AgrupadorAlertas, AlertaAgrupada
+from clases.almacen_tubulares import AlmacenTubulares
+from clases.estanteria import Estanteria
+from clases.eventos import bus_eventos
+from clases.historial_produccion import HistorialProduccion
+from clases.libro_registros import LibroRegistros
+from clases.planta import Planta
+from clases.reportes_paralelos import GeneradorReportesParalelo
+from clases.repositorio import RepositorioSQLite
+from clases.snapshot import SnapshotPlanta
+from clases.trabajador import Trabajador
+
+
+def setUpModule():
+    """Silencia los mensajes del bus de eventos durante las pruebas."""
+    bus_eventos.set_silencioso(True)
+
+
+def tearDownModule():
+    """Vuelve a mostrar los mensajes del bus de eventos."""
+    bus_eventos.set_silencioso(False)
+
+
+def construir_planta(numero_estanterias: int = 12) -> Planta:
+    """
+    Construye una planta con estanterías en distintos estados.
+
+    Mezcla transiciones masivas, cambios tubular por tubular, defectos
+    con observación y una revisión, para cubrir todos los caminos que
+    actualizan los contadores.
+    """
+    planta = Planta()
+    for i in range(numero_estanterias):
+        estanteria = Estanteria(f"{i:03d}")
+        planta.agregar_estanteria(estanteria)
+        if i % 2:
+            estanteria.iniciar_produccion()
+            estanteria.get_piso(1).inocular_piso()
+            estanteria.transicionar_tubulares("en_desarrollo", "inoculado", piso_desde=1, piso_hasta=1)
+        if i % 3 == 0:
+            for tubular in estanteria.get_piso(2).get_tubulares()[:40]:
+                tubular.inocular()
+                tubular.set_estado("producción")
+        if i % 4 == 0:
+            for numero in range(1, 13):
+                estanteria.get_piso(3).marcar_tubular_defectuoso(numero, f"Contaminación {numero}")
+        if i == 5:
+            estanteria.registrar_revision()
+    return planta
+
+
+def sin_dias(resultado):
+    """Quita los días de producción (dependen del momento del cálculo)."""
+    if isinstance(resultado, dict) and isinstance(resultado.get("dias_produccion"), float):
+        return dict(resultado, dias_produccion=None)
+    return resultado
+
+
+class TestConsistencia(unittest.TestCase):
+    """Contadores del almacén contra un reconteo completo."""
+
+    def setUp(self):
+        AlmacenTubulares.activar_verificacion(True)
+
+    def tearDown(self):
+        AlmacenTubulares.activar_verificacion(False)
+
+    def test_contadores_tras_todas_las_operaciones(self):
+        planta = construir_planta()
+        for estanteria in planta:
+            # En modo verificación cada conteo se compara con el reconteo
+            estanteria.obtener_estadisticas_detalladas()
+            estanteria.verificar_consistencia()
+            estanteria.cargar_tubulares(*(estanteria.exportar_tubulares()
+                                          or (bytes(320), bytes(320), [0.0] * 320)))
+            estanteria.verificar_consistencia()
+        planta.contar_tubulares_por_estado()
+
+    def test_estado_general_tras_cambios_por_tubular(self):
+        estanteria = Estanteria("001")
+        piso = estanteria.get_piso(1)
+        self.assertEqual(piso.get_estado_general(), "vacío")
+        for tubular in piso.get_tubulares()[:40]:
+            tubular.inocular()
+            tubular.set_estado("producción")
+        self.assertEqual(piso.get_estado_general(), "óptimo")
+        self.assertEqual(estanteria.obtener_estado_general()["en_produccion"], 1)
+
+    def test_estado_de_origen_invalido(self):
+        estanteria = Estanteria("001")
+        with self.assertRaises(ValueError):
+            estanteria.transicionar_tubulares("producción", "foo")
+        estanteria.get_piso(1).inocular_piso()
+        with self.assertRaises(ValueError):
+            estanteria.transicionar_tubulares("producción", "foo")
+
+
+class TestReportesParalelos(unittest.TestCase):
+    """Los reportes en varios procesos son iguales a los de la serie."""
+
+    def test_serie_igual_a_procesos(self):
+        planta = construir_planta()
+        metodos = (("obtener_estado_general", "obtener_estados_generales"),
+                   ("obtener_estadisticas_detalladas", "obtener_estadisticas_detalladas"),
+                   ("generar_resumen", "generar_resumenes"))
+        with GeneradorReportesParalelo(2, minimo_paralelo=0) as generador:
+            for metodo, metodo_generador in metodos:
+                serie = [sin_dias(getattr(estanteria, metodo)()) for estanteria in planta]
+                paralelo = [sin_dias(resultado)
+                            for resultado in getattr(generador, metodo_generador)(planta)]
+                self.assertEqual(paralelo, serie, metodo)
+
+
+class TestPersistencia(unittest.TestCase):
+    """Ida y vuelta de la planta, las alertas y los usuarios."""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def ruta(self, nombre: str) -> str:
+        return os.path.join(self.directorio.name, nombre)
+
+    def assertPlantaIgual(self, cargada: Planta, original: Planta):
+        self.assertEqual(len(cargada), len(original))
+        for estanteria in original:
+            otra = cargada.get_estanteria(estanteria.get_codigo())
+            self.assertEqual(otra.get_fase(), estanteria.get_fase())
+            self.assertEqual(otra.esta_activa(), estanteria.esta_activa())
+            self.assertEqual(otra.exportar_tubulares(), estanteria.exportar_tubulares())
+            self.assertEqual([(posicion, texto) for posicion, _, texto in otra.exportar_observaciones()],
+                             [(posicion, texto) for posicion, _, texto in estanteria.exportar_observaciones()])
+            self.assertEqual(otra.generar_resumen(), estanteria.generar_resumen())
+
+    def test_foto_binaria(self):
+        planta = construir_planta()
+        SnapshotPlanta.guardar(planta, self.ruta("planta.snap"))
+        self.assertPlantaIgual(SnapshotPlanta.cargar(self.ruta("planta.snap")), planta)
+
+    def test_sqlite(self):
+        planta = construir_planta()
+        with RepositorioSQLite(self.ruta("orellanas.db")) as repositorio:
+            repositorio.seguir_planta(planta)
+            planta.get_estanteria("001").get_piso(4).inocular_piso()
+        with RepositorioSQLite(self.ruta("orellanas.db")) as repositorio:
+            cargada = repositorio.cargar_planta()
+            self.assertPlantaIgual(cargada, planta)
+            # Seguir lo recién cargado no lo reescribe, pero guarda los cambios
+            repositorio.seguir_planta(cargada, guardar=False)
+            cargada.get_estanteria("002").get_piso(4).inocular_piso()
+        with RepositorioSQLite(self.ruta("orellanas.db")) as repositorio:
+            self.assertEqual(repositorio.contar_tubulares_por_estado("002")["inoculado"], 80)
+
+    def test_alertas_agrupadas(self):
+        planta = construir_planta(2)
+        estanteria = planta.get_estanteria("000")
+        agrupador = AgrupadorAlertas(ventana=900)
+        inicio = datetime(2025, 11, 3, 8).timestamp()
+        alerta = agrupador.registrar("defecto", "Piso 3: defectos", estanteria, 3, 1, inicio)
+        agrupador.registrar("defecto", "Piso 3: defectos", estanteria, 3, 4, inicio + 60)
+        self.assertEqual(alerta.get_fecha_creacion(), alerta.get_primera())
+        with RepositorioSQLite(self.ruta("orellanas.db")) as repositorio:
+            repositorio.guardar_alerta(alerta)
+        with RepositorioSQLite(self.ruta("orellanas.db")) as repositorio:
+            cargada, = repositorio.cargar_alertas(planta)
+        self.assertIsInstance(cargada, AlertaAgrupada)
+        self.assertEqual((cargada.get_cantidad(), cargada.get_piso(), cargada.get_primera(),
+                          cargada.get_ultima(), cargada.get_mensaje()),
+                         (5, 3, alerta.get_primera(), alerta.get_ultima(), alerta.get_mensaje()))
+
+    def test_usuarios_sin_texto_plano(self):
+        usuario = Trabajador("Juan", "Pérez", "juan", "secreto1", "juan@orellanas.com", "mañana")
+        with RepositorioSQLite(self.ruta("orellanas.db")) as repositorio:
+            repositorio.guardar_usuario(usuario)
+        with open(self.ruta("orellanas.db"), "rb") as archivo:
+            self.assertNotIn(b"secreto1", archivo.read())
+        with RepositorioSQLite(self.ruta("orellanas.db")) as repositorio:
+            cargado = repositorio.cargar_usuarios()["juan"]
+        self.assertTrue(cargado.validar_credenciales("juan", "secreto1"))
+        self.assertFalse(cargado.validar_credenciales("juan", "otra"))
+
+    def test_historial(self):
+        planta = construir_planta(4)
+        historial = HistorialProduccion(self.ruta("historial.bin"))
+        inicio = datetime(2025, 11, 1, 6)
+        for dia in range(10):
+            planta.get_estanteria(f"{dia % 4:03d}").get_piso(4).marcar_tubular_defectuoso(dia + 1)
+            historial.registrar(planta, inicio + timedelta(days=dia))
+        leido = HistorialProduccion(self.ruta("historial.bin"))
+        self.assertEqual(len(leido), 10)
+        for codigo in (None, "000", "003"):
+            self.assertEqual(leido.obtener_serie(codigo), historial.obtener_serie(codigo))
+
+
+class TestLibroRegistros(unittest.TestCase):
+    """Turnos abiertos del libro de registros."""
+
+    def test_un_solo_turno_abierto(self):
+        libro = LibroRegistros()
+        try:
+            entrada = datetime(2025, 11, 3, 8)
+            fila = libro.registrar_turno("ana", entrada)
+            with self.assertRaises(ValueError):
+                libro.registrar_turno("ana", entrada + timedelta(hours=1))
+            self.assertEqual(libro.registrar_salida("ana", entrada + timedelta(hours=8)), fila)
+        finally:
+            libro.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()